@@ -4,7 +4,13 @@ Copyright (c) 2026 Amatak Holdings Pty Ltd.
 """
 
 __version__ = "1.0.6"
-from . import this_init
-from . import winapp
 
 __all__ = ['this_init', 'winapp', '__version__']
+
+
+def __getattr__(name):
+    # Submodules are loaded on first access so `winapp --version` stays fast
+    if name in ('this_init', 'winapp'):
+        import importlib
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
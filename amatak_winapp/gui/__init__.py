@@ -4,6 +4,7 @@ Copyright (c) 2026 Amatak Holdings Pty Ltd.
 """
 
 __version__ = "1.0.6"
+from . import job_queue
 from . import winapp_gui
 
-__all__ = ['winapp_gui', '__version__']
+__all__ = ['job_queue', 'winapp_gui', '__version__']
@@ -0,0 +1,231 @@
+# amatak_winapp/gui/job_queue.py
+"""
+Central job scheduler for the WinApp GUI.
+
+Every GUI action is submitted here instead of spawning its own thread.
+A bounded pool of worker threads picks up queued jobs, jobs that target
+the same project never run at the same time (so two runs cannot write
+the same installer/ output), and an identical job that is still waiting
+in the queue is reused instead of being queued twice. An exclusive job
+(e.g. a profiled build, whose in-process profilers would also measure
+other jobs) runs alone: it waits for the running jobs to finish, and
+nothing else starts until it is done.
+"""
+import os
+import threading
+import time
+import traceback
+from pathlib import Path
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def project_key(project_path):
+    """Normalize a project path so the same folder always maps to one lock"""
+    if project_path is None:
+        return None
+    try:
+        key = str(Path(project_path).resolve())
+    except OSError:
+        key = str(project_path)
+    # Windows paths are case-insensitive
+    return key.lower() if os.name == "nt" else key
+
+
+class Job:
+    """A single unit of work submitted to the JobQueue"""
+
+    def __init__(self, job_id, name, project_path, target, args=(), kwargs=None, exclusive=False):
+        self.id = job_id
+        self.name = name
+        self.project_path = project_path
+        self.project = project_key(project_path)
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.exclusive = exclusive
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def key(self):
+        """Identity used to deduplicate pending jobs"""
+        return (self.name, self.project, self.args, self.exclusive)
+
+    @property
+    def duration(self):
+        """Seconds spent running (or waiting, while still queued)"""
+        if self.started_at is None:
+            return time.time() - self.submitted_at
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+    def snapshot(self):
+        """Return a plain dict describing the job (safe to read from the UI thread)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "project": str(self.project_path) if self.project_path is not None else "",
+            "state": self.state,
+            "duration": self.duration,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Bounded worker pool with per-project locking and pending-job deduplication"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, history_limit=200):
+        self.max_workers = max(1, max_workers)
+        self.history_limit = history_limit
+        self._cond = threading.Condition()
+        self._pending = []
+        self._jobs = []
+        self._busy_projects = set()
+        self._running = 0
+        self._exclusive_running = False
+        self._next_id = 1
+        self._workers = []
+        self._shutdown = False
+
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop,
+                                      name=f"winapp-job-{i + 1}",
+                                      daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, name, project_path, target, *args, exclusive=False, **kwargs):
+        """Queue target(*args, **kwargs); returns the (possibly existing) Job
+
+        exclusive=True runs the job with no other job alongside it.
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("JobQueue has been shut down")
+
+            job = Job(self._next_id, name, project_path, target, args, kwargs, exclusive)
+
+            # Reuse an identical job that has not started yet
+            for pending in self._pending:
+                if pending.key == job.key:
+                    return pending
+
+            self._next_id += 1
+            self._pending.append(job)
+            self._jobs.append(job)
+            self._trim_history()
+            self._cond.notify_all()
+            return job
+
+    def snapshot(self):
+        """List of job dicts, oldest first"""
+        with self._cond:
+            return [job.snapshot() for job in self._jobs]
+
+    def counts(self):
+        """Number of jobs per state"""
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        with self._cond:
+            for job in self._jobs:
+                counts[job.state] += 1
+        return counts
+
+    def is_project_busy(self, project_path):
+        """True if a job for this project is queued or running"""
+        key = project_key(project_path)
+        with self._cond:
+            return any(job.project == key and job.state in (QUEUED, RUNNING)
+                       for job in self._jobs)
+
+    def clear_finished(self):
+        """Forget done/failed jobs"""
+        with self._cond:
+            self._jobs = [job for job in self._jobs if job.state in (QUEUED, RUNNING)]
+
+    def shutdown(self, wait=False):
+        """Stop accepting jobs; queued jobs that have not started are dropped"""
+        with self._cond:
+            self._shutdown = True
+            for job in self._pending:
+                job.state = FAILED
+                job.error = "cancelled"
+                job.finished_at = time.time()
+            self._pending = []
+            self._cond.notify_all()
+
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _trim_history(self):
+        """Drop the oldest finished jobs beyond history_limit"""
+        excess = len(self._jobs) - self.history_limit
+        if excess <= 0:
+            return
+        kept = []
+        for job in self._jobs:
+            if excess > 0 and job.state in (DONE, FAILED):
+                excess -= 1
+                continue
+            kept.append(job)
+        self._jobs = kept
+
+    def _next_runnable(self):
+        """First pending job that may start now (caller holds the lock)
+
+        Jobs queued behind a waiting exclusive job wait too, so it is not starved.
+        """
+        if self._exclusive_running:
+            return None
+        for index, job in enumerate(self._pending):
+            if job.exclusive:
+                return self._pending.pop(index) if self._running == 0 else None
+            if job.project is None or job.project not in self._busy_projects:
+                return self._pending.pop(index)
+        return None
+
+    def _worker_loop(self):
+        """Worker thread: run jobs until shutdown"""
+        while True:
+            with self._cond:
+                job = self._next_runnable()
+                while job is None:
+                    if self._shutdown:
+                        return
+                    self._cond.wait()
+                    job = self._next_runnable()
+
+                if job.project is not None:
+                    self._busy_projects.add(job.project)
+                self._running += 1
+                self._exclusive_running = job.exclusive
+                job.state = RUNNING
+                job.started_at = time.time()
+
+            try:
+                job.result = job.target(*job.args, **job.kwargs)
+                state = DONE
+            except Exception as e:
+                job.error = str(e)
+                traceback.print_exc()
+                state = FAILED
+
+            with self._cond:
+                job.finished_at = time.time()
+                job.state = state
+                if job.project is not None:
+                    self._busy_projects.discard(job.project)
+                self._running -= 1
+                self._exclusive_running = False
+                self._cond.notify_all()
@@ -8,7 +8,6 @@ import subprocess
 import json
 import shutil
 from pathlib import Path
-import threading
 import webbrowser
 import datetime
 
@@ -18,20 +17,29 @@ sys.path.insert(0, str(PACKAGE_DIR))
 
 # Import ProjectGenerator
 try:
-    from winapp import ProjectGenerator
+    from winapp import ProjectGenerator, load_helper
 except ImportError:
     # Try absolute import
-    from amatak_winapp.winapp import ProjectGenerator
+    from amatak_winapp.winapp import ProjectGenerator, load_helper
+
+# Import the shared job scheduler
+try:
+    from amatak_winapp.gui.job_queue import JobQueue
+except ImportError:
+    # Fallback when running from a source checkout
+    sys.path.insert(0, str(Path(__file__).parent))
+    from job_queue import JobQueue
 
 def get_version():
     """Get version from data/VERSION.txt"""
-    version_file = PACKAGE_DIR / "data" / "VERSION.txt"
-    if version_file.exists():
-        try:
-            return version_file.read_text(encoding='utf-8').strip()
-        except:
-            return "1.0.0"
-    return "1.0.0"
+    return load_helper("_project_metadata").package_version()
+
+def project_label_text(project_path):
+    """Current-project label: folder, plus name and version when the project has them"""
+    metadata = load_helper("_project_metadata").load(project_path)
+    if metadata.version:
+        return f"📁 {project_path}  ({metadata.name} v{metadata.version})"
+    return f"📁 {project_path}"
 
 class WinAppGUI:
     def __init__(self, root):
@@ -50,8 +58,8 @@ class WinAppGUI:
         self.setup_styles()
         
         # Setup variables
-        self.project_generator = ProjectGenerator()
         self.current_project_path = Path.cwd()
+        self.job_queue = JobQueue()
         
         # Build UI
         self.create_menu()
@@ -139,7 +147,7 @@ class WinAppGUI:
         info_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
         
         self.project_label = ttk.Label(info_frame, 
-                                      text=f"📁 {self.current_project_path}",
+                                      text=project_label_text(self.current_project_path),
                                       font=("Segoe UI", 10))
         self.project_label.pack(fill=tk.X)
         
@@ -151,6 +159,7 @@ class WinAppGUI:
         self.create_welcome_tab()
         self.create_initialize_tab()
         self.create_build_tab()
+        self.create_jobs_tab()
         self.create_logs_tab()
 
         
@@ -672,13 +681,8 @@ Select a tab above to get started!
             messagebox.showerror("Error", f"Project path does not exist:\n{project_path}")
             return
         
-        # Run in background thread
-        thread = threading.Thread(
-            target=self._generate_branding_thread,
-            args=(project_path,),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler
+        self.submit_job("Generate branding", project_path, self._generate_branding_thread, project_path)
 
     def check_branding_assets(self):
         """Check if branding assets exist"""
@@ -739,21 +743,13 @@ Select a tab above to get started!
             messagebox.showerror("Error", f"Project path does not exist:\n{project_path}")
             return
         
-        # Run in background thread
-        thread = threading.Thread(
-            target=self._generate_branding_thread,
-            args=(project_path,),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler
+        self.submit_job("Generate branding", project_path, self._generate_branding_thread, project_path)
 
     def _generate_branding_thread(self, project_path):
         """Thread function for generating branding assets"""
         self.log_message(f"Generating branding assets for: {project_path}")
         
-        # Update generator with project path
-        self.project_generator = ProjectGenerator(project_path)
-        
         success = self.initialize_gen_brand(project_path)
         
         if success:
@@ -771,13 +767,8 @@ Select a tab above to get started!
             messagebox.showerror("Error", f"Project path does not exist:\n{project_path}")
             return
         
-        # Run in background thread
-        thread = threading.Thread(
-            target=self._generate_readme_thread,
-            args=(project_path,),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler
+        self.submit_job("Generate README", project_path, self._generate_readme_thread, project_path)
 
 
     def generate_license_only(self):
@@ -809,13 +800,8 @@ Select a tab above to get started!
             if not response:
                 return
         
-        # Run in background thread
-        thread = threading.Thread(
-            target=self._generate_license_thread,
-            args=(project_path,),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler
+        self.submit_job("Generate license", project_path, self._generate_license_thread, project_path)
 
     def _generate_license_thread(self, project_path):
         """Background thread for generating license"""
@@ -850,9 +836,6 @@ Select a tab above to get started!
         """Thread function for generating README"""
         self.log_message(f"Generating README documentation for: {project_path}")
         
-        # Update generator with project path
-        self.project_generator = ProjectGenerator(project_path)
-        
         success = self.run_gen_readme(project_path)
         
         if success:
@@ -908,6 +891,71 @@ Select a tab above to get started!
             self.log_message(f"❌ Exception while running gen_brand.py: {e}", "ERROR")
             return False
 
+    def submit_job(self, name, project_path, target, *args, exclusive=False):
+        """Queue a GUI action on the shared job scheduler (exclusive: run with no other job)"""
+        job = self.job_queue.submit(name, project_path, target, *args, exclusive=exclusive)
+        self.log_message(f"Queued '{name}' (job #{job.id}) for: {project_path}")
+        return job
+
+    def create_jobs_tab(self):
+        """Create jobs panel showing queued, running and finished jobs"""
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="⏱️ Jobs")
+        
+        columns = ("job", "project", "state", "duration")
+        self.jobs_tree = ttk.Treeview(tab, columns=columns, show="headings", height=15)
+        self.jobs_tree.heading("job", text="Job")
+        self.jobs_tree.heading("project", text="Project")
+        self.jobs_tree.heading("state", text="State")
+        self.jobs_tree.heading("duration", text="Duration")
+        self.jobs_tree.column("job", width=160)
+        self.jobs_tree.column("project", width=380)
+        self.jobs_tree.column("state", width=80, anchor=tk.CENTER)
+        self.jobs_tree.column("duration", width=90, anchor=tk.E)
+        
+        self.jobs_tree.tag_configure("queued", foreground="#666666")
+        self.jobs_tree.tag_configure("running", foreground="blue")
+        self.jobs_tree.tag_configure("done", foreground="green")
+        self.jobs_tree.tag_configure("failed", foreground="red")
+        self.jobs_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Job controls
+        control_frame = ttk.Frame(tab)
+        control_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        self.jobs_summary_label = ttk.Label(control_frame, text="", font=("Segoe UI", 9))
+        self.jobs_summary_label.pack(side=tk.LEFT)
+        
+        ttk.Button(control_frame,
+                text="🧹 Clear Finished",
+                command=self.clear_finished_jobs).pack(side=tk.RIGHT)
+        
+        self.refresh_jobs()
+
+    def refresh_jobs(self):
+        """Refresh the jobs panel (runs on the Tk main loop)"""
+        snapshot = self.job_queue.snapshot()
+        
+        self.jobs_tree.delete(*self.jobs_tree.get_children())
+        for job in reversed(snapshot):
+            state = job["state"]
+            duration = f"{job['duration']:.1f}s"
+            self.jobs_tree.insert("", tk.END, iid=str(job["id"]),
+                                  values=(job["name"], job["project"], state, duration),
+                                  tags=(state,))
+        
+        counts = self.job_queue.counts()
+        self.jobs_summary_label.config(
+            text=f"Queued: {counts['queued']}   Running: {counts['running']}   "
+                 f"Done: {counts['done']}   Failed: {counts['failed']}   "
+                 f"Workers: {self.job_queue.max_workers}")
+        
+        self.root.after(500, self.refresh_jobs)
+
+    def clear_finished_jobs(self):
+        """Remove done/failed jobs from the panel"""
+        self.job_queue.clear_finished()
+
     def create_logs_tab(self):
         """Create logs/output tab"""
         tab = ttk.Frame(self.notebook)
@@ -1057,7 +1105,8 @@ Select a tab above to get started!
             "clean_build": tk.BooleanVar(value=True),
             "generate_nsi": tk.BooleanVar(value=True),
             "generate_win": tk.BooleanVar(value=True),
-            "create_distribution": tk.BooleanVar(value=True)
+            "create_distribution": tk.BooleanVar(value=True),
+            "profile_build": tk.BooleanVar(value=False)
         }
         
         ttk.Checkbutton(options_frame,
@@ -1080,6 +1129,11 @@ Select a tab above to get started!
                     variable=self.build_options["create_distribution"]).grid(row=3, column=0,
                                                                             sticky=tk.W, pady=5)
         
+        ttk.Checkbutton(options_frame,
+                    text="Profile build (stage trace, cProfile, tracemalloc -> installer/.profile/)",
+                    variable=self.build_options["profile_build"]).grid(row=4, column=0,
+                                                                      sticky=tk.W, pady=5)
+        
         # Action buttons
         button_frame = ttk.Frame(tab)
         button_frame.pack(fill=tk.X, padx=10, pady=20)
@@ -1152,22 +1206,17 @@ Select a tab above to get started!
             messagebox.showerror("Error", f"Project path does not exist:\n{project_path}")
             return
         
-        # Run in background thread
-        thread = threading.Thread(
-            target=self._generate_nsi_thread,
-            args=(project_path,),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler
+        self.submit_job("Generate NSI", project_path, self._generate_nsi_thread, project_path)
 
     def _generate_nsi_thread(self, project_path):
         """Thread function for generating NSIS script"""
         self.log_message(f"Generating NSIS script for: {project_path}")
         
-        # Update generator with project path
-        self.project_generator = ProjectGenerator(project_path)
+        # Use a per-job generator so concurrent jobs do not share state
+        generator = ProjectGenerator(project_path)
         
-        success = self.project_generator.generate_nsi(project_path)
+        success = generator.generate_nsi(project_path)
         
         if success:
             self.log_message("NSIS script generated successfully!", "SUCCESS")
@@ -1184,23 +1233,18 @@ Select a tab above to get started!
             messagebox.showerror("Error", f"Project path does not exist:\n{project_path}")
             return
         
-        # Run in background thread
-        thread = threading.Thread(
-            target=self._generate_win_thread,
-            args=(project_path,),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler
+        self.submit_job("Generate WIN", project_path, self._generate_win_thread, project_path)
 
     def _generate_win_thread(self, project_path):
         """Thread function for generating Windows build files"""
         self.log_message(f"Generating Windows build files for: {project_path}")
         
-        # Update generator with project path
-        self.project_generator = ProjectGenerator(project_path)
+        # Use a per-job generator so concurrent jobs do not share state
+        generator = ProjectGenerator(project_path)
         
         # Run gen_win.py
-        success = self.project_generator.run_script("gen_win.py", project_path)
+        success = generator.run_script("gen_win.py", project_path)
         
         if success:
             self.log_message("Windows build files generated successfully!", "SUCCESS")
@@ -1247,7 +1291,7 @@ Select a tab above to get started!
         
         if path:
             self.current_project_path = Path(path)
-            self.project_label.config(text=f"📁 {self.current_project_path}")
+            self.project_label.config(text=project_label_text(self.current_project_path))
             self.init_path_var.set(str(self.current_project_path))
             self.build_path_var.set(str(self.current_project_path))
             self.log_message(f"Project selected: {path}")
@@ -1344,13 +1388,8 @@ Select a tab above to get started!
             messagebox.showwarning("Warning", "No scripts selected!")
             return
         
-        # Run in background thread
-        thread = threading.Thread(
-            target=self._run_initialization_thread,
-            args=(project_path, selected_scripts),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler
+        self.submit_job("Initialize project", project_path, self._run_initialization_thread, project_path, selected_scripts)
 
     def _run_initialization_thread(self, project_path, scripts):
         """Thread function for running initialization"""
@@ -1400,7 +1439,7 @@ Select a tab above to get started!
         
         if tree_script.exists():
             self.log_message("Generating project tree...")
-            success = self.project_generator.run_script("gen_tree.py", project_path)
+            success = ProjectGenerator(project_path).run_script("gen_tree.py", project_path)
             
             if success:
                 self.log_message("Project tree updated successfully", "SUCCESS")
@@ -1442,20 +1481,18 @@ Select a tab above to get started!
             messagebox.showerror("Error", f"Project path does not exist:\n{project_path}")
             return
         
-        # Run build in background thread
-        thread = threading.Thread(
-            target=self._build_project_thread,
-            args=(project_path,),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler; tracemalloc and cProfile in this process
+        # would measure other jobs too, so a profiled build runs alone
+        profile = self.build_options["profile_build"].get()
+        self.submit_job("Build installer", project_path, self._build_project_thread, project_path, profile,
+                        exclusive=profile)
     
-    def _build_project_thread(self, project_path):
+    def _build_project_thread(self, project_path, profile=False):
         """Thread function for building project"""
         self.log_message(f"Starting build for: {project_path}")
         
-        # Update generator with project path
-        self.project_generator = ProjectGenerator(project_path)
+        # Use a per-job generator so concurrent jobs do not share state
+        generator = ProjectGenerator(project_path, profile=profile, cprofile=profile, tracemalloc=profile)
         
         # Check which scripts to run based on checkboxes
         scripts_to_run = []
@@ -1471,12 +1508,19 @@ Select a tab above to get started!
             messagebox.showwarning("Warning", "No build options selected!")
             return
         
-        success = True
-        for script in scripts_to_run:
-            self.log_message(f"Running {script}...")
-            if not self.project_generator.run_script(script, project_path):
-                success = False
-                self.log_message(f"Failed to run {script}", "ERROR")
+        def run_build_scripts():
+            success = True
+            for script in scripts_to_run:
+                self.log_message(f"Running {script}...")
+                if not generator.run_script(script, project_path):
+                    success = False
+                    self.log_message(f"Failed to run {script}", "ERROR")
+            return success
+        
+        success = generator.run_profiled("build", project_path,
+                                         generator.record_build, project_path, run_build_scripts)
+        if profile:
+            self.log_message(f"Profile results saved to: {Path(project_path) / 'installer' / '.profile'}")
         
         if success:
             self.log_message("Build completed successfully!", "SUCCESS")
@@ -1579,13 +1623,8 @@ Select a tab above to get started!
         
         dialog.destroy()
         
-        # Run in background thread
-        thread = threading.Thread(
-            target=self._create_project_thread,
-            args=(project_name, category, location),
-            daemon=True
-        )
-        thread.start()
+        # Queue on the shared job scheduler
+        self.submit_job("Create project", Path(location) / project_name, self._create_project_thread, project_name, category, location)
     
     def _create_project_thread(self, project_name, category, location):
         """Thread function for creating project"""
@@ -1593,7 +1632,8 @@ Select a tab above to get started!
         
         try:
             category_data = {"name": category}
-            result = self.project_generator.create_structure(project_name, category_data, location)
+            # Use a per-job generator so concurrent jobs do not share state
+            result = ProjectGenerator().create_structure(project_name, category_data, location)
             
             self.log_message(f"✅ Project created successfully at: {result}", "SUCCESS")
             
@@ -1657,7 +1697,7 @@ Select a tab above to get started!
             elif response is False:  # No - Open Project Folder
                 self.log_message(f"📁 Opening project folder for '{project_name}'...")
                 self.current_project_path = project_path
-                self.project_label.config(text=f"📁 {self.current_project_path}")
+                self.project_label.config(text=project_label_text(self.current_project_path))
                 self.init_path_var.set(str(self.current_project_path))
                 self.build_path_var.set(str(self.current_project_path))
                 
@@ -1686,7 +1726,7 @@ Select a tab above to get started!
             
             else:  # Cancel - Just update current project
                 self.current_project_path = project_path
-                self.project_label.config(text=f"📁 {self.current_project_path}")
+                self.project_label.config(text=project_label_text(self.current_project_path))
                 self.init_path_var.set(str(self.current_project_path))
                 self.build_path_var.set(str(self.current_project_path))
                 self.log_message(f"📋 Project '{project_name}' set as current")
@@ -1776,7 +1816,13 @@ GitHub: https://github.com/amatak-org/amatak_winapp
     
     def on_closing(self):
         """Handle window closing"""
-        if messagebox.askokcancel("Quit", "Do you want to quit?"):
+        counts = self.job_queue.counts()
+        active = counts["queued"] + counts["running"]
+        prompt = "Do you want to quit?"
+        if active:
+            prompt = f"{active} job(s) are still queued or running.\nDo you want to quit anyway?"
+        if messagebox.askokcancel("Quit", prompt):
+            self.job_queue.shutdown()
             self.root.destroy()
 
 def gui_main():
@@ -0,0 +1,179 @@
+# amatak_winapp/scripts/_binary_manifest.py
+"""
+Compact binary installer manifest (installer/manifest.bin).
+
+manifest.json is what patch builds and people read; at 100k+ files it is
+slow to parse and mostly repeated folder names. The binary form stores
+the same scan as:
+
+    header   magic, format version, counts, section sizes (HEADER struct)
+    meta     UTF-8 JSON: app, version, generated_at
+    columns  size (u64), mtime_ns (i64), sha256 (32 bytes) per file;
+             parent (u32) per folder; folder (u32) per file;
+             name end offsets (u32) for folders, then files
+    names    UTF-8 folder and file names, each stored once
+
+Paths are rebuilt from a folder table (every folder points at its
+parent), so a folder name is stored once however many files it holds.
+Reading is one read() plus memoryview casts; entries are decoded only
+when asked for, so listing one page does not build every path string.
+
+Bump FORMAT_VERSION on any layout change; readers reject other versions.
+"""
+import sys
+import json
+import struct
+from array import array
+from pathlib import Path
+
+MAGIC = b"WAMF"
+FORMAT_VERSION = 1
+# magic, version, reserved, files, folders, meta bytes, names bytes
+HEADER = struct.Struct("<4sHHIIII")
+NO_PARENT = 0xFFFFFFFF
+DIGEST_SIZE = 32
+
+
+class ManifestWriter:
+    """Collects scan entries in columns and writes manifest.bin"""
+
+    def __init__(self):
+        self.folder_ids = {"": 0}
+        self.folder_parent = array("I", [NO_PARENT])
+        self.folder_name_ends = array("I", [0])
+        self.file_folder = array("I")
+        self.file_name_ends = array("I")
+        self.sizes = array("Q")
+        self.mtimes = array("q")
+        self.digests = bytearray()
+        self.folder_names = bytearray()
+        self.file_names = bytearray()
+
+    def _folder(self, folder):
+        """Id of a folder ('a/b'), adding it and its parents on first use"""
+        folder_id = self.folder_ids.get(folder)
+        if folder_id is None:
+            parent, _, name = folder.rpartition("/")
+            parent_id = self._folder(parent)
+            folder_id = self.folder_ids[folder] = len(self.folder_parent)
+            self.folder_names += name.encode("utf-8")
+            self.folder_parent.append(parent_id)
+            self.folder_name_ends.append(len(self.folder_names))
+        return folder_id
+
+    def add(self, rel_path, size, mtime_ns, sha256_hex):
+        """Append one file ('/'-separated relative path)"""
+        folder, _, name = rel_path.rpartition("/")
+        self.file_folder.append(self._folder(folder))
+        self.file_names += name.encode("utf-8")
+        self.file_name_ends.append(len(self.file_names))
+        self.sizes.append(size)
+        self.mtimes.append(mtime_ns)
+        self.digests += bytes.fromhex(sha256_hex)
+
+    def write(self, path, meta):
+        """Write the manifest file"""
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        names = self.folder_names + self.file_names
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self.sizes), len(self.folder_parent),
+                                len(meta_bytes), len(names)))
+            f.write(meta_bytes)
+            # 8-byte columns first so they stay aligned for memoryview.cast()
+            f.write(b"\0" * (-(HEADER.size + len(meta_bytes)) % 8))
+            for column in (self.sizes, self.mtimes, self.folder_parent, self.folder_name_ends,
+                           self.file_folder, self.file_name_ends):
+                if sys.byteorder != "little":
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                f.write(column.tobytes())
+            f.write(self.digests)
+            f.write(names)
+
+
+class BinaryManifest:
+    """Read-only view of manifest.bin; entries are decoded on demand"""
+
+    def __init__(self, path):
+        data = Path(path).read_bytes()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not a binary manifest")
+        magic, version, _, files, folders, meta_len, names_len = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary manifest")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} has binary manifest version {version} (expected {FORMAT_VERSION})")
+
+        view = memoryview(data)
+        offset = HEADER.size
+        self.meta = json.loads(bytes(view[offset:offset + meta_len]).decode("utf-8"))
+        offset += meta_len
+        offset += -offset % 8
+
+        def take(length, typecode=None):
+            nonlocal offset
+            chunk = view[offset:offset + length]
+            if len(chunk) != length:
+                raise ValueError(f"{path} is truncated")
+            offset += length
+            if typecode is None:
+                return chunk
+            if sys.byteorder != "little":
+                column = array(typecode, chunk.tobytes())
+                column.byteswap()
+                return column
+            return chunk.cast(typecode)
+
+        self.sizes = take(8 * files, "Q")
+        self.mtimes = take(8 * files, "q")
+        self.folder_parent = take(4 * folders, "I")
+        self.folder_name_ends = take(4 * folders, "I")
+        self.file_folder = take(4 * files, "I")
+        self.file_name_ends = take(4 * files, "I")
+        self.digests = take(DIGEST_SIZE * files)
+        self.names = take(names_len)
+        self.folder_names_len = self.folder_name_ends[-1] if folders else 0
+        self._folder_paths = {}
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def _name(self, start, end):
+        return bytes(self.names[start:end]).decode("utf-8")
+
+    def folder_path(self, folder_id):
+        """'/'-separated path of a folder ('' for the project root)"""
+        path = self._folder_paths.get(folder_id)
+        if path is None:
+            parent = self.folder_parent[folder_id]
+            if parent == NO_PARENT:
+                path = ""
+            else:
+                name = self._name(self.folder_name_ends[folder_id - 1], self.folder_name_ends[folder_id])
+                parent_path = self.folder_path(parent)
+                path = f"{parent_path}/{name}" if parent_path else name
+            self._folder_paths[folder_id] = path
+        return path
+
+    def path(self, index):
+        """'/'-separated relative path of file `index`"""
+        start = self.folder_names_len + (self.file_name_ends[index - 1] if index else 0)
+        end = self.folder_names_len + self.file_name_ends[index]
+        folder = self.folder_path(self.file_folder[index])
+        name = self._name(start, end)
+        return f"{folder}/{name}" if folder else name
+
+    def sha256(self, index):
+        """Hex digest of file `index`"""
+        return self.digests[index * DIGEST_SIZE:(index + 1) * DIGEST_SIZE].hex()
+
+    def entries(self, start=0, stop=None):
+        """Yield (path, size, mtime_ns, sha256) for files start..stop"""
+        for index in range(start, min(len(self), len(self) if stop is None else stop)):
+            yield self.path(index), self.sizes[index], self.mtimes[index], self.sha256(index)
+
+    def to_json_manifest(self):
+        """The equivalent manifest.json dict"""
+        manifest = dict(self.meta)
+        manifest["files"] = {path: {"size": size, "sha256": digest} for path, size, _, digest in self.entries()}
+        return manifest
@@ -0,0 +1,153 @@
+# amatak_winapp/scripts/_build_report.py
+"""
+Machine-readable build report.
+
+Every build writes installer/build-report.json so CI can track installer
+size and build time without scraping console output. Stage durations and
+cache counters come from the _profiling event log (recorded for every
+build, not only with --profile); payload and installer sizes are read
+back from the generated NSIS script.
+
+Bump REPORT_SCHEMA_VERSION whenever a field is renamed or removed;
+adding fields is backwards compatible.
+"""
+import os
+import re
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    from . import _profiling, _project_metadata
+except ImportError:
+    import _profiling
+    import _project_metadata
+
+REPORT_SCHEMA_VERSION = 1
+REPORT_FILE = Path("installer") / "build-report.json"
+NSI_FILE = Path("installer") / "win_installer.nsi"
+
+NSI_FILE_RE = re.compile(r'^\s*File\s+"([^"]+)"', re.MULTILINE)
+NSI_OUTFILE_RE = re.compile(r'^\s*OutFile\s+"([^"]+)"', re.MULTILINE)
+
+
+def read_project_info(project_path):
+    """Project name and version as the installer scripts see them (see _project_metadata)"""
+    metadata = _project_metadata.load(project_path)
+    return metadata.name, metadata.version
+
+
+def nsi_path_to_local(installer_dir, nsi_path):
+    """Resolve a `..\\path` from the NSIS script against the installer/ folder"""
+    return Path(os.path.normpath(installer_dir / nsi_path.replace("\\", "/")))
+
+
+def read_payload(project_path):
+    """(file count, payload bytes, installer OutFile) from the generated NSIS script"""
+    nsi_file = project_path / NSI_FILE
+    if not nsi_file.exists():
+        return None, None, None
+
+    content = nsi_file.read_text(encoding="utf-8")
+    installer_dir = nsi_file.parent
+    files = {nsi_path_to_local(installer_dir, path) for path in NSI_FILE_RE.findall(content)}
+
+    payload_bytes = 0
+    for path in files:
+        try:
+            payload_bytes += path.stat().st_size
+        except OSError:
+            pass
+
+    outfile = NSI_OUTFILE_RE.search(content)
+    return len(files), payload_bytes, outfile.group(1) if outfile else None
+
+
+def find_installer(project_path, outfile):
+    """Locate the compiled installer (makensis writes next to the script)"""
+    if not outfile:
+        return None
+    for candidate in (project_path / NSI_FILE.parent / outfile, project_path / outfile):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def build_report(project_path, events, success, warnings, duration_s, generator_version=None):
+    """Assemble the report dict"""
+    project_path = Path(project_path)
+    name, version = read_project_info(project_path)
+    file_count, payload_bytes, outfile = read_payload(project_path)
+    installer = find_installer(project_path, outfile)
+    installer_bytes = installer.stat().st_size if installer else None
+
+    stages = [{
+        "name": row["name"],
+        "category": row["cat"],
+        "calls": row["calls"],
+        "wall_ms": round(row["wall_ms"], 3),
+        "cpu_ms": round(row["cpu_ms"], 3),
+        "files": row["files"],
+        "bytes": row["bytes"],
+    } for row in _profiling.summarize(events)]
+
+    return {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "generator": {"name": "amatak-winapp", "version": generator_version},
+        "project": {"name": name, "version": version, "path": str(project_path)},
+        "success": bool(success),
+        "duration_ms": round(duration_s * 1000, 3),
+        "payload": {"file_count": file_count, "bytes": payload_bytes},
+        "installer": {
+            "file": installer.name if installer else outfile,
+            "bytes": installer_bytes,
+            "compression_ratio": (round(installer_bytes / payload_bytes, 4)
+                                  if installer_bytes and payload_bytes else None),
+        },
+        "stages": stages,
+        "cache": {
+            "hits": sum(event.get("hits", 0) for event in events),
+            "misses": sum(event.get("misses", 0) for event in events),
+        },
+        "warnings": list(warnings),
+    }
+
+
+def write_report(project_path, report):
+    """Write installer/build-report.json; returns its path"""
+    report_path = Path(project_path) / REPORT_FILE
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report_path
+
+
+class BuildRecorder:
+    """Collects stage events for one build and writes its report
+
+    child_env is the build's environment for its generator scripts (not
+    os.environ, which concurrent GUI builds share); the event log is added
+    to it while the build runs.
+    """
+
+    def __init__(self, project_path, child_env):
+        self.project_path = Path(project_path)
+        self.child_env = child_env
+        self.started = time.perf_counter()
+        # Reuse the --profile event log when one is active
+        self.owns_trace = _profiling.TRACE_ENV not in child_env
+        if self.owns_trace:
+            self.event_log = _profiling.start_trace(self.project_path)
+            child_env[_profiling.TRACE_ENV] = str(self.event_log)
+        else:
+            self.event_log = child_env[_profiling.TRACE_ENV]
+
+    def finish(self, success, warnings=(), generator_version=None):
+        """Stop recording and write the report; returns its path"""
+        if self.owns_trace:
+            self.child_env.pop(_profiling.TRACE_ENV, None)
+        events = _profiling.load_events(self.event_log)
+        report = build_report(self.project_path, events, success, warnings,
+                              time.perf_counter() - self.started, generator_version)
+        return write_report(self.project_path, report)
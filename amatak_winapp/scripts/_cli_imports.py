@@ -0,0 +1,54 @@
+# amatak_winapp/scripts/_cli_imports.py
+"""
+Which modules the winapp CLI loads per subcommand.
+
+winapp.py imports its heavy dependencies lazily, so `--version`, `help`
+and `nsi` start without Tk, Pillow or the subprocess machinery. probe()
+runs one subcommand in a fresh interpreter (-X importtime) and reports
+what it loaded; FORBIDDEN_MODULES lists what each must never load.
+Used by the tests and by benchmarks/run_benchmarks.py.
+"""
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+PACKAGE_PARENT = Path(__file__).resolve().parent.parent.parent  # Folder holding amatak_winapp/
+
+FORBIDDEN_MODULES = {
+    "--version": {"subprocess", "json", "shutil", "tkinter", "PIL", "fpdf", "watchdog"},
+    "help": {"subprocess", "json", "shutil", "tkinter", "PIL", "fpdf", "watchdog"},
+    "nsi": {"tkinter", "PIL", "fpdf", "watchdog"},
+}
+
+
+def probe(command, project):
+    """Run `winapp <command>` in a fresh interpreter inside project
+
+    Returns (exit code, top-level packages loaded, import time of amatak_winapp.winapp in us).
+    """
+    argv = ["winapp", command] + ([str(project)] if command == "nsi" else [])
+    # The harness itself must not import anything before the module list is taken
+    code = (
+        "import sys, os\n"
+        f"sys.argv = {argv!r}\n"
+        "from amatak_winapp.winapp import main\n"
+        "stdout = sys.stdout\n"
+        "sys.stdout = open(os.devnull, 'w')\n"
+        "main()\n"
+        "sys.stdout = stdout\n"
+        "sys.stderr.write('MODULES ' + ' '.join(sorted(sys.modules)) + '\\n')\n"
+    )
+    env = os.environ.copy()
+    env["PYTHONPATH"] = f"{PACKAGE_PARENT}{os.pathsep}{env.get('PYTHONPATH', '')}"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, env=env, cwd=str(project))
+
+    modules = []
+    import_us = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith("MODULES "):
+            modules = line[len("MODULES "):].split()
+        elif line.startswith("import time:") and line.rstrip().endswith("amatak_winapp.winapp"):
+            import_us = int(line.split("|")[1])
+    return proc.returncode, {name.split(".")[0] for name in modules}, import_us
@@ -0,0 +1,133 @@
+# amatak_winapp/scripts/_hash_cache.py
+"""
+Persistent content-hash cache for generator scripts.
+
+Dedup and the installer manifest need a SHA-256 of every payload file.
+The digests are kept in installer/.cache/hashes.sqlite3 keyed by
+(relative path, size, mtime_ns, inode): a file whose stat still matches
+is never re-read. The whole table is loaded with one query when the
+cache opens and new digests are written back in a single transaction,
+so revalidating a large project costs one stat per file.
+
+Files modified within RACY_WINDOW_NS of hashing are not cached - a later
+write inside the same timestamp tick would otherwise go unnoticed.
+The cache is only an accelerator: if sqlite3 is unavailable or the
+database is unusable, lookups simply miss.
+"""
+import time
+from pathlib import Path
+
+try:
+    import sqlite3
+except ImportError:  # Some embedded Python builds ship without it
+    sqlite3 = None
+
+CACHE_DIR = Path("installer") / ".cache"
+CACHE_FILE = "hashes.sqlite3"
+SCHEMA_VERSION = 1
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+
+class HashCache:
+    """SHA-256 digests of project files, reused while their stat is unchanged"""
+
+    def __init__(self, project_root):
+        self.path = Path(project_root) / CACHE_DIR / CACHE_FILE
+        self.entries = {}
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.db = self._open() if sqlite3 else None
+
+    def _open(self):
+        """Connect and load every row; None if the database cannot be used"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = self._connect()
+        except sqlite3.DatabaseError:
+            # Corrupt or foreign file - it is only a cache, start over
+            try:
+                self.path.unlink()
+                db = self._connect()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: Hash cache disabled ({e})")
+                return None
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Hash cache disabled ({e})")
+            return None
+
+        for path, size, mtime_ns, inode, digest in db.execute(
+                "SELECT path, size, mtime_ns, inode, sha256 FROM files"):
+            self.entries[path] = (size, mtime_ns, inode, digest)
+        return db
+
+    def _connect(self):
+        """Open the database, creating (or recreating) the schema"""
+        db = sqlite3.connect(str(self.path))
+        try:
+            db.execute("PRAGMA synchronous = OFF")
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                with db:
+                    db.execute("DROP TABLE IF EXISTS files")
+                    db.execute("CREATE TABLE files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                               "inode INTEGER, sha256 TEXT) WITHOUT ROWID")
+                    db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            db.execute("SELECT COUNT(*) FROM files").fetchone()
+        except sqlite3.Error:
+            db.close()
+            raise
+        return db
+
+    @staticmethod
+    def _key(st):
+        return st.st_size, st.st_mtime_ns, st.st_ino
+
+    def get(self, rel_path, st):
+        """Cached digest for a file with this os.stat() result, or None"""
+        entry = self.entries.get(rel_path)
+        if entry is not None and entry[:3] == self._key(st):
+            self.hits += 1
+            return entry[3]
+        self.misses += 1
+        return None
+
+    def put(self, rel_path, st, digest):
+        """Remember a digest (written on flush)"""
+        if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+            return
+        entry = self._key(st) + (digest,)
+        self.entries[rel_path] = entry
+        self.pending[rel_path] = entry
+
+    def flush(self):
+        """Write new digests in one transaction"""
+        if not self.pending or self.db is None:
+            self.pending.clear()
+            return
+        rows = [(path,) + entry for path, entry in self.pending.items()]
+        try:
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not update hash cache: {e}")
+        self.pending.clear()
+
+    def prune(self, keep_paths):
+        """Drop entries for files that are no longer part of the project"""
+        stale = [path for path in self.entries if path not in keep_paths]
+        for path in stale:
+            del self.entries[path]
+            self.pending.pop(path, None)
+        if stale and self.db is not None:
+            try:
+                with self.db:
+                    self.db.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in stale])
+            except sqlite3.Error as e:
+                print(f"Warning: Could not update hash cache: {e}")
+
+    def close(self):
+        """Flush and close the database"""
+        self.flush()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,133 @@
+# amatak_winapp/scripts/_import_graph.py
+"""
+Static import graph of a project's own modules.
+
+ImportGraph.reachable() starts at the entry scripts (main.py) and follows
+every `import` / `from ... import` that resolves to a .py file in the
+project, parsing each module with `ast` - nothing is imported or run.
+Standard-library and third-party imports are ignored; they are not part
+of the payload.
+
+importlib.import_module("x") and __import__("x") with a literal name are
+followed like imports. Any other dynamic import cannot be resolved
+statically; it is reported so the module can be added to the allowlist
+(`keep_modules`). Files that do not parse are kept as they are and their
+imports are not followed.
+"""
+import ast
+import sys
+
+DYNAMIC_IMPORT_CALLS = {"import_module", "__import__"}
+
+
+def string_literal(node):
+    """Value of a string literal node, or None"""
+    if sys.version_info < (3, 8):
+        # Python 3.7 parses string literals as ast.Str
+        return node.s if isinstance(node, ast.Str) else None
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def module_name(rel_path, search_paths=("",)):
+    """Dotted module name of a '/'-separated .py path, or None if it is not importable from a search path"""
+    for root in sorted(search_paths, key=len, reverse=True):
+        prefix = root.strip("/") + "/" if root.strip("/") else ""
+        if not rel_path.startswith(prefix):
+            continue
+        parts = rel_path[len(prefix):].rsplit(".", 1)[0].split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        if parts and all(part.isidentifier() for part in parts):
+            return ".".join(parts)
+    return None
+
+
+class ImportGraph:
+    """Project modules and the imports between them"""
+
+    def __init__(self, read_source, py_files, search_paths=("",)):
+        self.read_source = read_source  # rel_path -> bytes
+        self.modules = {}  # dotted name -> rel_path
+        for rel_path in py_files:
+            name = module_name(rel_path, search_paths)
+            if name and name not in self.modules:
+                self.modules[name] = rel_path
+        self.dynamic_imports = []  # (rel_path, line, source text) that could not be followed
+        self.unparsed = {}  # rel_path -> error
+
+    def _package_of(self, rel_path, name):
+        """Package a module's relative imports are resolved against"""
+        if rel_path.endswith("__init__.py"):
+            return name
+        return name.rpartition(".")[0]
+
+    def _resolve(self, dotted):
+        """Project modules executed by importing `dotted` (its parent packages included)"""
+        parts = dotted.split(".")
+        return [self.modules[name] for name in (".".join(parts[:i]) for i in range(1, len(parts) + 1))
+                if name in self.modules]
+
+    def imports_of(self, rel_path, name=None):
+        """Project files a module imports"""
+        try:
+            source = self.read_source(rel_path)
+            tree = ast.parse(source, filename=rel_path)
+        except (SyntaxError, ValueError, OSError) as e:
+            self.unparsed[rel_path] = str(e)
+            return []
+        lines = None
+
+        package = self._package_of(rel_path, name) if name else ""
+        found = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    found += self._resolve(alias.name)
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    anchor = package.split(".") if package else []
+                    anchor = anchor[:len(anchor) - (node.level - 1)] if node.level > 1 else anchor
+                    base = ".".join(part for part in anchor + base.split(".") if part)
+                if base:
+                    found += self._resolve(base)
+                # `from pkg import sub` may name a submodule rather than an attribute
+                for alias in node.names:
+                    submodule = f"{base}.{alias.name}" if base else alias.name
+                    if submodule in self.modules:
+                        found.append(self.modules[submodule])
+            elif isinstance(node, ast.Call):
+                func = node.func
+                func_name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+                if func_name not in DYNAMIC_IMPORT_CALLS:
+                    continue
+                target = string_literal(node.args[0]) if node.args else None
+                if target:
+                    found += self._resolve(target)
+                else:
+                    # Reported as the source line (ast.unparse needs Python 3.9)
+                    if lines is None:
+                        lines = source.decode("utf-8", "replace").splitlines()
+                    code = lines[node.lineno - 1].strip() if node.lineno <= len(lines) else ""
+                    self.dynamic_imports.append((rel_path, node.lineno, code))
+        return found
+
+    def reachable(self, entry_files, keep_modules=()):
+        """Project files reachable from the entry scripts and the allowlisted modules"""
+        todo = list(entry_files)
+        for name in keep_modules:
+            resolved = self._resolve(name)
+            # A kept package brings all of its submodules
+            todo += resolved + [path for module, path in self.modules.items() if module.startswith(name + ".")]
+
+        names = {rel_path: name for name, rel_path in self.modules.items()}
+        seen = set()
+        while todo:
+            rel_path = todo.pop()
+            if rel_path in seen:
+                continue
+            seen.add(rel_path)
+            todo += self.imports_of(rel_path, names.get(rel_path))
+        return seen
@@ -2,53 +2,43 @@
 
 import os
 import sys
+import fnmatch
 from datetime import datetime
 from pathlib import Path
 
 # Add package directory to path to import from amatak_winapp
-script_dir = Path(__file__).parent
+script_dir = Path(__file__).resolve().parent
 package_root = script_dir.parent
 sys.path.insert(0, str(package_root))
 
+try:
+    from . import _profiling, _walker, _project_metadata
+except ImportError:
+    import _profiling
+    import _walker
+    import _project_metadata
+
 # Configuration
 EXCLUDE_DIRS = {".venv", ".git", "__pycache__", ".idea", ".vscode", "installer", "assets"}
+# Shared helpers of the generator scripts (this scanner included) - never exported from an __init__.
+# Only this package's own scripts folder (amatak_winapp/scripts) is matched, never user folders.
+HELPER_MODULES = "_*.py"
+HELPER_MODULES_DIR = os.path.join(package_root.name, script_dir.name)
 CURRENT_YEAR = datetime.now().year
 OWNER = "Amatak Holdings Pty Ltd"
 
 def get_package_version():
     """Reads version from amatak_winapp/data/VERSION.txt or returns default."""
-    # First try to read directly from the data directory
-    version_file = package_root / "data" / "VERSION.txt"
-    if version_file.exists():
-        try:
-            version = version_file.read_text(encoding='utf-8').strip()
-            print(f"[INFO] Found package version in data/VERSION.txt: {version}")
-            return version
-        except Exception as e:
-            print(f"[WARNING] Could not read version from {version_file}: {e}")
-    
-    # Try to import from package
-    try:
-        from amatak_winapp import __version__
-        print(f"[INFO] Using __version__ from package: {__version__}")
-        return __version__
-    except ImportError as e:
-        print(f"[WARNING] Could not import __version__: {e}")
-    
-    # Final fallback
-    return "1.0.2"
+    version = _project_metadata.package_version()
+    print(f"[INFO] Using package version: {version}")
+    return version
 
 def get_project_version():
-    """Reads version from project's VERSION.txt (if exists) or uses package version."""
-    # First check for project-specific VERSION.txt
-    project_version_file = Path.cwd() / "VERSION.txt"
-    if project_version_file.exists():
-        try:
-            version = project_version_file.read_text(encoding='utf-8').strip()
-            print(f"[INFO] Using project version from VERSION.txt: {version}")
-            return version
-        except Exception as e:
-            print(f"[WARNING] Could not read project VERSION.txt: {e}")
+    """Reads version from project's VERSION.txt / config.json (if any) or uses package version."""
+    version = _project_metadata.load().version
+    if version:
+        print(f"[INFO] Using project version: {version}")
+        return version
     
     # Use package version as fallback
     return get_package_version()
@@ -71,52 +61,53 @@ def generate_inits():
 
     init_count = 0
     
-    for root, dirs, files in os.walk(project_root):
-        # Filter excluded directories
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-        
-        # Skip project root (we'll handle it separately)
-        if root == project_root:
-            continue
+    with _profiling.stage("generate_inits", category="_init_scanner") as inits:
+        # Excluded directories are pruned by the walker (sibling folders are listed concurrently)
+        for root, dirs, files in _walker.walk(project_root, EXCLUDE_DIRS):
+            # Skip project root (we'll handle it separately)
+            if root == project_root:
+                continue
 
-        init_path = os.path.join(root, "__init__.py")
+            init_path = os.path.join(root, "__init__.py")
         
-        # Find all .py modules (excluding __init__ and scripts)
-        py_modules = sorted([
-            f[:-3] for f in files 
-            if f.endswith(".py") and f not in ["__init__.py", "_init_scanner.py"]
-        ])
+            # Find all .py modules (excluding __init__ and script helpers)
+            rel_folder = os.path.relpath(root, project_root)
+            helper_dir = os.path.normcase(root).endswith(os.path.normcase(os.sep + HELPER_MODULES_DIR))
+            py_modules = sorted([
+                f[:-3] for f in files 
+                if f.endswith(".py") and f != "__init__.py" and not (helper_dir and fnmatch.fnmatch(f, HELPER_MODULES))
+            ])
 
-        # Generate the content components
-        version_line = f'__version__ = "{current_version}"\n'
+            # Generate the content components
+            version_line = f'__version__ = "{current_version}"\n'
         
-        # Build import lines
-        import_lines = []
-        if py_modules:
-            import_lines = [f"from . import {module}" for module in py_modules]
+            # Build import lines
+            import_lines = []
+            if py_modules:
+                import_lines = [f"from . import {module}" for module in py_modules]
         
-        # Add modules + version variable to __all__
-        export_list = py_modules + ["__version__"]
-        all_line = f"__all__ = {export_list}"
+            # Add modules + version variable to __all__
+            export_list = py_modules + ["__version__"]
+            all_line = f"__all__ = {export_list}"
         
-        # Assemble file content
-        full_content = copyright_header
-        full_content += version_line
-        if import_lines:
-            full_content += "\n".join(import_lines) + "\n\n"
-        full_content += all_line + "\n"
+            # Assemble file content
+            full_content = copyright_header
+            full_content += version_line
+            if import_lines:
+                full_content += "\n".join(import_lines) + "\n\n"
+            full_content += all_line + "\n"
 
-        # Write the file
-        try:
-            with open(init_path, "w", encoding="utf-8") as f:
-                f.write(full_content)
+            # Write the file
+            try:
+                with open(init_path, "w", encoding="utf-8") as f:
+                    f.write(full_content)
+                inits.add_files()
+                inits.add_bytes(len(full_content.encode("utf-8")))
             
-            rel_folder = os.path.relpath(root, project_root)
-            print(f"[OK] [{CURRENT_YEAR}] Initialized: {rel_folder}/__init__.py (v{current_version})")
-            init_count += 1
-        except Exception as e:
-            rel_folder = os.path.relpath(root, project_root)
-            print(f"[ERROR] Failed to initialize {rel_folder}/__init__.py: {e}")
+                print(f"[OK] [{CURRENT_YEAR}] Initialized: {rel_folder}/__init__.py (v{current_version})")
+                init_count += 1
+            except Exception as e:
+                print(f"[ERROR] Failed to initialize {rel_folder}/__init__.py: {e}")
     
     # Special handling for the package root __init__.py
     if str(project_root).endswith("amatak_winapp"):
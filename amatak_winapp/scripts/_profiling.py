@@ -0,0 +1,408 @@
+# amatak_winapp/scripts/_profiling.py
+"""
+Stage timing for WinApp commands and generator scripts.
+
+Profiling is switched on by `winapp <command> --profile`, which creates an
+event log for that command and passes its path to the generator scripts
+it spawns in the WINAPP_TRACE_FILE environment variable (set for the
+child process only - GUI jobs for other projects run in the same process
+with logs of their own). Every `stage()` block appends one JSON line to
+the log with wall time, CPU time, files processed and bytes written.
+When the command finishes the CLI prints a summary table and exports
+the events as Chrome trace-event JSON (opens in Perfetto or
+chrome://tracing).
+
+`--cprofile [out.prof]` and `--tracemalloc` profile the command body the
+same way: the CLI process is profiled directly and every generator script
+it launches picks the request up from WINAPP_CPROFILE_DIR /
+WINAPP_TRACEMALLOC_DIR (again set for the child only) when it imports
+this module, dumping its results at exit. The CLI merges them into
+installer/.profile/. tracemalloc traces the whole process, so profiled
+commands in one process run one at a time.
+
+Without an event log a stage only counts; nothing is timed or written.
+"""
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+TRACE_ENV = "WINAPP_TRACE_FILE"
+CPROFILE_ENV = "WINAPP_CPROFILE_DIR"
+TRACEMALLOC_ENV = "WINAPP_TRACEMALLOC_DIR"
+PROFILE_DIR = Path("installer") / ".profile"
+EVENT_LOG_NAME = "trace-events.jsonl"
+TRACE_NAME = "{command}-trace.json"
+CPROFILE_NAME = "{command}.prof"
+TRACEMALLOC_NAME = "{command}-tracemalloc.txt"
+TRACEMALLOC_FRAMES = 25  # Stack depth kept per allocation
+TRACEMALLOC_TOP = 25  # Allocation sites listed per process
+CPROFILE_TOP = 30  # Functions printed after a --cprofile run
+
+_profile_lock = threading.Lock()  # Held by the profiled command running in this process
+
+
+class Stage:
+    """Counters a stage body can update while it runs"""
+
+    __slots__ = ("name", "category", "args", "files", "bytes_written", "hits", "misses")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.files = 0
+        self.bytes_written = 0
+        self.hits = 0
+        self.misses = 0
+
+    def add_files(self, count=1):
+        """Count files processed"""
+        self.files += count
+
+    def add_bytes(self, count):
+        """Count bytes written"""
+        self.bytes_written += count
+
+    def cache(self, hit, count=1):
+        """Count cache lookups that were (or were not) satisfied"""
+        if hit:
+            self.hits += count
+        else:
+            self.misses += count
+
+    def wrote(self, path):
+        """Count an output file by its size on disk"""
+        try:
+            self.bytes_written += os.path.getsize(path)
+        except OSError:
+            pass
+
+
+def is_enabled():
+    """True when this (generator script) process was launched with an event log"""
+    return bool(os.environ.get(TRACE_ENV))
+
+
+@contextmanager
+def stage(name, category="stage", trace_file=None, **args):
+    """Time the enclosed block and append it to the trace log (if profiling)
+
+    trace_file: the command's event log; generator scripts leave it out and
+    use the one they were launched with.
+    """
+    current = Stage(name, category, args)
+    trace_file = trace_file or os.environ.get(TRACE_ENV)
+    if not trace_file:
+        yield current
+        return
+
+    start_ns = time.time_ns()
+    start_perf = time.perf_counter_ns()
+    start_cpu = time.process_time_ns()
+    try:
+        yield current
+    finally:
+        record_event(trace_file, current,
+                     ts_us=start_ns // 1000,
+                     dur_us=(time.perf_counter_ns() - start_perf) // 1000,
+                     cpu_us=(time.process_time_ns() - start_cpu) // 1000)
+
+
+def record_event(trace_file, current, ts_us, dur_us, cpu_us):
+    """Append one finished stage to the event log"""
+    event = {
+        "name": current.name,
+        "cat": current.category,
+        "ts": ts_us,
+        "dur": dur_us,
+        "cpu": cpu_us,
+        "files": current.files,
+        "bytes": current.bytes_written,
+        "hits": current.hits,
+        "misses": current.misses,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "process": Path(sys.argv[0]).name if sys.argv and sys.argv[0] else "python",
+        "args": {key: str(value) for key, value in current.args.items()},
+    }
+    try:
+        # One write per line keeps concurrent writers from interleaving
+        with open(trace_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+    except OSError as e:
+        print(f"Warning: Could not record profile event '{current.name}': {e}")
+
+
+def start_trace(project_path):
+    """Create an empty event log for one command in a project; returns its path
+
+    Pass the path to stage() in this process and, as TRACE_ENV, in the
+    environment of the generator scripts the command runs.
+    """
+    profile_dir = Path(project_path) / PROFILE_DIR
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    event_log = profile_dir / EVENT_LOG_NAME
+    event_log.write_text("", encoding="utf-8")
+    return event_log
+
+
+def load_events(trace_file):
+    """Read an event log, skipping lines cut short by a crashed writer"""
+    events = []
+    try:
+        with open(trace_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        return []
+    events.sort(key=lambda event: event["ts"])
+    return events
+
+
+def summarize(events):
+    """Aggregate events by stage name, in order of first appearance"""
+    rows = {}
+    for event in events:
+        row = rows.setdefault(event["name"], {
+            "name": event["name"], "cat": event["cat"], "calls": 0,
+            "wall_ms": 0.0, "cpu_ms": 0.0, "files": 0, "bytes": 0,
+        })
+        row["calls"] += 1
+        row["wall_ms"] += event["dur"] / 1000
+        row["cpu_ms"] += event["cpu"] / 1000
+        row["files"] += event["files"]
+        row["bytes"] += event["bytes"]
+    return list(rows.values())
+
+
+def print_summary(events):
+    """Print the per-stage timing table"""
+    rows = summarize(events)
+    if not rows:
+        print("No profile events were recorded.")
+        return
+
+    width = max(len("Stage"), max(len(row["name"]) for row in rows))
+    print("\nProfile summary")
+    print("=" * (width + 52))
+    print(f"{'Stage':<{width}}  {'Calls':>5}  {'Wall ms':>10}  {'CPU ms':>10}  {'Files':>8}  {'Bytes':>10}")
+    print("-" * (width + 52))
+    for row in rows:
+        print(f"{row['name']:<{width}}  {row['calls']:>5}  {row['wall_ms']:>10.1f}  {row['cpu_ms']:>10.1f}  "
+              f"{row['files']:>8}  {row['bytes']:>10}")
+    print("=" * (width + 52))
+
+
+def export_chrome_trace(events, output_path):
+    """Write events as Chrome trace-event JSON; returns the output path"""
+    output_path = Path(output_path)
+    origin = events[0]["ts"] if events else 0
+
+    trace_events = []
+    named = set()
+    for event in events:
+        if event["pid"] not in named:
+            named.add(event["pid"])
+            trace_events.append({"name": "process_name", "ph": "M", "pid": event["pid"], "tid": event["tid"],
+                                 "args": {"name": f"{event['process']} ({event['pid']})"}})
+        args = dict(event["args"])
+        args.update(cpu_ms=round(event["cpu"] / 1000, 3), files=event["files"], bytes=event["bytes"])
+        trace_events.append({
+            "name": event["name"],
+            "cat": event["cat"],
+            "ph": "X",
+            "ts": event["ts"] - origin,
+            "dur": event["dur"],
+            "pid": event["pid"],
+            "tid": event["tid"],
+            "args": args,
+        })
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps({"traceEvents": trace_events, "displayTimeUnit": "ms"}, indent=1),
+                           encoding="utf-8")
+    return output_path
+
+
+def trace_path(project_path, command):
+    """Default Chrome trace location for a command"""
+    return Path(project_path) / PROFILE_DIR / TRACE_NAME.format(command=command)
+
+
+def process_label():
+    """Short name for this process in profile file names"""
+    script = Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "python"
+    return f"{script}-{os.getpid()}"
+
+
+def format_tracemalloc(snapshot, title, limit=TRACEMALLOC_TOP):
+    """Top allocation sites of a snapshot as text"""
+    import tracemalloc
+    
+    # Skipping these after grouping is far cheaper than Snapshot.filter_traces()
+    ignored = {tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>"}
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"## {title}", f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB", ""]
+    statistics = (statistic for statistic in snapshot.statistics("lineno")
+                  if statistic.traceback[0].filename not in ignored)
+    for index, statistic in enumerate(statistics, 1):
+        if index > limit:
+            break
+        frame = statistic.traceback[0]
+        lines.append(f"{index:>3}. {frame.filename}:{frame.lineno}  "
+                     f"{statistic.size / 1024:.1f} KiB in {statistic.count} blocks")
+    return "\n".join(lines) + "\n"
+
+
+def _dump_child_profiles(profiler, cprofile_dir, tracemalloc_dir):
+    """atexit hook: save this process's allocation sites and cProfile stats"""
+    import tracemalloc
+    
+    if profiler:
+        profiler.disable()
+    try:
+        # Snapshot before writing the pstats file so that work does not show up
+        if tracemalloc_dir and tracemalloc.is_tracing():
+            report = format_tracemalloc(tracemalloc.take_snapshot(), process_label())
+            os.makedirs(tracemalloc_dir, exist_ok=True)
+            with open(os.path.join(tracemalloc_dir, f"{process_label()}.txt"), "w", encoding="utf-8") as f:
+                f.write(report)
+        if profiler:
+            os.makedirs(cprofile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(cprofile_dir, f"{process_label()}.prof"))
+    except OSError as e:
+        print(f"Warning: Could not save profile results: {e}")
+
+
+def _install_child_hooks():
+    """Profile a generator script launched by a --cprofile/--tracemalloc command"""
+    import atexit
+    
+    # The CLI also sets PYTHONTRACEMALLOC, so tracing started with the interpreter
+    tracemalloc_dir = os.environ.get(TRACEMALLOC_ENV)
+    cprofile_dir = os.environ.get(CPROFILE_ENV)
+    
+    profiler = None
+    if cprofile_dir:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    atexit.register(_dump_child_profiles, profiler, cprofile_dir, tracemalloc_dir)
+
+
+def _output_path(profile_dir, path, default_name):
+    """Resolve a user-supplied output file; relative names go into installer/.profile/"""
+    path = Path(path) if path else Path(default_name)
+    return path if path.is_absolute() else profile_dir / path
+
+
+def _reset_dir(path):
+    """Empty a per-run output folder"""
+    if path.exists():
+        for child in path.iterdir():
+            if child.is_file():
+                child.unlink()
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def profile_command(project_path, command, func, *args, trace=False, cprofile=None, tracemalloc=False,
+                    child_env=None):
+    """Run func(*args) with the requested profilers; results go to installer/.profile/
+
+    trace: stage timings + Chrome trace (--profile)
+    cprofile: True or an output file name for merged pstats (--cprofile)
+    tracemalloc: top allocation sites per process (--tracemalloc)
+    child_env: dict the command passes to its generator scripts' environment;
+        the profiler settings are added to it for the duration of the command
+    """
+    if not _profile_lock.acquire(blocking=False):
+        print("Another profiled command is running in this process; waiting for it to finish...")
+        _profile_lock.acquire()
+    try:
+        return _profile_command(project_path, command, func, args, trace, cprofile, tracemalloc,
+                                {} if child_env is None else child_env)
+    finally:
+        _profile_lock.release()
+
+
+def _profile_command(project_path, command, func, args, trace, cprofile, tracemalloc, child_env):
+    """profile_command() body, run with _profile_lock held"""
+    project_path = Path(project_path)
+    profile_dir = project_path / PROFILE_DIR
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    
+    profiler = None
+    event_log = None
+    if trace:
+        event_log = start_trace(project_path)
+        child_env[TRACE_ENV] = str(event_log)
+    if cprofile:
+        import cProfile
+        cprofile_dir = profile_dir / "cprofile"
+        _reset_dir(cprofile_dir)
+        child_env[CPROFILE_ENV] = str(cprofile_dir)
+        profiler = cProfile.Profile()
+    if tracemalloc:
+        import tracemalloc as tracemalloc_module
+        tracemalloc_dir = profile_dir / "tracemalloc"
+        _reset_dir(tracemalloc_dir)
+        child_env[TRACEMALLOC_ENV] = str(tracemalloc_dir)
+        child_env["PYTHONTRACEMALLOC"] = str(TRACEMALLOC_FRAMES)
+        tracemalloc_module.start(TRACEMALLOC_FRAMES)
+    
+    try:
+        # Only the command body is profiled; CLI parsing has already happened
+        with stage(f"winapp {command}", category="command", trace_file=event_log, project=project_path):
+            if profiler:
+                profiler.enable()
+            try:
+                return func(*args)
+            finally:
+                if profiler:
+                    profiler.disable()
+    finally:
+        if tracemalloc:
+            child_env.pop(TRACEMALLOC_ENV, None)
+            child_env.pop("PYTHONTRACEMALLOC", None)
+            report = format_tracemalloc(tracemalloc_module.take_snapshot(), f"winapp {command} (CLI process)")
+            tracemalloc_module.stop()
+            for child in sorted(tracemalloc_dir.glob("*.txt")):
+                report += "\n" + child.read_text(encoding="utf-8")
+            output = profile_dir / TRACEMALLOC_NAME.format(command=command)
+            output.write_text(report, encoding="utf-8")
+            print(f"Allocation report written to: {output}")
+        
+        if profiler:
+            import pstats
+            child_env.pop(CPROFILE_ENV, None)
+            output = _output_path(profile_dir, cprofile if isinstance(cprofile, str) else None,
+                                  CPROFILE_NAME.format(command=command))
+            stats = pstats.Stats(profiler)
+            for child in sorted(cprofile_dir.glob("*.prof")):
+                stats.add(str(child))
+            output.parent.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(str(output))
+            print(f"\ncProfile (all processes, top {CPROFILE_TOP} by cumulative time):")
+            stats.sort_stats("cumulative").print_stats(CPROFILE_TOP)
+            print(f"pstats written to: {output}")
+            print(f"   Per-process stats: {cprofile_dir}")
+        
+        if trace:
+            child_env.pop(TRACE_ENV, None)
+            events = load_events(event_log)
+            print_summary(events)
+            trace_file = export_chrome_trace(events, trace_path(project_path, command))
+            print(f"Trace written to: {trace_file}")
+            print("   Open it in https://ui.perfetto.dev or chrome://tracing")
+
+
+# Generator scripts launched by a profiled command profile themselves
+if os.environ.get(CPROFILE_ENV) or os.environ.get(TRACEMALLOC_ENV):
+    _install_child_hooks()
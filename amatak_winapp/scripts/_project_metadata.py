@@ -0,0 +1,190 @@
+# amatak_winapp/scripts/_project_metadata.py
+"""
+Project name, version and config.json, read once and shared.
+
+The generators, the CLI and the GUI all need a project's VERSION.txt and
+config.json. load() parses both once per project root and hands out the
+same ProjectMetadata until either file's mtime or size changes, so a
+build reads them once instead of once per call site.
+
+config.json comes in two shapes and both are accepted:
+
+    {"project_name": "MyApp", "version": "1.0.0", ...}        (winapp create)
+    {"project": {"name": "MyApp", "version": "1.0.0", ...}}   (sample-app)
+
+Keys listed in CONFIG_SCHEMA / PROJECT_SCHEMA are type-checked; a key of
+the wrong type is reported once and ignored. Unknown keys are kept.
+section_options() does the same for the settings of one section
+("freeze", "deps", "installer" "prune") against the script's defaults.
+"""
+import json
+import threading
+from pathlib import Path
+
+VERSION_FILE = "VERSION.txt"
+CONFIG_FILE = "config.json"
+DEFAULT_VERSION = "1.0.0"
+BUILDER_NAME = "Amatak WinApp Generator"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+PACKAGE_FALLBACK_VERSION = "1.0.2"
+
+# key: accepted type(s)
+CONFIG_SCHEMA = {
+    "project_name": str,
+    "version": str,
+    "created": str,
+    "project": dict,
+    "installer": dict,
+    "freeze": dict,
+    "deps": dict,
+}
+PROJECT_SCHEMA = {
+    "name": str,
+    "version": str,
+    "category": str,
+    "created": str,
+    "theme": str,
+}
+
+_cache = {}  # resolved root -> (file stamps, ProjectMetadata)
+_lock = threading.Lock()
+
+
+class ProjectMetadata:
+    """Parsed VERSION.txt and config.json of one project"""
+
+    def __init__(self, root, version_text, config, problems):
+        self.root = root
+        self.config = config
+        self.problems = problems
+        project = config.get("project", {})
+
+        self.name = config.get("project_name") or project.get("name") or root.name
+        self.version = version_text or config.get("version") or project.get("version")
+        # The builder packages itself with the same scripts as any generated app
+        self.is_builder = (root / "winapp.py").exists() or (root / "amatak_winapp").exists()
+
+    @property
+    def display_name(self):
+        """Name shown in installers and reports"""
+        return BUILDER_NAME if self.is_builder else self.name
+
+    @property
+    def installer(self):
+        """The config.json "installer" section (empty if absent)"""
+        return self.config.get("installer", {})
+
+
+def validate(config, schema=CONFIG_SCHEMA, where="config.json"):
+    """Drop keys whose value has the wrong type; returns (config, problems)"""
+    if not isinstance(config, dict):
+        return {}, [f"{where} must contain a JSON object"]
+
+    config = dict(config)
+    problems = []
+    for key, expected in schema.items():
+        if key in config and not isinstance(config[key], expected):
+            problems.append(f'"{key}" in {where} must be {_type_name(expected)} '
+                            f"(got {type(config[key]).__name__}); ignoring it")
+            del config[key]
+    if "project" in config:
+        config["project"], nested = validate(config["project"], PROJECT_SCHEMA, f'{where} "project"')
+        problems.extend(nested)
+    return config, problems
+
+
+def section_options(config, section, defaults, extend=()):
+    """defaults updated with the valid values of config[section]
+
+    Each value must fit its default: a bool (any value is coerced), a list of
+    strings (a single string is accepted), or a string / null. Other values are
+    reported and ignored. Lists for the keys in extend add to the default list.
+    """
+    options = dict(defaults)
+    configured = config.get(section, {})
+    if not isinstance(configured, dict):
+        print(f'Warning: "{section}" in {CONFIG_FILE} must be an object; using defaults')
+        return options
+
+    for key, default in defaults.items():
+        if key not in configured:
+            continue
+        value = configured[key]
+        if isinstance(default, bool):
+            options[key] = bool(value)
+        elif isinstance(default, list):
+            if isinstance(value, str):
+                value = [value]
+            if isinstance(value, list) and all(isinstance(item, str) for item in value):
+                options[key] = default + value if key in extend else value
+            else:
+                print(f'Warning: "{key}" in {CONFIG_FILE} "{section}" must be a list of strings; ignoring it')
+        elif value is None or isinstance(value, str):
+            options[key] = value
+        else:
+            print(f'Warning: "{key}" in {CONFIG_FILE} "{section}" must be a string; ignoring it')
+    return options
+
+
+def _type_name(expected):
+    return {str: "a string", dict: "an object"}.get(expected, expected.__name__)
+
+
+def _stamp(path):
+    """(mtime_ns, size) of a file, None if it does not exist"""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read(root):
+    """Parse the project files (uncached)"""
+    version_text = None
+    problems = []
+    try:
+        version_text = (root / VERSION_FILE).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        pass
+    except (OSError, UnicodeDecodeError) as e:
+        problems.append(f"Could not read {VERSION_FILE}: {e}")
+
+    config = {}
+    try:
+        config = json.loads((root / CONFIG_FILE).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        problems.append(f"Could not read {CONFIG_FILE}: {e}")
+    config, invalid = validate(config)
+    return ProjectMetadata(root, version_text, config, problems + invalid)
+
+
+def load(project_root=None):
+    """ProjectMetadata for a project (default: the current directory), reparsed only when its files change"""
+    root = Path(project_root or Path.cwd()).resolve()
+    stamps = (_stamp(root / VERSION_FILE), _stamp(root / CONFIG_FILE))
+    with _lock:
+        cached = _cache.get(root)
+        if cached is not None and cached[0] == stamps:
+            return cached[1]
+
+    metadata = _read(root)
+    for problem in metadata.problems:
+        print(f"Warning: {problem}")
+    with _lock:
+        _cache[root] = (stamps, metadata)
+    return metadata
+
+
+def package_version():
+    """Version of the installed amatak_winapp package (data/VERSION.txt, then __version__)"""
+    version = load(PACKAGE_DIR / "data").version
+    if version:
+        return version
+    try:
+        from amatak_winapp import __version__
+        return __version__
+    except ImportError:
+        return PACKAGE_FALLBACK_VERSION
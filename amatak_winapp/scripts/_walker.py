@@ -0,0 +1,100 @@
+# amatak_winapp/scripts/_walker.py
+"""
+Concurrent directory walker for generator scripts.
+
+Projects often live on OneDrive-synced folders or SMB shares, where every
+directory listing is a network round trip. walk() is a drop-in for the
+os.walk() loops in the generators: it lists sibling directories on a
+bounded thread pool but still yields (root, dirs, files) in a fixed
+order - depth-first, names sorted - so generated scripts do not change
+between runs.
+
+Excluded folders are passed up front (they are pruned before they are
+listed), not by editing `dirs` in the loop as with os.walk().
+
+`scandir` is looked up at call time, so tests and benchmarks can replace
+it with a slow shim to mimic high-latency filesystems on a local disk.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+WALK_JOBS = 16  # Listings wait on I/O, not CPU; keep the pool small enough not to flood a share
+MAX_QUEUED = 4096  # Folders listed ahead of the caller at most
+
+scandir = os.scandir
+
+
+def list_dir(path):
+    """(sorted dirs, sorted files, symlinked dirs) of one folder; empty if unreadable"""
+    dirs, files, links = [], [], set()
+    try:
+        with scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    dirs.append(entry.name)
+                    if entry.is_symlink():
+                        links.add(entry.name)
+                else:
+                    files.append(entry.name)
+    except OSError:
+        pass
+    dirs.sort()
+    files.sort()
+    return dirs, files, links
+
+
+def walk(top, exclude_dirs=(), jobs=None):
+    """os.walk()-style (root, dirs, files) for top, listing folders ahead of the caller in parallel
+
+    Like os.walk(), symlinked folders are reported in `dirs` but not entered.
+    """
+    exclude_dirs = set(exclude_dirs)
+    jobs = jobs or WALK_JOBS
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    lock = threading.Lock()
+    queued = {}  # path -> listing future, for folders the caller has not reached yet
+
+    def queue(path):
+        """Start listing path unless it is already queued; call with the lock held"""
+        if path not in queued:
+            queued[path] = pool.submit(expand, path)
+
+    def expand(path):
+        """List a folder, then queue its subfolders right away so each level fans out"""
+        dirs, files, links = list_dir(path)
+        dirs = [d for d in dirs if d not in exclude_dirs]
+        with lock:
+            # Bounded lookahead keeps memory flat when the caller is slower than the disk
+            for name in dirs:
+                if name not in links and len(queued) < MAX_QUEUED:
+                    queue(os.path.join(path, name))
+        return dirs, files, links
+
+    stack = [os.fspath(top)]
+    try:
+        while stack:
+            root = stack.pop()
+            with lock:
+                queue(root)
+                listing = queued[root]
+            dirs, files, links = listing.result()
+            with lock:
+                del queued[root]
+
+            yield root, dirs, files
+            stack.extend(os.path.join(root, name) for name in reversed(dirs) if name not in links)
+            # Past the lookahead limit, keep the pool busy with the folders visited next
+            with lock:
+                for path in stack[-2 * jobs:]:
+                    queue(path)
+    finally:
+        # The caller may stop early; do not wait for listings nobody will read
+        with lock:
+            for listing in queued.values():
+                listing.cancel()
+        pool.shutdown(wait=False)
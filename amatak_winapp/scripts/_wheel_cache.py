@@ -0,0 +1,98 @@
+# amatak_winapp/scripts/_wheel_cache.py
+"""
+Content-addressed wheel store shared by every project on the machine.
+
+`winapp deps` downloads each project's dependencies once; the wheels are
+kept here by SHA-256 and hard-linked into the project's wheelhouse, so
+ten projects using the same numpy wheel store it once:
+
+    <cache>/objects/ab/ab12...ef    wheel content, named by its digest
+    <cache>/by-name/<wheel file>    the same file under its wheel name, a
+                                    flat --find-links folder for offline
+                                    resolution
+
+The cache lives in %LOCALAPPDATA%\\amatak_winapp\\wheels (~/.cache/... off
+Windows); set WINAPP_WHEEL_CACHE to move it. Hard links fall back to
+copies when the cache and the project are on different drives.
+"""
+import os
+import shutil
+import hashlib
+from pathlib import Path
+
+CACHE_ENV = "WINAPP_WHEEL_CACHE"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def default_cache_dir():
+    """Shared cache folder (WINAPP_WHEEL_CACHE overrides it)"""
+    configured = os.environ.get(CACHE_ENV)
+    if configured:
+        return Path(configured)
+    base = os.environ.get("LOCALAPPDATA") or Path.home() / ".cache"
+    return Path(base) / "amatak_winapp" / "wheels"
+
+
+def file_digest(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(source, target):
+    """Hard-link source to target (replacing target), copying across drives"""
+    partial = target.with_name(target.name + ".tmp")
+    if partial.exists():
+        partial.unlink()
+    try:
+        os.link(source, partial)
+    except OSError:
+        shutil.copyfile(source, partial)
+    os.replace(partial, target)
+
+
+class WheelCache:
+    """Wheels stored once by content, linked into project wheelhouses"""
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else default_cache_dir()
+        self.objects_dir = self.root / "objects"
+        self.by_name_dir = self.root / "by-name"
+        self.added = 0
+        self.reused = 0
+
+    def object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+
+    def has(self, digest):
+        return self.object_path(digest).exists()
+
+    def add(self, path):
+        """Store a wheel file; returns its digest"""
+        path = Path(path)
+        digest = file_digest(path)
+        stored = self.object_path(digest)
+        if stored.exists():
+            self.reused += 1
+        else:
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            link_or_copy(path, stored)
+            self.added += 1
+
+        named = self.by_name_dir / path.name
+        if not named.exists() or not os.path.samefile(named, stored):
+            self.by_name_dir.mkdir(parents=True, exist_ok=True)
+            link_or_copy(stored, named)
+        return digest
+
+    def export(self, digest, filename, target_dir):
+        """Place a stored wheel in target_dir under its wheel name"""
+        target = Path(target_dir) / filename
+        stored = self.object_path(digest)
+        if target.exists() and os.path.samefile(target, stored):
+            return target
+        link_or_copy(stored, target)
+        return target
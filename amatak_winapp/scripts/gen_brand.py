@@ -1,7 +1,16 @@
 import os
 import re
+import sys
+import json
+import hashlib
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache, partial
+from pathlib import Path
+
+try:
+    from . import _profiling
+except ImportError:
+    import _profiling
 
 # Configuration
 TREE_FILE = "tree.txt"
@@ -9,6 +18,108 @@ DEFAULT_BRAND_PATH = "assets/brand"
 CURRENT_YEAR = datetime.now().year
 OWNER = "Amatak Holdings Pty Ltd"
 
+# Brand style - every value here feeds the render fingerprint
+LOGO_SIZE = 512
+LOGO_BACKGROUND = (33, 37, 41, 255)  # Dark Slate
+LOGO_BORDER = (108, 117, 125, 255)
+LOGO_TEXT = (255, 255, 255)
+LOGO_COPYRIGHT = (173, 181, 189)
+BANNER_SIZE = (150, 57)
+BANNER_BACKGROUND = (255, 255, 255)
+BANNER_TEXT = (33, 37, 41)
+BANNER_COPYRIGHT = (108, 117, 125)
+# Full Windows icon size set; each frame is rendered natively from the logo layout
+ICO_SIZES = [(16, 16), (24, 24), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
+ICO_SUPERSAMPLE = 4  # Frames below 256px are drawn at 4x and downsampled with LANCZOS
+ICO_MIN_COPYRIGHT_SIZE = 128  # The copyright line is unreadable below this size
+BRAND_FONTS = {
+    "logo_main": ("bold", 220),
+    "logo_copyright": ("regular", 24),
+    "banner_main": ("bold", 28),
+    "banner_copyright": ("regular", 8),
+}
+
+# Skip-if-unchanged
+BRAND_FILES = ("brand.png", "brand.ico", "brand_installer.bmp")
+FINGERPRINT_FILE = ".brand_fingerprint"
+RENDER_VERSION = 2  # Bump when the drawing code changes
+
+# Font configuration
+# WINAPP_FONT_PATH may list extra font folders (os.pathsep separated);
+# fonts dropped into amatak_winapp/assets/fonts are picked up as bundled fonts.
+FONT_PATH_ENV = "WINAPP_FONT_PATH"
+BUNDLED_FONT_DIR = Path(__file__).parent.parent / "assets" / "fonts"
+FONT_FAMILIES = {
+    "bold": ["arialbd.ttf", "Arial Bold.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf"],
+    "regular": ["arial.ttf", "Arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf"],
+}
+_font_overrides = {}
+
+# Batch mode: folders never searched for projects
+BATCH_EXCLUDE_DIRS = {".venv", "venv", ".git", "__pycache__", ".idea", ".vscode", "node_modules",
+                      "installer", "dist", "build", "assets"}
+
+def configure_fonts(**family_paths):
+    """Override the font file used for a family, e.g. configure_fonts(bold="MyFont-Bold.ttf")"""
+    _font_overrides.update({family: path for family, path in family_paths.items() if path})
+    resolve_font_path.cache_clear()
+    get_font.cache_clear()
+
+def get_font_dirs():
+    """Folders searched for font files, in priority order"""
+    dirs = []
+    for entry in os.environ.get(FONT_PATH_ENV, "").split(os.pathsep):
+        if entry and os.path.isdir(entry):
+            dirs.append(entry)
+    if BUNDLED_FONT_DIR.is_dir():
+        dirs.append(str(BUNDLED_FONT_DIR))
+    return dirs
+
+@lru_cache(maxsize=None)
+def resolve_font_path(family):
+    """Find the font file for a family once; returns None if nothing matches"""
+    candidates = []
+    if family in _font_overrides:
+        candidates.append(_font_overrides[family])
+    candidates.extend(FONT_FAMILIES.get(family, [family]))
+    
+    from PIL import ImageFont
+    
+    font_dirs = get_font_dirs()
+    for name in candidates:
+        if os.path.isabs(name) and os.path.isfile(name):
+            return name
+        for font_dir in font_dirs:
+            path = os.path.join(font_dir, name)
+            if os.path.isfile(path):
+                return path
+        # Let PIL search the system font folders
+        try:
+            return ImageFont.truetype(name, 10).path
+        except OSError:
+            continue
+    
+    print(f"Warning: no TrueType font found for '{family}' (tried {', '.join(candidates)}); "
+          f"set {FONT_PATH_ENV} to a font file or folder")
+    return None
+
+@lru_cache(maxsize=None)
+def get_font(family, size):
+    """Return a cached font for (family, size), falling back to PIL's default font"""
+    from PIL import ImageFont
+    
+    path = resolve_font_path(family)
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError as e:
+            print(f"Warning: could not load font {path}: {e}")
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
 def split_camel_case(name):
     """Split camelCase or PascalCase words"""
     # Using regex to split on uppercase letters followed by lowercase
@@ -102,49 +213,134 @@ def get_brand_text(project_name):
         last = words[-1][0].upper()  # Changed from last character to first character of last word
         return f"{first}{middle}{last}"
 
-def generate_styled_assets(text, target_dir):
-    os.makedirs(target_dir, exist_ok=True)
+def render_logo(text, size, scale=1):
+    """Draw the logo layout (designed on a 512px canvas) at any size"""
+    from PIL import Image, ImageDraw
     
-    # --- 1. BRAND.PNG (512x512 Styled Logo) ---
-    img = Image.new("RGBA", (512, 512), (33, 37, 41, 255)) # Dark Slate
+    canvas = size * scale
+    unit = canvas / LOGO_SIZE
+    
+    img = Image.new("RGBA", (canvas, canvas), LOGO_BACKGROUND)
     draw = ImageDraw.Draw(img)
     
     # Draw a subtle circular border
-    draw.ellipse([40, 40, 472, 472], outline=(108, 117, 125, 255), width=8)
+    draw.ellipse([40 * unit, 40 * unit, 472 * unit, 472 * unit],
+                 outline=LOGO_BORDER, width=max(1, round(8 * unit)))
     
-    try:
-        font_main = ImageFont.truetype("arialbd.ttf", 220) # Bold
-        font_copy = ImageFont.truetype("arial.ttf", 24)
-    except:
-        font_main = font_copy = ImageFont.load_default()
-
-    # Main Brand Text
-    draw.text((256, 240), text, fill="white", font=font_main, anchor="mm")
+    main_family, main_size = BRAND_FONTS["logo_main"]
+    copy_family, copy_size = BRAND_FONTS["logo_copyright"]
+    show_copyright = size >= ICO_MIN_COPYRIGHT_SIZE
+    
+    # Main Brand Text (centered when the copyright line is dropped)
+    text_y = 240 if show_copyright else 256
+    draw.text((256 * unit, text_y * unit), text, fill=LOGO_TEXT,
+              font=get_font(main_family, max(1, round(main_size * unit))), anchor="mm")
     
     # Copyright Symbol at the bottom
-    copyright_text = f"© {CURRENT_YEAR} {OWNER}"
-    draw.text((256, 420), copyright_text, fill=(173, 181, 189), font=font_copy, anchor="mm")
+    if show_copyright:
+        copyright_text = f"© {CURRENT_YEAR} {OWNER}"
+        draw.text((256 * unit, 420 * unit), copyright_text, fill=LOGO_COPYRIGHT,
+                  font=get_font(copy_family, max(1, round(copy_size * unit))), anchor="mm")
     
-    img.save(os.path.join(target_dir, "brand.png"))
+    if scale != 1:
+        img = img.resize((size, size), Image.LANCZOS)
+    return img
 
-    # --- 2. BRAND.ICO (Windows Icon) ---
-    img.save(os.path.join(target_dir, "brand.ico"), format="ICO", sizes=[(32,32), (64,64), (256,256)])
+@lru_cache(maxsize=64)
+def render_icon_frame(text, size):
+    """Render (and cache) one icon frame; small sizes are supersampled"""
+    scale = ICO_SUPERSAMPLE if size < 256 else 1
+    return render_logo(text, size, scale)
 
-    # --- 3. BRAND_INSTALLER.BMP (150x57 Styled Banner) ---
-    bmp_img = Image.new("RGB", (150, 57), (255, 255, 255))
-    bmp_draw = ImageDraw.Draw(bmp_img)
+def compute_fingerprint(text):
+    """Hash every input that affects the rendered brand assets"""
+    fonts = {}
+    for family in sorted({family for family, _ in BRAND_FONTS.values()}):
+        path = resolve_font_path(family)
+        font_info = {"path": path}
+        if path:
+            try:
+                stat = os.stat(path)
+                font_info.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            except OSError:
+                pass
+        fonts[family] = font_info
     
+    inputs = {
+        "render_version": RENDER_VERSION,
+        "text": text,
+        "owner": OWNER,
+        "year": CURRENT_YEAR,
+        "colors": [LOGO_BACKGROUND, LOGO_BORDER, LOGO_TEXT, LOGO_COPYRIGHT,
+                   BANNER_BACKGROUND, BANNER_TEXT, BANNER_COPYRIGHT],
+        "sizes": {"logo": LOGO_SIZE, "banner": BANNER_SIZE, "ico": ICO_SIZES,
+                  "ico_supersample": ICO_SUPERSAMPLE, "ico_min_copyright": ICO_MIN_COPYRIGHT_SIZE},
+        "font_sizes": BRAND_FONTS,
+        "fonts": fonts,
+    }
+    payload = json.dumps(inputs, sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest(), inputs
+
+def is_up_to_date(target_dir, fingerprint):
+    """True if the stored fingerprint matches and all brand files are present"""
+    fingerprint_path = os.path.join(target_dir, FINGERPRINT_FILE)
+    if not all(os.path.exists(os.path.join(target_dir, name)) for name in BRAND_FILES):
+        return False
     try:
-        bmp_font = ImageFont.truetype("arialbd.ttf", 28)
-        bmp_copy_font = ImageFont.truetype("arial.ttf", 8)
-    except:
-        bmp_font = bmp_copy_font = ImageFont.load_default()
+        with open(fingerprint_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("fingerprint") == fingerprint
+    except (OSError, ValueError):
+        return False
+
+def write_fingerprint(target_dir, fingerprint, inputs):
+    """Store the fingerprint next to the assets"""
+    with open(os.path.join(target_dir, FINGERPRINT_FILE), "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "inputs": inputs}, f, indent=2, default=list)
+
+def generate_styled_assets(text, target_dir, force=False):
+    """Render brand.png, brand.ico and brand_installer.bmp; returns False if skipped as unchanged"""
+    from PIL import Image, ImageDraw
+    
+    os.makedirs(target_dir, exist_ok=True)
+    
+    with _profiling.stage("brand_fingerprint", category="gen_brand", target=target_dir) as check:
+        fingerprint, inputs = compute_fingerprint(text)
+        up_to_date = not force and is_up_to_date(target_dir, fingerprint)
+        check.cache(up_to_date)
+    if up_to_date:
+        print(f"[{CURRENT_YEAR}] Brand assets in {target_dir} are up to date (skipped)")
+        return False
+    
+    with _profiling.stage("generate_styled_assets", category="gen_brand", target=target_dir) as assets:
+        # --- 1. BRAND.PNG (512x512 Styled Logo) ---
+        img = render_logo(text, LOGO_SIZE)
+        img.save(os.path.join(target_dir, "brand.png"), optimize=True)
 
-    bmp_draw.text((75, 22), text, fill=(33, 37, 41), font=bmp_font, anchor="mm")
-    bmp_draw.text((75, 45), f"© {OWNER}", fill=(108, 117, 125), font=bmp_copy_font, anchor="mm")
+        # --- 2. BRAND.ICO (Windows Icon, one natively rendered frame per size) ---
+        frames = [render_icon_frame(text, size) for size, _ in ICO_SIZES]
+        largest = frames[-1]
+        largest.save(os.path.join(target_dir, "brand.ico"), format="ICO",
+                     sizes=ICO_SIZES, append_images=frames[:-1])
+
+        # --- 3. BRAND_INSTALLER.BMP (150x57 Styled Banner) ---
+        bmp_img = Image.new("RGB", BANNER_SIZE, BANNER_BACKGROUND)
+        bmp_draw = ImageDraw.Draw(bmp_img)
+    
+        bmp_font = get_font(*BRAND_FONTS["banner_main"])
+        bmp_copy_font = get_font(*BRAND_FONTS["banner_copyright"])
+
+        bmp_draw.text((75, 22), text, fill=BANNER_TEXT, font=bmp_font, anchor="mm")
+        bmp_draw.text((75, 45), f"© {OWNER}", fill=BANNER_COPYRIGHT, font=bmp_copy_font, anchor="mm")
+    
+        bmp_img.save(os.path.join(target_dir, "brand_installer.bmp"), "BMP")
+    
+        write_fingerprint(target_dir, fingerprint, inputs)
+        for name in BRAND_FILES:
+            assets.wrote(os.path.join(target_dir, name))
+        assets.add_files(len(BRAND_FILES))
     
-    bmp_img.save(os.path.join(target_dir, "brand_installer.bmp"), "BMP")
     print(f"[{CURRENT_YEAR}] Styled brand assets generated in {target_dir}")
+    return True
 
 # Test function to verify the logic
 def test_brand_text():
@@ -172,7 +368,75 @@ def test_brand_text():
         print(f"{test:25} -> {result}")
     print("-" * 40)
 
-if __name__ == "__main__":
+def discover_projects(root):
+    """Find project folders (folders containing main.py) below root, nested ones included
+    
+    A monorepo root can have a main.py of its own, so the search goes on below a match.
+    """
+    projects = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in BATCH_EXCLUDE_DIRS and not d.startswith("."))
+        if "main.py" in files:
+            projects.append(current)
+    return projects
+
+def _init_batch_worker():
+    """Load the fonts once per worker process; every project then reuses them"""
+    for family, size in BRAND_FONTS.values():
+        get_font(family, size)
+
+def _brand_project(project_path, force=False):
+    """Worker: generate brand assets for one project"""
+    try:
+        brand_text = get_brand_text(os.path.basename(os.path.abspath(project_path)))
+        written = generate_styled_assets(brand_text, os.path.join(project_path, DEFAULT_BRAND_PATH), force)
+        return project_path, brand_text, written, None
+    except Exception as e:
+        return project_path, None, False, str(e)
+
+def generate_all(root, workers=None, force=False):
+    """Generate brand assets for every project below root in one process pool"""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    projects = discover_projects(root)
+    if not projects:
+        print(f"No projects (folders with main.py) found under {root}")
+        return False
+    
+    workers = workers or min(len(projects), os.cpu_count() or 1)
+    print(f"Generating branding for {len(projects)} projects with {workers} workers...")
+    
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as pool:
+        for project_path, brand_text, written, error in pool.map(partial(_brand_project, force=force), projects):
+            rel_path = os.path.relpath(project_path, root)
+            if error:
+                failures += 1
+                print(f"  ERROR  {rel_path}: {error}")
+            elif written:
+                print(f"  OK     {rel_path} -> {brand_text}")
+            else:
+                print(f"  SKIP   {rel_path} -> {brand_text} (unchanged)")
+    
+    print(f"[{CURRENT_YEAR}] Branding generated for {len(projects) - failures}/{len(projects)} projects")
+    return failures == 0
+
+def main():
+    """Main function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate branding assets for Amatak WinApp projects')
+    parser.add_argument('--all', metavar='ROOT', help='Generate branding for every project below ROOT')
+    parser.add_argument('--workers', '-j', type=int, default=None, help='Worker processes for --all')
+    parser.add_argument('--force', '-f', action='store_true', help='Re-render even if inputs are unchanged')
+    
+    args = parser.parse_args()
+    
+    if args.all:
+        with _profiling.stage("generate_all", category="gen_brand", root=args.all):
+            success = generate_all(args.all, args.workers, args.force)
+        return 0 if success else 1
+    
     # Run tests
     test_brand_text()
     print()
@@ -181,4 +445,8 @@ if __name__ == "__main__":
     name = os.path.basename(os.getcwd())
     print(f"Generating for current directory: {name}")
     brand_text = get_brand_text(name)
-    generate_styled_assets(brand_text, DEFAULT_BRAND_PATH)
\ No newline at end of file
+    generate_styled_assets(brand_text, DEFAULT_BRAND_PATH, args.force)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
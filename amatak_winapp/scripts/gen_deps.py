@@ -0,0 +1,294 @@
+# gen_deps.py - Bundle the project's dependencies as an offline wheelhouse
+"""
+Resolves requirements.txt into wheels/ so the installer can set the app up
+without network access:
+
+    wheels/*.whl               every wheel the requirements resolve to
+    wheels/requirements.txt    the resolved set, pinned (name==version)
+    wheels/deps.json           fingerprint of the last resolution
+
+Wheels come from the machine-wide content-addressed cache (_wheel_cache),
+so each one is downloaded and stored once across all projects. Nothing is
+resolved when requirements.txt and the settings are unchanged.
+
+gen_nsi.py installs wheels/ with the app and adds an offline
+`pip install --no-index` step into $INSTDIR\\site-packages.
+
+Settings come from the "deps" section of config.json:
+    {"index_url": null, "find_links": [], "no_index": false,
+     "platform": null, "python_version": null, "exclude": ["pyinstaller", "pytest"]}
+A local folder of wheels (find_links + no_index, or --find-links DIR
+--no-index) stands in for PyPI, e.g. in tests.
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from . import _profiling, _project_metadata, _wheel_cache
+except ImportError:
+    import _profiling
+    import _project_metadata
+    import _wheel_cache
+
+PROJECT_ROOT = Path.cwd()
+
+# Configuration
+REQUIREMENTS_FILE = PROJECT_ROOT / "requirements.txt"
+WHEELHOUSE_DIR = PROJECT_ROOT / "wheels"
+PINNED_REQUIREMENTS = WHEELHOUSE_DIR / "requirements.txt"
+RECORD_PATH = WHEELHOUSE_DIR / "deps.json"
+DOWNLOAD_DIR = PROJECT_ROOT / "installer" / ".cache" / "deps"
+# Listed in generated requirements.txt files but not installable from an index
+NOT_ON_INDEX = {"python", "tkinter"}
+DEFAULT_DEPS_OPTIONS = {
+    "index_url": None,
+    "find_links": [],
+    "no_index": False,
+    "platform": None,          # e.g. win_amd64 when bundling on another OS
+    "python_version": None,    # e.g. 3.11; defaults to the building interpreter
+    "exclude": ["pyinstaller", "pytest"],  # Build and test tools the installed app does not need
+}
+NESTED_FILE_OPTIONS = ("-r", "-c", "--requirement", "--constraint")
+REQUIREMENT_NAME_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+DOWNLOAD_TIMEOUT = 1800
+CURRENT_YEAR = datetime.now().year
+
+def get_deps_options():
+    """Dependency settings from config.json "deps", validated, with defaults"""
+    config = _project_metadata.load(PROJECT_ROOT).config
+    return _project_metadata.section_options(config, "deps", DEFAULT_DEPS_OPTIONS)
+
+def normalize_name(name):
+    """PEP 503 project name"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def read_requirements(exclude):
+    """requirements.txt lines worth bundling (comments, tools and non-index names dropped)"""
+    skip = {normalize_name(name) for name in NOT_ON_INDEX | set(exclude)}
+    requirements, skipped = [], []
+    for line in REQUIREMENTS_FILE.read_text(encoding="utf-8").splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith(("-e", "--editable")):
+            print(f"Warning: Editable requirement cannot be bundled; skipping: {line}")
+            continue
+        if line.startswith(NESTED_FILE_OPTIONS):
+            # Nested files are resolved relative to the project, not to the download folder
+            option, _, path = line.partition(" ")
+            line = f"{option} {(PROJECT_ROOT / path.strip()).resolve()}"
+        else:
+            match = REQUIREMENT_NAME_RE.match(line)
+            if match and normalize_name(match.group(1)) in skip:
+                skipped.append(match.group(1))
+                continue
+        requirements.append(line)
+    return requirements, skipped
+
+def pip_source_args(options):
+    """pip arguments selecting where packages come from and which platform they are for"""
+    args = []
+    if options["index_url"]:
+        args += ["--index-url", options["index_url"]]
+    if options["no_index"]:
+        args.append("--no-index")
+    for link in options["find_links"]:
+        args += ["--find-links", str((PROJECT_ROOT / link).resolve()) if "://" not in link else link]
+    if options["platform"]:
+        args += ["--platform", options["platform"]]
+    if options["python_version"]:
+        args += ["--python-version", options["python_version"]]
+    return args
+
+def nested_file_digests(requirements):
+    """{path: sha256} of the -r/-c files the requirements pull in, followed recursively"""
+    digests = {}
+    pending = [line.partition(" ")[2].strip() for line in requirements if line.startswith(NESTED_FILE_OPTIONS)]
+    while pending:
+        path = pending.pop()
+        if path in digests:
+            continue
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            digests[path] = None  # pip download reports the missing file
+            continue
+        digests[path] = hashlib.sha256(data).hexdigest()
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            line = line.split(" #", 1)[0].strip()
+            if line.startswith(NESTED_FILE_OPTIONS):
+                # pip resolves these relative to the file that names them
+                nested = line.partition(" ")[2].strip()
+                pending.append(str((Path(path).parent / nested).resolve()))
+    return digests
+
+def compute_fingerprint(requirements, options):
+    """Hash of everything that decides which wheels are bundled"""
+    inputs = {
+        "requirements": requirements,
+        "options": options,
+        "python": options["python_version"] or f"{sys.version_info[0]}.{sys.version_info[1]}",
+        "platform": options["platform"] or sys.platform,
+    }
+    nested_files = nested_file_digests(requirements)
+    if nested_files:
+        # Only the paths are in requirements; an edit to a nested file must resolve again
+        inputs["nested_files"] = nested_files
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+def read_record():
+    """The last resolution record (empty if there is none)"""
+    try:
+        record = json.loads(RECORD_PATH.read_text(encoding="utf-8"))
+        return record if isinstance(record, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def is_up_to_date(record, fingerprint):
+    """True if the requirements resolved the same way and every wheel is still in place"""
+    wheels = record.get("wheels")
+    if record.get("fingerprint") != fingerprint or not isinstance(wheels, dict):
+        return False
+    for filename, entry in wheels.items():
+        try:
+            if (WHEELHOUSE_DIR / filename).stat().st_size != entry["size"]:
+                return False
+        except (OSError, KeyError, TypeError):
+            return False
+    return PINNED_REQUIREMENTS.exists()
+
+def download(requirements, options, offline, cache):
+    """pip download the requirements as wheels into a fresh DOWNLOAD_DIR; returns True on success"""
+    shutil.rmtree(DOWNLOAD_DIR, ignore_errors=True)
+    DOWNLOAD_DIR.mkdir(parents=True)
+    requirements_in = DOWNLOAD_DIR / "requirements.in"
+    requirements_in.write_text("\n".join(requirements) + "\n", encoding="utf-8")
+
+    cmd = [sys.executable, "-m", "pip", "download", "--disable-pip-version-check",
+           "--only-binary", ":all:", "--dest", str(DOWNLOAD_DIR / "wheels"), "-r", str(requirements_in)]
+    if offline:
+        # Resolve from wheels earlier builds already cached
+        cmd += ["--no-index", "--find-links", str(cache.by_name_dir)]
+    else:
+        cmd += pip_source_args(options)
+        if cache.by_name_dir.exists():
+            cmd += ["--find-links", str(cache.by_name_dir)]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=DOWNLOAD_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        print(f"ERROR: pip download timed out after {DOWNLOAD_TIMEOUT} s")
+        return False
+    if result.returncode != 0:
+        print("ERROR: Could not resolve the requirements as wheels:")
+        print(result.stderr.strip() or result.stdout.strip())
+        if offline:
+            print("   (--offline only uses wheels cached by earlier runs)")
+        return False
+    return True
+
+def wheel_pin(filename):
+    """name==version from a wheel file name"""
+    name, version = filename.split("-")[:2]
+    return f"{name.replace('_', '-')}=={version}"
+
+def bundle(force=False, offline=False, source_args=None):
+    """Resolve requirements.txt into the project wheelhouse; returns True on success"""
+    if not REQUIREMENTS_FILE.exists():
+        print("No requirements.txt; nothing to bundle")
+        return True
+
+    options = get_deps_options()
+    options.update(source_args or {})
+    requirements, skipped = read_requirements(options["exclude"])
+    if skipped:
+        print(f"Not bundled: {', '.join(skipped)} (not on the index, or excluded in config.json \"deps\")")
+
+    cache = _wheel_cache.WheelCache()
+    with _profiling.stage("deps_fingerprint", category="gen_deps") as check:
+        fingerprint = compute_fingerprint(requirements, options)
+        record = read_record()
+        up_to_date = not force and is_up_to_date(record, fingerprint)
+        check.cache(up_to_date)
+    if up_to_date:
+        print(f"[{CURRENT_YEAR}] Wheelhouse is up to date ({len(record['wheels'])} wheels, skipped)")
+        return True
+
+    if not requirements:
+        # Nothing to install; drop any earlier bundle so the installer skips the pip step
+        shutil.rmtree(WHEELHOUSE_DIR, ignore_errors=True)
+        print("No installable requirements; wheelhouse removed")
+        return True
+
+    print(f"Resolving {len(requirements)} requirement(s) into wheels...")
+    print(f"   Wheel cache: {cache.root}")
+    with _profiling.stage("pip_download", category="gen_deps"):
+        if not download(requirements, options, offline, cache):
+            return False
+
+    with _profiling.stage("store_wheels", category="gen_deps") as store:
+        WHEELHOUSE_DIR.mkdir(exist_ok=True)
+        wheels = {}
+        for path in sorted((DOWNLOAD_DIR / "wheels").glob("*.whl")):
+            digest = cache.add(path)
+            cache.export(digest, path.name, WHEELHOUSE_DIR)
+            wheels[path.name] = {"sha256": digest, "size": path.stat().st_size}
+            store.add_files()
+            store.add_bytes(path.stat().st_size)
+
+        # Wheels from an earlier resolution that are no longer needed
+        for stale in WHEELHOUSE_DIR.glob("*.whl"):
+            if stale.name not in wheels:
+                stale.unlink()
+
+        PINNED_REQUIREMENTS.write_text(
+            "# Resolved by winapp deps - installed offline from this folder\n"
+            + "".join(f"{wheel_pin(filename)}\n" for filename in sorted(wheels)), encoding="utf-8")
+        RECORD_PATH.write_text(json.dumps({
+            "fingerprint": fingerprint,
+            "requirements": requirements,
+            "wheels": wheels,
+            "resolved_at": datetime.now().isoformat(timespec="seconds"),
+        }, indent=2), encoding="utf-8")
+    shutil.rmtree(DOWNLOAD_DIR, ignore_errors=True)
+
+    total = sum(entry["size"] for entry in wheels.values())
+    print(f"[{CURRENT_YEAR}] SUCCESS: {len(wheels)} wheels ({total / (1024 * 1024):.2f} MB) in {WHEELHOUSE_DIR}")
+    print(f"   Wheel cache: {cache.added} stored, {cache.reused} already cached")
+    return True
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Bundle requirements.txt as an offline wheelhouse')
+    parser.add_argument('--force', '-f', action='store_true', help='Resolve again even if nothing changed')
+    parser.add_argument('--offline', action='store_true', help='Resolve only from the shared wheel cache')
+    parser.add_argument('--index-url', help='Package index to use instead of PyPI')
+    parser.add_argument('--find-links', action='append', help='Extra folder (or URL) of wheels to resolve from')
+    parser.add_argument('--no-index', action='store_true', help='Ignore package indexes (use --find-links only)')
+
+    args = parser.parse_args()
+
+    source_args = {}
+    if args.index_url:
+        source_args["index_url"] = args.index_url
+    if args.find_links:
+        source_args["find_links"] = [os.path.abspath(link) if "://" not in link else link
+                                     for link in args.find_links]
+    if args.no_index:
+        source_args["no_index"] = True
+
+    with _profiling.stage("deps", category="gen_deps"):
+        success = bundle(args.force, args.offline, source_args)
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
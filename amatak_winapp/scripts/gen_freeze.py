@@ -0,0 +1,236 @@
+# gen_freeze.py - Freeze the project with PyInstaller for the installer
+"""
+Runs PyInstaller in-process with everything it caches kept per project:
+
+    installer/.cache/pyinstaller/<name>.spec   generated once, reused while the settings hold
+    installer/.cache/pyinstaller/work/         PyInstaller's workpath (analysis cache)
+    installer/.cache/pyinstaller/freeze.json   fingerprint of the last freeze, and its executable
+    dist/<name>/<name>.exe                     the frozen app (gen_nsi.py --frozen installs it)
+
+The freeze is skipped when the sources, requirements and freeze settings
+hash the same as last time. After a small code edit PyInstaller rebuilds
+from the existing workpath instead of re-analysing every import; --clean
+starts cold.
+
+Settings come from the "freeze" section of config.json:
+    {"entry": "main.py", "onefile": false, "windowed": true, "icon": "assets/brand/brand.ico",
+     "hidden_imports": [], "datas": ["data:data"], "options": []}
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from . import _profiling, _walker, _project_metadata
+except ImportError:
+    import _profiling
+    import _walker
+    import _project_metadata
+
+PROJECT_ROOT = Path.cwd()
+
+# Configuration
+FREEZE_DIR = PROJECT_ROOT / "installer" / ".cache" / "pyinstaller"
+WORK_DIR = FREEZE_DIR / "work"
+RECORD_PATH = FREEZE_DIR / "freeze.json"  # Read by gen_nsi.py --frozen
+DIST_DIR = PROJECT_ROOT / "dist"
+EXCLUDE_DIRS = {".venv", "venv", ".git", "__pycache__", ".idea", ".vscode", "installer", "dist", "build"}
+SOURCE_SUFFIXES = (".py", ".pyw")
+REQUIREMENTS_FILE = "requirements.txt"
+DEFAULT_ICON = "assets/brand/brand.ico"
+DEFAULT_FREEZE_OPTIONS = {
+    "entry": "main.py",
+    "onefile": False,       # One folder starts faster and rebuilds incrementally
+    "windowed": True,       # Generated apps are Tk GUIs
+    "icon": None,           # Default: assets/brand/brand.ico when it exists
+    "hidden_imports": [],
+    "datas": [],            # PyInstaller --add-data values ("source:dest")
+    "options": [],          # Extra PyInstaller arguments, passed through as is
+}
+CURRENT_YEAR = datetime.now().year
+
+def get_freeze_options():
+    """Freeze settings from config.json "freeze", validated, with defaults"""
+    config = _project_metadata.load(PROJECT_ROOT).config
+    options = _project_metadata.section_options(config, "freeze", DEFAULT_FREEZE_OPTIONS)
+    if options["icon"] is None and (PROJECT_ROOT / DEFAULT_ICON).exists():
+        options["icon"] = DEFAULT_ICON
+    return options
+
+def get_app_name():
+    """PyInstaller --name: the project name, safe for file names"""
+    name = _project_metadata.load(PROJECT_ROOT).name
+    return re.sub(r"[^\w.-]+", "_", name).strip("._") or "app"
+
+def get_exe_path(name):
+    """Project-relative path of the frozen executable"""
+    exe = name + (".exe" if os.name == "nt" else "")
+    return f"dist/{name}/{exe}"
+
+def iter_input_files(options):
+    """Project-relative paths of everything the frozen app is built from"""
+    yield REQUIREMENTS_FILE
+    if options["icon"]:
+        yield options["icon"]
+
+    data_sources = [data.rsplit(":", 1)[0] for data in options["datas"]]
+    root_prefix = len(os.path.join(str(PROJECT_ROOT), ""))
+    for root, dirs, files in _walker.walk(PROJECT_ROOT, EXCLUDE_DIRS):
+        rel_root = root[root_prefix:].replace(os.sep, "/")
+        for file in files:
+            rel_path = f"{rel_root}/{file}" if rel_root else file
+            if file.endswith(SOURCE_SUFFIXES) or any(
+                    rel_path == source or rel_path.startswith(source.rstrip("/") + "/") for source in data_sources):
+                yield rel_path
+
+def compute_fingerprint(name, options):
+    """(fingerprint of the sources + requirements + settings, fingerprint of the settings alone)"""
+    try:
+        import PyInstaller
+        pyinstaller_version = PyInstaller.__version__
+    except ImportError:
+        pyinstaller_version = None
+
+    settings = {
+        "name": name,
+        "options": options,
+        "python": sys.version,
+        "pyinstaller": pyinstaller_version,
+    }
+    settings_fingerprint = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+    digest = hashlib.sha256(settings_fingerprint.encode("ascii"))
+    count = 0
+    for rel_path in sorted(set(iter_input_files(options))):
+        try:
+            content = (PROJECT_ROOT / rel_path).read_bytes()
+        except OSError:
+            content = b""  # Missing inputs still count, so creating one triggers a rebuild
+        digest.update(f"{rel_path}\0{len(content)}\0".encode("utf-8"))
+        digest.update(hashlib.sha256(content).digest())
+        count += 1
+    return digest.hexdigest(), settings_fingerprint, count
+
+def read_record():
+    """The last freeze record (empty if there is none)"""
+    try:
+        record = json.loads(RECORD_PATH.read_text(encoding="utf-8"))
+        return record if isinstance(record, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def write_record(record):
+    """Store the freeze record"""
+    RECORD_PATH.write_text(json.dumps(record, indent=2), encoding="utf-8")
+
+def pyinstaller_args(name, options, spec_path, settings_changed):
+    """PyInstaller command line: a fresh spec when the settings changed, the cached spec otherwise"""
+    common = ["--noconfirm", "--workpath", str(WORK_DIR),
+              "--distpath", str(DIST_DIR / name if options["onefile"] else DIST_DIR)]
+    if not settings_changed and spec_path.exists():
+        return [str(spec_path)] + common
+
+    args = common + ["--name", name, "--specpath", str(FREEZE_DIR)]
+    args.append("--onefile" if options["onefile"] else "--onedir")
+    if options["windowed"]:
+        args.append("--windowed")
+    if options["icon"]:
+        args += ["--icon", str(PROJECT_ROOT / options["icon"])]
+    for module in options["hidden_imports"]:
+        args += ["--hidden-import", module]
+    for data in options["datas"]:
+        # The spec lives in installer/.cache, so data sources must be absolute
+        source, _, target = data.rpartition(":")
+        args += ["--add-data", f"{PROJECT_ROOT / source}:{target}" if source else data]
+    args += options["options"]
+    args.append(str(PROJECT_ROOT / options["entry"]))
+    return args
+
+def freeze(clean=False):
+    """Freeze the project unless nothing changed; returns True on success"""
+    name = get_app_name()
+    options = get_freeze_options()
+    spec_path = FREEZE_DIR / f"{name}.spec"
+    exe_path = get_exe_path(name)
+
+    if not (PROJECT_ROOT / options["entry"]).exists():
+        print(f"ERROR: Entry script {options['entry']} not found (set \"entry\" in config.json \"freeze\")")
+        return False
+
+    with _profiling.stage("freeze_fingerprint", category="gen_freeze") as check:
+        fingerprint, settings_fingerprint, input_count = compute_fingerprint(name, options)
+        record = read_record()
+        up_to_date = (not clean and record.get("fingerprint") == fingerprint
+                      and record.get("exe") == exe_path and (PROJECT_ROOT / exe_path).exists())
+        check.add_files(input_count)
+        check.cache(up_to_date)
+    if up_to_date:
+        print(f"[{CURRENT_YEAR}] Frozen app {exe_path} is up to date (skipped)")
+        return True
+
+    try:
+        import PyInstaller.__main__
+    except ImportError:
+        print("ERROR: PyInstaller is not installed. Install it with: pip install pyinstaller")
+        return False
+
+    settings_changed = clean or record.get("settings_fingerprint") != settings_fingerprint
+    if settings_changed:
+        # A onefile build would otherwise leave a previous onedir build's files next to it
+        shutil.rmtree(DIST_DIR / name, ignore_errors=True)
+    FREEZE_DIR.mkdir(parents=True, exist_ok=True)
+
+    args = pyinstaller_args(name, options, spec_path, settings_changed)
+    if clean:
+        args.append("--clean")
+    print(f"Freezing {options['entry']} -> {exe_path}")
+    print(f"   {'New spec' if settings_changed or not spec_path.exists() else 'Cached spec'}: {spec_path}")
+    print(f"   Work path: {WORK_DIR}")
+
+    with _profiling.stage("pyinstaller", category="pyinstaller") as run:
+        try:
+            PyInstaller.__main__.run(args)
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                print(f"ERROR: PyInstaller failed (exit code {e.code})")
+                return False
+        except Exception as e:
+            print(f"ERROR: PyInstaller failed: {e}")
+            return False
+        run.wrote(PROJECT_ROOT / exe_path)
+
+    if not (PROJECT_ROOT / exe_path).exists():
+        print(f"ERROR: PyInstaller finished but {exe_path} was not created")
+        return False
+
+    write_record({
+        "fingerprint": fingerprint,
+        "settings_fingerprint": settings_fingerprint,
+        "exe": exe_path,
+        "spec": str(spec_path.relative_to(PROJECT_ROOT)).replace(os.sep, "/"),
+        "frozen_at": datetime.now().isoformat(timespec="seconds"),
+    })
+    print(f"[{CURRENT_YEAR}] SUCCESS: Frozen app written to {exe_path}")
+    return True
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Freeze an Amatak WinApp project with PyInstaller')
+    parser.add_argument('--clean', action='store_true',
+                        help='Discard the cached spec and analysis and freeze from scratch')
+
+    args = parser.parse_args()
+
+    with _profiling.stage("freeze", category="gen_freeze"):
+        success = freeze(args.clean)
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,11 @@
 import os
 from datetime import datetime
 
+try:
+    from . import _profiling
+except ImportError:
+    import _profiling
+
 # Configuration
 LICENSE_FILE = "LICENSE"
 CURRENT_YEAR = datetime.now().year
@@ -41,4 +46,7 @@ SOFTWARE.
         print(f"Error generating License: {e}")
 
 if __name__ == "__main__":
-    generate_mit_license()
\ No newline at end of file
+    with _profiling.stage("generate_mit_license", category="gen_license") as license_file:
+        generate_mit_license()
+        license_file.add_files()
+        license_file.wrote(LICENSE_FILE)
\ No newline at end of file
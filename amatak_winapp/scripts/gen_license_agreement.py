@@ -1,35 +1,42 @@
 import os
 from datetime import datetime
-from fpdf import FPDF
+
+try:
+    from . import _profiling, _project_metadata
+except ImportError:
+    import _profiling
+    import _project_metadata
 
 # Configuration
-VERSION_FILE = "VERSION.txt"
 OUTPUT_PATH = r"assets\brand\license_agreement.pdf"
 OWNER = "Amatak Holdings Pty Ltd"
 CURRENT_YEAR = datetime.now().year
 
 def get_version():
-    if os.path.exists(VERSION_FILE):
-        with open(VERSION_FILE, "r", encoding="utf-8") as f:
-            return f.read().strip()
-    return "1.0.0"
+    return _project_metadata.load().version or _project_metadata.DEFAULT_VERSION
 
-class LicensePDF(FPDF):
-    def header(self):
-        self.set_font("helvetica", "B", 16)
-        self.cell(0, 10, "SOFTWARE LICENSE AGREEMENT", align="C", ln=True)
-        self.ln(5)
+def create_license_pdf():
+    """Build the PDF document class (fpdf is only imported when a PDF is generated)"""
+    from fpdf import FPDF
+    
+    class LicensePDF(FPDF):
+        def header(self):
+            self.set_font("helvetica", "B", 16)
+            self.cell(0, 10, "SOFTWARE LICENSE AGREEMENT", align="C", ln=True)
+            self.ln(5)
 
-    def footer(self):
-        self.set_y(-25)
-        self.set_font("helvetica", "I", 8)
-        self.cell(0, 10, f"Copyright (c) {CURRENT_YEAR} {OWNER}. All Rights Reserved.", align="C")
+        def footer(self):
+            self.set_y(-25)
+            self.set_font("helvetica", "I", 8)
+            self.cell(0, 10, f"Copyright (c) {CURRENT_YEAR} {OWNER}. All Rights Reserved.", align="C")
+    
+    return LicensePDF()
 
 def generate_license():
     version = get_version()
     os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
     
-    pdf = LicensePDF()
+    pdf = create_license_pdf()
     pdf.add_page()
     pdf.set_font("helvetica", size=11)
     
@@ -78,4 +85,7 @@ def generate_license():
     print(f"[{CURRENT_YEAR}] License Agreement generated: {OUTPUT_PATH}")
 
 if __name__ == "__main__":
-    generate_license()
\ No newline at end of file
+    with _profiling.stage("generate_license", category="gen_license_agreement") as agreement:
+        generate_license()
+        agreement.add_files()
+        agreement.wrote(OUTPUT_PATH)
\ No newline at end of file
@@ -1,56 +1,327 @@
 # gen_nsi.py - Fixed version without emojis
 import os
 import sys
+import re
 import json
+import mmap
+import hashlib
+import fnmatch
+import threading
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from . import _profiling, _hash_cache, _walker, _binary_manifest, _project_metadata, _import_graph
+except ImportError:
+    import _profiling
+    import _hash_cache
+    import _walker
+    import _binary_manifest
+    import _project_metadata
+    import _import_graph
+
 # Get the current working directory (project directory)
 PROJECT_ROOT = Path.cwd()
 
 # Configuration - all paths relative to PROJECT_ROOT
-VERSION_FILE = PROJECT_ROOT / "VERSION.txt"
 NSIS_OUTPUT_PATH = PROJECT_ROOT / "installer" / "win_installer.nsi"
-CONFIG_FILE = PROJECT_ROOT / "config.json"
 
 # Exclude patterns
 EXCLUDE_DIRS = {".venv", ".git", "__pycache__", ".idea", ".vscode", "installer", "dist", "build"}
-EXCLUDE_FILES = {"gen_nsi.py", "gen_readme.py", "gen_win.py", "_init_scanner.py", ".gitignore", "tree.txt", "*.pyc", "*.pyo"}
+# .brand_fingerprint is gen_brand's skip-if-unchanged cache in assets/brand, not an asset
+EXCLUDE_FILES = {"gen_nsi.py", "gen_readme.py", "gen_win.py", "_init_scanner.py", ".gitignore", "tree.txt", "*.pyc", "*.pyo",
+                 ".brand_fingerprint"}
+
+# Payload deduplication - identical files are embedded once and copied at install time
+DEDUP_MIN_SIZE = 4096  # Smaller duplicates are cheaper to embed than to copy
+HASH_CHUNK_SIZE = 1024 * 1024
+MMAP_MIN_SIZE = 64 * 1024 * 1024  # Larger files are hashed straight from a memory map
+HASH_BATCH_BYTES = 32 * 1024 * 1024  # Small files are hashed in batches of about this size
+HASH_JOBS = min(16, (os.cpu_count() or 1) + 4)  # hashlib releases the GIL, so threads scale
+
+# Compression - override with an "installer" section in config.json
+COMPRESSORS = ("zlib", "bzip2", "lzma")
+DEFAULT_INSTALLER_OPTIONS = {
+    "compressor": "zlib",       # zlib | bzip2 | lzma
+    "solid": False,             # Compress all data as one block (better ratio, no random access)
+    "dict_size": None,          # LZMA dictionary size in MB (NSIS default: 8)
+    "datablock_optimize": True, # Store identical data blocks once
+}
+COMPRESSION_DIRECTIVE_RE = re.compile(r'^(SetCompressor|SetCompressorDictSize|SetDatablockOptimize)\b.*\n',
+                                      re.MULTILINE)
+OUTFILE_RE = re.compile(r'^OutFile "(.*)"$', re.MULTILINE)
+NSI_FILE_RE = re.compile(r'^\s*File\s+"([^"]+)"', re.MULTILINE)
+
+# Optional components - top-level folders installed as their own, deselectable sections
+# (override with "components" in the config.json "installer" section; false disables)
+DEFAULT_COMPONENT_FOLDERS = {
+    # folder: (component name, selected by default)
+    "docs": ("Documentation", True),
+    "doc": ("Documentation", True),
+    "examples": ("Examples", True),
+    "samples": ("Samples", True),
+    "tests": ("Tests", False),
+    "test": ("Tests", False),
+}
+# Installed components are recorded under this registry subkey, so patches only update those
+COMPONENTS_REG_SUBKEY = "Components"
+
+# Candidates compiled by --compression-bench
+COMPRESSION_BENCH_VARIANTS = [
+    ("zlib", {"compressor": "zlib", "solid": False}),
+    ("zlib-solid", {"compressor": "zlib", "solid": True}),
+    ("bzip2", {"compressor": "bzip2", "solid": False}),
+    ("bzip2-solid", {"compressor": "bzip2", "solid": True}),
+    ("lzma", {"compressor": "lzma", "solid": False}),
+    ("lzma-solid", {"compressor": "lzma", "solid": True}),
+    ("lzma-solid-64mb", {"compressor": "lzma", "solid": True, "dict_size": 64}),
+]
+COMPILE_TIMEOUT = 1800  # Solid LZMA over large payloads takes minutes, not seconds
+BENCH_SAMPLE_BYTES = 8 * 1024 * 1024  # Payload sample used to estimate decompression speed
+BENCH_RESULTS_PATH = PROJECT_ROOT / "installer" / "compression-bench.json"
+
+# File manifest - what each release installs, so later releases can ship patch installers
+MANIFEST_VERSION = 1
+MANIFEST_PATH = PROJECT_ROOT / "installer" / "manifest.json"
+PATCH_OUTPUT_PATH = PROJECT_ROOT / "installer" / "win_patch.nsi"
+MANIFEST_BATCH_SIZE = 4096  # Files hashed per batch while the manifest is written
+# Same scan in compact binary form (also records mtimes); read by --files and --patch-from
+BINARY_MANIFEST_PATH = PROJECT_ROOT / "installer" / "manifest.bin"
+FILES_PAGE_SIZE = 500
+
+# Frozen apps (--frozen) - the PyInstaller output written by gen_freeze.py replaces the sources
+FREEZE_RECORD_PATH = PROJECT_ROOT / "installer" / ".cache" / "pyinstaller" / "freeze.json"
+FROZEN_PAYLOAD_DIRS = ("assets",)  # Still installed next to the frozen app (shortcut icons, branding)
+
+# Payload pruning (--prune, or "prune" in the config.json "installer" section) - only what the entry imports
+DEFAULT_PRUNE_OPTIONS = {
+    "entry": ["main.py"],
+    "keep_modules": [],               # Imported dynamically (plugins, computed importlib names)
+    "keep": ["assets/", "wheels/"],   # Always shipped: installer branding, bundled wheels
+    "search_paths": [""],             # Import roots inside the project besides its folder, e.g. "src"
+}
+NEVER_PACKAGE_DATA = ("*.ipynb",)
+PRUNE_REPORT_PATH = PROJECT_ROOT / "installer" / "prune-report.json"
+
+# Bundled dependencies - wheels/ written by gen_deps.py is pip-installed offline at install time
+BUNDLED_REQUIREMENTS = "wheels/requirements.txt"
+SITE_PACKAGES_DIR = "site-packages"  # Private to the app, under $INSTDIR
 
 def get_version():
-    """Read version from VERSION.txt"""
-    try:
-        if VERSION_FILE.exists():
-            return VERSION_FILE.read_text(encoding="utf-8").strip()
-    except Exception:
-        pass
-    return "1.0.0"
+    """Project version (VERSION.txt, then config.json)"""
+    return _project_metadata.load(PROJECT_ROOT).version or _project_metadata.DEFAULT_VERSION
 
 def detect_current_app():
     """
     Detect whether we're building the builder or a generated app
     Returns: (app_name, is_builder)
     """
-    # Check for winapp.py file - if it exists, this is likely the builder
-    if (PROJECT_ROOT / "winapp.py").exists():
-        return "Amatak WinApp Generator", True
+    metadata = _project_metadata.load(PROJECT_ROOT)
+    return metadata.display_name, metadata.is_builder
+
+def read_config():
+    """Return config.json as a dict (empty if missing or invalid)"""
+    return _project_metadata.load(PROJECT_ROOT).config
+
+def get_installer_options():
+    """Compression settings from config.json "installer", validated, with defaults"""
+    options = dict(DEFAULT_INSTALLER_OPTIONS)
+    configured = read_config().get("installer", {})
+    if not isinstance(configured, dict):
+        print('Warning: "installer" in config.json must be an object; using defaults')
+        return options
+    
+    compressor = str(configured.get("compressor", options["compressor"])).lower()
+    if compressor in COMPRESSORS:
+        options["compressor"] = compressor
+    else:
+        print(f"Warning: Unknown compressor '{compressor}' (expected {', '.join(COMPRESSORS)}); using zlib")
+    
+    options["solid"] = bool(configured.get("solid", options["solid"]))
+    options["datablock_optimize"] = bool(configured.get("datablock_optimize", options["datablock_optimize"]))
+    
+    dict_size = configured.get("dict_size")
+    if dict_size is not None:
+        # bool is an int subclass; true/false in config.json is not a size
+        if isinstance(dict_size, int) and not isinstance(dict_size, bool) and dict_size > 0:
+            options["dict_size"] = dict_size
+        else:
+            print(f"Warning: dict_size must be a positive number of MB (got {dict_size!r}); ignoring")
+        if options["compressor"] != "lzma":
+            print("Warning: dict_size only applies to the lzma compressor; ignoring")
+            options["dict_size"] = None
+    return options
+
+def compression_directives(options):
+    """NSIS commands selecting the compressor (must precede any compressed data)"""
+    options = dict(DEFAULT_INSTALLER_OPTIONS, **options)
+    solid = "/SOLID " if options["solid"] else ""
+    lines = [f"SetCompressor {solid}{options['compressor']}"]
+    if options["compressor"] == "lzma" and options.get("dict_size"):
+        lines.append(f"SetCompressorDictSize {options['dict_size']}")
+    lines.append(f"SetDatablockOptimize {'on' if options['datablock_optimize'] else 'off'}")
+    return "\n".join(lines) + "\n"
+
+def get_components():
+    """Optional components as [{name, include, selected, description}] (config.json or default folders)"""
+    configured = read_config().get("installer", {})
+    configured = configured.get("components") if isinstance(configured, dict) else None
+    
+    if configured is None:
+        components = {}
+        for folder, (name, selected) in DEFAULT_COMPONENT_FOLDERS.items():
+            component = components.setdefault(name, {"name": name, "include": [], "selected": selected,
+                                                     "description": None})
+            component["include"].append(f"{folder}/")
+        return list(components.values())
+    
+    if not configured:
+        return []
+    if not isinstance(configured, list):
+        print('Warning: "components" in config.json must be a list; installing everything as one section')
+        return []
+    
+    components = []
+    for entry in configured:
+        include = entry.get("include") if isinstance(entry, dict) else None
+        if isinstance(include, str):
+            include = [include]
+        if not entry.get("name") or not include:
+            print(f"Warning: Ignoring component {entry!r} (needs \"name\" and \"include\")")
+            continue
+        components.append({
+            "name": str(entry["name"]),
+            "include": [str(pattern) for pattern in include],
+            "selected": bool(entry.get("selected", True)),
+            "description": entry.get("description"),
+        })
+    return components
+
+def component_matches(file_path, patterns):
+    """True if a relative path matches a component glob ("docs/" and "docs" match the whole folder)"""
+    file_path = file_path.replace('\\', '/')
+    for pattern in patterns:
+        if fnmatch.fnmatchcase(file_path, pattern) or file_path.startswith(pattern.rstrip('/') + '/'):
+            return True
+    return False
+
+def get_prune_options(force=False):
+    """Pruning settings from config.json "installer" "prune" (true or an object), or None if off"""
+    installer = read_config().get("installer", {})
+    configured = installer.get("prune") if isinstance(installer, dict) else None
+    if not configured and not force:
+        return None
+    
+    if isinstance(configured, dict):
+        # "keep" and "search_paths" add to the defaults; main.py's own folder is always importable
+        return _project_metadata.section_options(installer, "prune", DEFAULT_PRUNE_OPTIONS,
+                                                 extend=("keep", "search_paths"))
+    if configured not in (None, True):
+        print('Warning: "prune" in config.json must be true or an object; using defaults')
+    return dict(DEFAULT_PRUNE_OPTIONS)
+
+def prune_payload(files_list, options):
+    """Files the entry scripts need (imported modules, their package data, "keep" globs); writes the report"""
+    import posixpath
     
-    # Check for amatak_winapp package directory
-    if (PROJECT_ROOT / "amatak_winapp").exists():
-        return "Amatak WinApp Generator", True
+    paths = [file_path.replace('\\', '/') for file_path in files_list]
+    py_files = [path for path in paths if path.endswith(".py")]
+    graph = _import_graph.ImportGraph(lambda path: (PROJECT_ROOT / path).read_bytes(), py_files,
+                                      options["search_paths"])
+    entries = [entry for entry in options["entry"] if entry in py_files]
+    for entry in sorted(set(options["entry"]) - set(entries)):
+        print(f"Warning: Prune entry {entry} is not in the payload")
+    if not entries:
+        print("Warning: No entry script to prune from; shipping every file")
+        return files_list
     
-    # Check config.json for project name
-    if CONFIG_FILE.exists():
+    reached = graph.reachable(entries, options["keep_modules"])
+    package_dirs = {posixpath.dirname(path) for path in reached}
+    
+    def is_package_data(path):
+        """Next to an imported module, or anywhere below an imported package"""
+        folder = posixpath.dirname(path)
+        if folder in package_dirs:
+            return True
+        while folder:
+            folder = posixpath.dirname(folder)
+            if folder and folder in package_dirs:
+                return True
+        return False
+    
+    kept, dropped = [], []
+    for file_path, path in zip(files_list, paths):
+        if path in reached or component_matches(path, options["keep"]):
+            kept.append(file_path)
+            continue
+        if path.endswith(".py"):
+            reason = f"not imported from {', '.join(entries)}"
+        elif any(fnmatch.fnmatchcase(path, pattern) for pattern in NEVER_PACKAGE_DATA):
+            reason = "notebook"
+        elif is_package_data(path):
+            kept.append(file_path)
+            continue
+        else:
+            reason = "not data of an imported package"
         try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                app_name = config.get('project_name', PROJECT_ROOT.name)
-                return app_name, False
-        except:
-            pass
+            size = (PROJECT_ROOT / file_path).stat().st_size
+        except OSError:
+            size = 0
+        dropped.append({"path": path, "reason": reason, "bytes": size})
     
-    # Default to project directory name
-    return PROJECT_ROOT.name, False
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "entry": entries,
+        "options": options,
+        "kept_files": len(kept),
+        "dropped_files": len(dropped),
+        "dropped_bytes": sum(entry["bytes"] for entry in dropped),
+        "dropped": dropped,
+        "dynamic_imports": [{"file": path, "line": line, "code": code}
+                            for path, line, code in graph.dynamic_imports],
+        "unparsed": graph.unparsed,
+    }
+    PRUNE_REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    PRUNE_REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    
+    print(f"Pruned payload: kept {len(kept)} of {len(files_list)} files, dropped {len(dropped)} "
+          f"({report['dropped_bytes'] / (1024 * 1024):.2f} MB) - see installer/{PRUNE_REPORT_PATH.name}")
+    reasons = {}
+    for entry in dropped:
+        reasons[entry["reason"]] = reasons.get(entry["reason"], 0) + 1
+    for reason, count in sorted(reasons.items(), key=lambda item: -item[1]):
+        print(f"   {count:5} {reason}")
+    if graph.dynamic_imports:
+        print(f"Warning: {len(graph.dynamic_imports)} dynamic import(s) could not be followed; "
+              f'add what they load to "keep_modules":')
+        for path, line, code in graph.dynamic_imports[:5]:
+            print(f"   {path}:{line}: {code}")
+    for path, error in graph.unparsed.items():
+        print(f"Warning: Could not parse {path} (kept, imports not followed): {error}")
+    return kept
+
+def assign_components(files_list, components):
+    """Split files into (core files, [(component, files)]); the first matching component wins"""
+    core_files = []
+    component_files = [(component, []) for component in components]
+    for file_path in files_list:
+        for component, files in component_files:
+            if component_matches(file_path, component["include"]):
+                files.append(file_path)
+                break
+        else:
+            core_files.append(file_path)
+    return core_files, [(component, files) for component, files in component_files if files]
+
+def payload_size(files):
+    """Total size in bytes of project files"""
+    total = 0
+    for file_path in files:
+        try:
+            total += (PROJECT_ROOT / file_path).stat().st_size
+        except OSError:
+            pass
+    return total
 
 def get_registry_key(app_name):
     """Generate registry key from app name"""
@@ -74,79 +345,485 @@ def get_outfile_name(app_name, version):
         safe_name = app_name.replace(' ', '_').replace('&', 'And')
         return f"Amatak_{safe_name}_Setup_v{version}.exe"
 
-def scan_project_files():
-    """Scan project files and return list of relative paths"""
-    files_to_install = []
+def scan_project_files(frozen_exe=None):
+    """Scan project files and return list of relative paths
     
+    The whole list is kept: generate_nsi goes over it several times (prune, components,
+    dedup, file and uninstall sections, manifest). Use iter_project_files() for one pass.
+    """
     print(f"Scanning project directory: {PROJECT_ROOT}")
     
-    for root, dirs, files in os.walk(PROJECT_ROOT):
-        # Remove excluded directories
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-        
-        # Skip excluded directories entirely
-        root_path = Path(root)
-        if any(excl_dir in str(root_path) for excl_dir in EXCLUDE_DIRS):
-            continue
-            
+    with _profiling.stage("scan_project_files", category="gen_nsi") as scan:
+        files_to_install = list(iter_project_files(frozen_exe))
+        scan.add_files(len(files_to_install))
+    
+    print(f"Found {len(files_to_install)} files to install")
+    return files_to_install
+
+def iter_project_files(frozen_exe=None):
+    """Yield installable relative paths, folder by folder (depth-first, names sorted within each folder)
+    
+    With frozen_exe, the payload is the frozen app's folder (taken as is) plus FROZEN_PAYLOAD_DIRS.
+    """
+    if frozen_exe is None:
+        yield from iter_folder_files(PROJECT_ROOT, EXCLUDE_DIRS, skip_excluded_files=True)
+        return
+    yield from iter_folder_files(PROJECT_ROOT / os.path.dirname(frozen_exe))
+    for folder in FROZEN_PAYLOAD_DIRS:
+        if (PROJECT_ROOT / folder).is_dir():
+            yield from iter_folder_files(PROJECT_ROOT / folder, EXCLUDE_DIRS, skip_excluded_files=True)
+
+def iter_folder_files(top, exclude_dirs=(), skip_excluded_files=False):
+    """Yield paths of the files under top, relative to PROJECT_ROOT"""
+    root_prefix = len(os.path.join(str(PROJECT_ROOT), ""))
+    
+    # Excluded directories are pruned by the walker (sibling folders are listed concurrently)
+    for root, dirs, files in _walker.walk(top, exclude_dirs):
+        rel_root = root[root_prefix:]
         for file in files:
-            # Skip excluded files
-            if file in EXCLUDE_FILES or file.endswith(".pyc") or file.endswith(".pyo"):
-                continue
-                
-            # Skip files matching exclude patterns
-            if any(file.endswith(pattern.replace("*", "")) for pattern in EXCLUDE_FILES if "*" in pattern):
-                continue
+            if skip_excluded_files:
+                # Skip excluded files
+                if file in EXCLUDE_FILES or file.endswith(".pyc") or file.endswith(".pyo"):
+                    continue
+                    
+                # Skip files matching exclude patterns
+                if any(file.endswith(pattern.replace("*", "")) for pattern in EXCLUDE_FILES if "*" in pattern):
+                    continue
             
-            # Get relative path from project root
+            # Relative path from project root
+            yield os.path.join(rel_root, file) if rel_root else file
+
+def read_frozen_app():
+    """Project-relative path of the executable built by `winapp freeze`, or None (with a message)"""
+    try:
+        record = json.loads(FREEZE_RECORD_PATH.read_text(encoding="utf-8"))
+        exe = record["exe"]
+    except FileNotFoundError:
+        print("ERROR: No frozen app found; run 'winapp freeze' first")
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"ERROR: Cannot read {FREEZE_RECORD_PATH}: {e}")
+        return None
+    if not (PROJECT_ROOT / exe).is_file():
+        print(f"ERROR: Frozen app {exe} is missing; run 'winapp freeze' again")
+        return None
+    return exe
+
+_hash_buffers = threading.local()  # One reusable read buffer per hashing thread
+
+def hash_file(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+                return digest.hexdigest()
+            except (OSError, ValueError):
+                # Not mappable (some network filesystems) - fall back to reading
+                digest = hashlib.sha256()
+                f.seek(0)
+        
+        buffer = getattr(_hash_buffers, "buffer", None)
+        if buffer is None:
+            buffer = _hash_buffers.buffer = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+_file_hashes = {}  # relative path -> SHA-256, shared by dedup and the manifest
+_hash_store = None  # Persistent cache in installer/.cache, opened on first use
+
+def get_hash_cache():
+    """The project's persistent hash cache"""
+    global _hash_store
+    if _hash_store is None:
+        _hash_store = _hash_cache.HashCache(PROJECT_ROOT)
+    return _hash_store
+
+def get_file_hash(file_path):
+    """SHA-256 of a project file, hashed at most once per run and only re-read when its stat changes"""
+    digest = _file_hashes.get(file_path)
+    if digest is None:
+        path = PROJECT_ROOT / file_path
+        st = path.stat()
+        cache = get_hash_cache()
+        digest = cache.get(file_path, st)
+        if digest is None:
+            digest = hash_file(path)
+            cache.put(file_path, st, digest)
+        _file_hashes[file_path] = digest
+    return digest
+
+def count_cache_lookups(stage, hits, misses):
+    """Report hash cache lookups made since (hits, misses) on a profiling stage"""
+    cache = get_hash_cache()
+    stage.cache(True, cache.hits - hits)
+    stage.cache(False, cache.misses - misses)
+
+def _hash_batch(batch):
+    """[(file, stat, digest or None)] for one unit of hashing work"""
+    results = []
+    for file_path, st in batch:
+        try:
+            results.append((file_path, st, hash_file(PROJECT_ROOT / file_path)))
+        except OSError:
+            results.append((file_path, st, None))
+    return results
+
+def hash_files(file_paths, jobs=None):
+    """Hash project files on a thread pool, filling the per-run and persistent caches"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    cache = get_hash_cache()
+    pending = []
+    for file_path in file_paths:
+        if file_path in _file_hashes:
+            continue
+        try:
+            st = (PROJECT_ROOT / file_path).stat()
+        except OSError:
+            continue
+        digest = cache.get(file_path, st)
+        if digest is None:
+            pending.append((file_path, st))
+        else:
+            _file_hashes[file_path] = digest
+    if not pending:
+        return
+    
+    # Big files are units of their own and small ones are batched; largest units start
+    # first so a multi-GB file never becomes the last straggler of the pool
+    pending.sort(key=lambda item: item[1].st_size, reverse=True)
+    units = []
+    batch, batch_bytes = [], 0
+    for file_path, st in pending:
+        if st.st_size >= HASH_BATCH_BYTES:
+            units.append([(file_path, st)])
+            continue
+        batch.append((file_path, st))
+        batch_bytes += st.st_size
+        if batch_bytes >= HASH_BATCH_BYTES or len(batch) >= 1024:
+            units.append(batch)
+            batch, batch_bytes = [], 0
+    if batch:
+        units.append(batch)
+    
+    jobs = min(jobs or HASH_JOBS, len(units))
+    if jobs > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_hash_batch, units))
+    else:
+        results = [_hash_batch(unit) for unit in units]
+    
+    for unit_results in results:
+        for file_path, st, digest in unit_results:
+            if digest is not None:
+                _file_hashes[file_path] = digest
+                cache.put(file_path, st, digest)
+
+def find_duplicate_files(files_list, group_of=None):
+    """Map each duplicate payload file to the first file (in install order) with the same content
+    
+    group_of(file) limits sources to files in the same group (e.g. installer component),
+    so a copy never depends on a section the user may deselect.
+    """
+    duplicates = {}
+    saved_bytes = 0
+    
+    cache = get_hash_cache()
+    lookups = (cache.hits, cache.misses)
+    with _profiling.stage("dedup_payload", category="gen_nsi") as dedup:
+        # Only files that share a size can be identical, so most files are never hashed
+        by_size = {}
+        for file_path in files_list:
             try:
-                file_path = Path(root) / file
-                rel_path = file_path.relative_to(PROJECT_ROOT)
-                files_to_install.append(str(rel_path))
-            except ValueError:
-                # File not relative to project root (shouldn't happen)
+                size = (PROJECT_ROOT / file_path).stat().st_size
+            except OSError:
+                continue
+            if size >= DEDUP_MIN_SIZE:
+                by_size.setdefault(size, []).append(file_path)
+        
+        hash_files([file_path for same_size in by_size.values() if len(same_size) > 1 for file_path in same_size])
+        for size, same_size in by_size.items():
+            if len(same_size) < 2:
                 continue
+            first_by_hash = {}
+            for file_path in same_size:
+                try:
+                    digest = get_file_hash(file_path)
+                except OSError:
+                    continue
+                dedup.add_files()
+                key = (group_of(file_path) if group_of else None, digest)
+                if key in first_by_hash:
+                    duplicates[file_path] = first_by_hash[key]
+                    saved_bytes += size
+                else:
+                    first_by_hash[key] = file_path
+        count_cache_lookups(dedup, *lookups)
     
-    print(f"Found {len(files_to_install)} files to install")
-    return sorted(files_to_install)
+    if duplicates:
+        print(f"Deduplicated {len(duplicates)} files ({saved_bytes / (1024 * 1024):.2f} MB embedded once)")
+    return duplicates
 
-def generate_nsi():
-    """Generate NSIS installer script - DYNAMIC VERSION"""
-    version = get_version()
-    year = datetime.now().year
+def write_manifest(files, app_name, version):
+    """Stream installer/manifest.json ({relative path: {size, sha256}}) plus a per-version copy
     
-    # Detect current app context
-    currentapp, is_builder = detect_current_app()
-    print(f"\nBuilding installer for: {currentapp}")
-    print(f"Context: {'Builder' if is_builder else 'Generated App'}")
+    Files are hashed and written in batches, so the JSON text is never built as one string.
+    The same entries go to installer/manifest.bin (see _binary_manifest), which is collected
+    in compact columns and written at the end.
+    """
+    import shutil
+    from itertools import islice
     
-    # Get list of files to install
-    files_list = scan_project_files()
+    versioned_path = MANIFEST_PATH.with_name(f"manifest-v{version}.json")
+    partial_path = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    header = {
+        "manifest_version": MANIFEST_VERSION,
+        "app": app_name,
+        "version": version,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
     
-    if not files_list:
-        print("ERROR: No files found to install! Check your project directory.")
-        return False
+    binary = _binary_manifest.ManifestWriter()
+    cache = get_hash_cache()
+    lookups = (cache.hits, cache.misses)
+    with _profiling.stage("write_manifest", category="gen_nsi") as manifest:
+        with open(partial_path, "w", encoding="utf-8") as f:
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f"  {json.dumps(key)}: {json.dumps(value)},\n")
+            f.write('  "files": {')
+            separator = "\n"
+            files = iter(files)
+            while True:
+                batch = list(islice(files, MANIFEST_BATCH_SIZE))
+                if not batch:
+                    break
+                hash_files(batch)
+                for file_path in batch:
+                    try:
+                        st = (PROJECT_ROOT / file_path).stat()
+                        digest = get_file_hash(file_path)
+                    except OSError:
+                        continue
+                    rel_path = file_path.replace('\\', '/')
+                    f.write(f'{separator}    {json.dumps(rel_path)}: {{"size": {st.st_size}, "sha256": "{digest}"}}')
+                    separator = ",\n"
+                    binary.add(rel_path, st.st_size, st.st_mtime_ns, digest)
+                    manifest.add_files()
+                    manifest.add_bytes(st.st_size)
+            f.write("\n  }\n}\n")
+        os.replace(partial_path, MANIFEST_PATH)
+        shutil.copyfile(MANIFEST_PATH, versioned_path)
+        manifest.wrote(MANIFEST_PATH)
+        
+        partial_path = BINARY_MANIFEST_PATH.with_name(BINARY_MANIFEST_PATH.name + ".tmp")
+        binary.write(partial_path, header)
+        os.replace(partial_path, BINARY_MANIFEST_PATH)
+        shutil.copyfile(BINARY_MANIFEST_PATH, BINARY_MANIFEST_PATH.with_name(f"manifest-v{version}.bin"))
+        manifest.wrote(BINARY_MANIFEST_PATH)
+        count_cache_lookups(manifest, *lookups)
     
-    # Check for required assets
-    icon_path = PROJECT_ROOT / "assets" / "brand" / "brand.ico"
-    header_path = PROJECT_ROOT / "assets" / "brand" / "brand_installer.bmp"
+    # Every payload file has been looked up by now, so anything else in the cache is stale
+    cache.prune(set(_file_hashes))
+    cache.flush()
+    if cache.hits or cache.misses:
+        print(f"Hash cache: {cache.hits} unchanged, {cache.misses} hashed")
+    return versioned_path
+
+def load_manifest(path):
+    """Read a manifest written by write_manifest (.json or .bin); None (with a message) if unusable"""
+    try:
+        if Path(path).suffix.lower() == ".bin":
+            manifest = _binary_manifest.BinaryManifest(path).to_json_manifest()
+        else:
+            manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Cannot read manifest {path}: {e}")
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("files"), dict):
+        print(f"ERROR: {path} is not an installer manifest")
+        return None
+    if manifest.get("manifest_version") != MANIFEST_VERSION:
+        print(f"ERROR: {path} has manifest version {manifest.get('manifest_version')} "
+              f"(expected {MANIFEST_VERSION}); rebuild that release to refresh it")
+        return None
+    return manifest
+
+def diff_manifests(old_files, new_files):
+    """(added, changed, removed) relative paths between two manifest file maps"""
+    added = sorted(path for path in new_files if path not in old_files)
+    removed = sorted(path for path in old_files if path not in new_files)
+    changed = sorted(path for path in new_files
+                     if path in old_files and new_files[path]["sha256"] != old_files[path]["sha256"])
+    return added, changed, removed
+
+def iter_file_commands(files, duplicates):
+    """Yield NSIS lines installing files (duplicates are copied from their first installed copy)
     
-    if not icon_path.exists():
-        print(f"Warning: Icon not found at {icon_path}")
-        # Try alternative locations
-        alt_icon = PROJECT_ROOT / "assets" / "brand.ico"
-        if alt_icon.exists():
-            icon_path = alt_icon
-            print(f"  Using alternative: {icon_path}")
+    files is gone over twice (folders first, then files), so it must be a list, not an iterator.
+    """
+    # Add file installation commands
+    processed_dirs = set()
+    current_dir = None
     
-    if not header_path.exists():
-        print(f"Warning: Header image not found at {header_path}")
-        # Try alternative locations
-        alt_header = PROJECT_ROOT / "assets" / "brand_installer.bmp"
-        if alt_header.exists():
-            header_path = alt_header
-            print(f"  Using alternative: {header_path}")
+    for file_path in files:
+        win_path = file_path.replace('/', '\\')
+        
+        # Create directory if needed
+        if '\\' in win_path:
+            dir_path = '\\'.join(win_path.split('\\')[:-1])
+            if dir_path and dir_path not in processed_dirs:
+                yield f'    CreateDirectory "$INSTDIR\\{dir_path}"\n'
+                processed_dirs.add(dir_path)
+    
+    # Install files
+    for file_path in files:
+        if file_path in duplicates:
+            continue
+        win_path = file_path.replace('/', '\\')
+        
+        # Set output directory
+        if '\\' in win_path:
+            dir_path = '\\'.join(win_path.split('\\')[:-1])
+            if dir_path != current_dir:
+                yield f'    SetOutPath "$INSTDIR\\{dir_path}"\n'
+                current_dir = dir_path
+        else:
+            if current_dir != "":
+                yield f'    SetOutPath "$INSTDIR"\n'
+                current_dir = ""
+        
+        # Install file
+        nsi_relative = "..\\" + win_path
+        yield f'    File "{nsi_relative}"\n'
+    
+    # Materialize duplicates from the first installed copy
+    copied = [file_path for file_path in files if file_path in duplicates]
+    if copied:
+        yield "\n    ; Identical files are embedded once and copied from the first installed copy\n"
+        for file_path in copied:
+            source = duplicates[file_path].replace('/', '\\')
+            target = file_path.replace('/', '\\')
+            yield f'    CopyFiles /SILENT "$INSTDIR\\{source}" "$INSTDIR\\{target}"\n'
+
+def iter_uninstall_commands(files):
+    """Yield Delete/RMDir lines removing exactly the installed files, each folder after its contents
+    
+    One pass over files in scan (or sorted) order: a folder's files are contiguous, so only
+    the folders on the current path are kept open. (The caller still holds the path list.)
+    """
+    open_dirs = []  # [(folder parts, holds .py files)], outermost first
+    root_has_py = False
+    
+    def close_dir():
+        parts, has_py = open_dirs.pop()
+        dir_prefix = "$INSTDIR\\" + "\\".join(parts)
+        # Bytecode Python writes next to installed modules
+        if has_py:
+            yield f'    Delete "{dir_prefix}\\__pycache__\\*.pyc"\n'
+            yield f'    RMDir "{dir_prefix}\\__pycache__"\n'
+        yield f'    RMDir "{dir_prefix}"\n'
+    
+    for file_path in files:
+        win_path = file_path.replace('/', '\\')
+        parts = tuple(win_path.split('\\')[:-1])
+        
+        # Leave folders this file is not in (deepest first), then enter its own
+        while open_dirs and open_dirs[-1][0] != parts[:len(open_dirs[-1][0])]:
+            yield from close_dir()
+        for depth in range(len(open_dirs) + 1, len(parts) + 1):
+            open_dirs.append((parts[:depth], False))
+        
+        yield f'    Delete "$INSTDIR\\{win_path}"\n'
+        if win_path.endswith(".py"):
+            if open_dirs:
+                open_dirs[-1] = (open_dirs[-1][0], True)
+            else:
+                root_has_py = True
+    
+    while open_dirs:
+        yield from close_dir()
+    if root_has_py:
+        yield '    Delete "$INSTDIR\\__pycache__\\*.pyc"\n'
+        yield '    RMDir "$INSTDIR\\__pycache__"\n'
+
+def iter_uninstall_section(currentapp, registry_key, is_builder, files, startmenu_page=True):
+    """Yield the uninstall section removing the shortcuts, registry entries, launchers and installed files
+    
+    Scripts without the start menu page (patch installers) read the folder from the registry.
+    """
+    if startmenu_page:
+        get_start_menu = "    !insertmacro MUI_STARTMENU_GETFOLDER Application $StartMenuFolder\n"
+    else:
+        get_start_menu = (f'    ReadRegStr $StartMenuFolder HKLM "Software\\{registry_key}" "Start Menu Folder"\n'
+                          '    StrCmp $StartMenuFolder "" 0 +2\n'
+                          f'        StrCpy $StartMenuFolder "{registry_key}"\n')
+    
+    yield f"""
+Section "Uninstall"
+    ; Remove shortcuts
+{get_start_menu}    Delete "$SMPROGRAMS\\$StartMenuFolder\\*.*"
+    RMDir "$SMPROGRAMS\\$StartMenuFolder"
+    Delete "$DESKTOP\\{currentapp}.lnk"
+    
+    ; Remove registry entries
+    DeleteRegKey HKLM "Software\\{registry_key}"
+    DeleteRegKey HKLM "Software\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\{registry_key}"
+    
+    ; Remove files
+    Delete "$INSTDIR\\{"winapp.bat" if is_builder else "run.bat"}"
+    Delete "$INSTDIR\\launch.vbs"
+    Delete "$INSTDIR\\run-visible.bat"
+    Delete "$INSTDIR\\{"launch_gui.pyw" if is_builder else "launch.pyw"}"
+    Delete "$INSTDIR\\VERSION.txt"
+    Delete "$INSTDIR\\uninstall.exe"
     
+    ; Remove installed files only - anything the user added is left in place
+"""
+    yield from iter_uninstall_commands(files)
+    if has_bundled_deps(files):
+        # Everything in it was installed by the offline pip step
+        yield f'    RMDir /r "$INSTDIR\\{SITE_PACKAGES_DIR}"\n'
+    yield """    RMDir "$INSTDIR"
+SectionEnd
+"""
+
+def has_bundled_deps(files):
+    """True if the payload contains the wheelhouse written by `winapp deps`"""
+    return any(file_path.replace('\\', '/') == BUNDLED_REQUIREMENTS for file_path in files)
+
+def iter_deps_install():
+    """Yield NSIS lines pip-installing the bundled wheels offline into the app's site-packages"""
+    yield f"""
+    ; Install the bundled dependencies offline (wheels written by winapp deps)
+    DetailPrint "Installing Python dependencies from the bundled wheels..."
+    nsExec::ExecToLog 'py -m pip install --no-index --disable-pip-version-check --upgrade --target "$INSTDIR\\{SITE_PACKAGES_DIR}" --find-links "$INSTDIR\\wheels" -r "$INSTDIR\\wheels\\requirements.txt"'
+    Pop $0
+    StrCmp $0 "0" deps_installed
+        MessageBox MB_ICONEXCLAMATION|MB_OK "Could not install the Python dependencies (pip exit code $0).$\\r$\\nInstall Python 3 with the py launcher, then run this installer again."
+    deps_installed:
+"""
+
+def iter_nsi_script(currentapp, is_builder, version, year, files_list, core_files, component_files,
+                    component_sizes, duplicates, frozen_exe=None):
+    """Yield the installer script piece by piece (written straight to disk by generate_nsi)"""
+    # A frozen app is started through its executable instead of the Python sources
+    frozen_win_path = frozen_exe.replace('/', '\\') if frozen_exe else None
+    run_command = f'$\\"{frozen_win_path}$\\"' if frozen_exe else "py main.py"
+    gui_target = frozen_win_path or ("launch_gui.pyw" if is_builder else "launch.pyw")
+    # Bundled wheels are installed into a private site-packages the launchers put on sys.path
+    bundled_deps = not is_builder and not frozen_exe and has_bundled_deps(files_list)
+    deps_path_bat = f'    FileWrite $0 "set PYTHONPATH=%~dp0{SITE_PACKAGES_DIR};%PYTHONPATH%$\\r$\\n"\n' if bundled_deps else ""
+    deps_path_pyw = (f"    FileWrite $0 'sys.path.insert(0, os.path.join(os.path.dirname(__file__), \"{SITE_PACKAGES_DIR}\"))$\\r$\\n'\n"
+                     if bundled_deps else "")
     # Get relative paths for NSIS (relative to installer/ folder)
     icon_relative = "..\\assets\\brand\\brand.ico"
     header_relative = "..\\assets\\brand\\brand_installer.bmp"
@@ -155,12 +832,14 @@ def generate_nsi():
     registry_key = get_registry_key(currentapp)
     install_dir = get_install_dir(currentapp)
     outfile_name = get_outfile_name(currentapp, version)
+    installer_options = get_installer_options()
     
     # SIMPLIFIED NSIS TEMPLATE - DYNAMIC
-    nsi_content = f"""; ============================================
+    yield f"""; ============================================
 ; {currentapp} Installer ({year})
 ; Company: Amatak Holdings Pty Ltd
 ; ============================================
+{compression_directives(installer_options)}
 !include "MUI2.nsh"
 
 Name "{currentapp} v{version}"
@@ -177,11 +856,15 @@ BrandingText "Amatak Holdings Pty Ltd © {year}"
 !define MUI_HEADERIMAGE_BITMAP "{header_relative}"
 
 Var StartMenuFolder
+; Remember the chosen folder so the uninstaller (and patch uninstallers) can find it
+!define MUI_STARTMENUPAGE_REGISTRY_ROOT "HKLM"
+!define MUI_STARTMENUPAGE_REGISTRY_KEY "Software\\{registry_key}"
+!define MUI_STARTMENUPAGE_REGISTRY_VALUENAME "Start Menu Folder"
 
 ; --- PAGES ---
 !insertmacro MUI_PAGE_WELCOME
 !insertmacro MUI_PAGE_DIRECTORY
-!insertmacro MUI_PAGE_STARTMENU Application $StartMenuFolder
+{"!insertmacro MUI_PAGE_COMPONENTS" + chr(10) if component_files else ""}!insertmacro MUI_PAGE_STARTMENU Application $StartMenuFolder
 !insertmacro MUI_PAGE_INSTFILES
 !insertmacro MUI_PAGE_FINISH
 
@@ -190,49 +873,17 @@ Var StartMenuFolder
 !insertmacro MUI_LANGUAGE "English"
 
 ; =========== MAIN SECTION ===========
-Section "MainSection" SEC01
-    SetOutPath "$INSTDIR"
+Section "{"Core Files" if component_files else "MainSection"}" SEC01
+{"    SectionIn RO" + chr(10) if component_files else ""}    SetOutPath "$INSTDIR"
     
     ; Create directories and install files
 """
-    
-    # Add file installation commands
-    processed_dirs = set()
-    current_dir = None
-    
-    for file_path in files_list:
-        win_path = file_path.replace('/', '\\')
-        
-        # Create directory if needed
-        if '\\' in win_path:
-            dir_path = '\\'.join(win_path.split('\\')[:-1])
-            if dir_path and dir_path not in processed_dirs:
-                nsi_content += f'    CreateDirectory "$INSTDIR\\{dir_path}"\n'
-                processed_dirs.add(dir_path)
-    
-    # Install files
-    for file_path in files_list:
-        win_path = file_path.replace('/', '\\')
-        
-        # Set output directory
-        if '\\' in win_path:
-            dir_path = '\\'.join(win_path.split('\\')[:-1])
-            if dir_path != current_dir:
-                nsi_content += f'    SetOutPath "$INSTDIR\\{dir_path}"\n'
-                current_dir = dir_path
-        else:
-            if current_dir != "":
-                nsi_content += f'    SetOutPath "$INSTDIR"\n'
-                current_dir = ""
-        
-        # Install file
-        nsi_relative = "..\\" + win_path
-        nsi_content += f'    File "{nsi_relative}"\n'
+    yield from iter_file_commands(core_files, duplicates)
     
     # Continue with the rest of the script - DYNAMIC for builder vs generated apps
     if is_builder:
         # Builder-specific launcher script
-        nsi_content += f"""
+        yield f"""
     ; Install VERSION.txt if it exists
     SetOutPath "$INSTDIR"
     File "..\\VERSION.txt"
@@ -302,7 +953,7 @@ Section "MainSection" SEC01
 """
     else:
         # Generated app launcher script
-        nsi_content += f"""
+        yield f"""
     ; Install VERSION.txt if it exists
     SetOutPath "$INSTDIR"
     File "..\\VERSION.txt"
@@ -315,22 +966,24 @@ Section "MainSection" SEC01
     FileWrite $0 "echo ========================================$\\r$\\n"
     FileWrite $0 "echo.$\\r$\\n"
     FileWrite $0 'cd /d "%~dp0"$\\r$\\n'
-    FileWrite $0 "echo Starting {currentapp}...$\\r$\\n"
+{deps_path_bat}    FileWrite $0 "echo Starting {currentapp}...$\\r$\\n"
     FileWrite $0 "echo.$\\r$\\n"
-    FileWrite $0 "py main.py %*$\\r$\\n"
+    FileWrite $0 "{run_command} %*$\\r$\\n"
     FileWrite $0 "if errorlevel 1 ($\\r$\\n"
     FileWrite $0 "  echo.$\\r$\\n"
     FileWrite $0 "  echo Application failed with error code %ERRORLEVEL%$\\r$\\n"
     FileWrite $0 "  pause$\\r$\\n"
     FileWrite $0 ")$\\r$\\n"
     FileClose $0
-    
+"""
+        if not frozen_exe:
+            yield f"""    
     ; Create Python launcher for generated app
     FileOpen $0 "$INSTDIR\\launch.pyw" w
     FileWrite $0 'import sys$\\r$\\n'
     FileWrite $0 'import os$\\r$\\n'
     FileWrite $0 'sys.path.insert(0, os.path.dirname(__file__))$\\r$\\n'
-    FileWrite $0 'try:$\\r$\\n'
+{deps_path_pyw}    FileWrite $0 'try:$\\r$\\n'
     FileWrite $0 '    import main$\\r$\\n'
     FileWrite $0 '    if hasattr(main, "main"):$\\r$\\n'
     FileWrite $0 '        sys.exit(main.main())$\\r$\\n'
@@ -344,9 +997,11 @@ Section "MainSection" SEC01
     FileWrite $0 '    input("Press Enter to exit...")$\\r$\\n'
     FileClose $0
 """
+        if bundled_deps:
+            yield from iter_deps_install()
     
     # Common launcher scripts for both builder and generated apps
-    nsi_content += f"""
+    yield f"""
     ; Create VBS wrapper - SIMPLIFIED AND CORRECT
     FileOpen $0 "$INSTDIR\\launch.vbs" w
     FileWrite $0 'Set WshShell = CreateObject("WScript.Shell")$\\r$\\n'
@@ -379,7 +1034,27 @@ Section "MainSection" SEC01
     WriteRegStr HKLM "Software\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\{registry_key}" "URLInfoAbout" "https://github.com/amatak-org/amatak-winapp"
     
 SectionEnd
-
+"""
+    
+    # Optional components - sizes come from the scan; copied duplicates are added to the estimate
+    component_descriptions = []
+    for index, ((component, files), size) in enumerate(zip(component_files, component_sizes), 1):
+        section_id = f"SEC_COMP{index}"
+        size_text = f"{size / (1024 * 1024):.1f} MB" if size >= 1024 * 1024 else f"{max(1, size // 1024)} KB"
+        description = component["description"] or f"{component['name']} ({len(files)} files, {size_text})"
+        component_descriptions.append((section_id, description.replace('"', "'")))
+        
+        yield f"""
+Section {"" if component["selected"] else "/o "}"{component['name']}" {section_id}
+"""
+        yield from iter_file_commands(files, duplicates)
+        copied_kb = payload_size([file_path for file_path in files if file_path in duplicates]) // 1024
+        if copied_kb:
+            yield f"    AddSize {copied_kb}\n"
+        yield f'    WriteRegDWORD HKLM "Software\\{registry_key}\\{COMPONENTS_REG_SUBKEY}" "{component["name"]}" 1\n'
+        yield "SectionEnd\n"
+    
+    yield f"""
 Section "Shortcuts" SEC02
     !insertmacro MUI_STARTMENU_WRITE_BEGIN Application
     CreateDirectory "$SMPROGRAMS\\$StartMenuFolder"
@@ -388,7 +1063,7 @@ Section "Shortcuts" SEC02
     ; Create shortcut to visible console
     CreateShortcut "$SMPROGRAMS\\$StartMenuFolder\\{currentapp} (Console).lnk" "$INSTDIR\\run-visible.bat" "" "$INSTDIR\\assets\\brand\\brand.ico" 0
     ; Create shortcut to Python GUI launcher
-    CreateShortcut "$SMPROGRAMS\\$StartMenuFolder\\{currentapp} GUI.lnk" "$INSTDIR\\{"launch_gui.pyw" if is_builder else "launch.pyw"}" "" "$INSTDIR\\assets\\brand\\brand.ico" 0
+    CreateShortcut "$SMPROGRAMS\\$StartMenuFolder\\{currentapp} GUI.lnk" "$INSTDIR\\{gui_target}" "" "$INSTDIR\\assets\\brand\\brand.ico" 0
     CreateShortcut "$SMPROGRAMS\\$StartMenuFolder\\Uninstall.lnk" "$INSTDIR\\uninstall.exe" "" "$INSTDIR\\uninstall.exe" 0
     CreateShortcut "$DESKTOP\\{currentapp}.lnk" "$INSTDIR\\launch.vbs" "" "$INSTDIR\\assets\\brand\\brand.ico" 0
     !insertmacro MUI_STARTMENU_WRITE_END
@@ -397,46 +1072,111 @@ SectionEnd
 Section -Post
     WriteUninstaller "$INSTDIR\\uninstall.exe"
 SectionEnd
-
-Section "Uninstall"
-    ; Remove shortcuts
-    !insertmacro MUI_STARTMENU_GETFOLDER Application $StartMenuFolder
-    Delete "$SMPROGRAMS\\$StartMenuFolder\\*.*"
-    RMDir "$SMPROGRAMS\\$StartMenuFolder"
-    Delete "$DESKTOP\\{currentapp}.lnk"
-    
-    ; Remove registry entries
-    DeleteRegKey HKLM "Software\\{registry_key}"
-    DeleteRegKey HKLM "Software\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\{registry_key}"
+"""
     
-    ; Remove files
-    Delete "$INSTDIR\\{"winapp.bat" if is_builder else "run.bat"}"
-    Delete "$INSTDIR\\launch.vbs"
-    Delete "$INSTDIR\\run-visible.bat"
-    Delete "$INSTDIR\\{"launch_gui.pyw" if is_builder else "launch.pyw"}"
-    Delete "$INSTDIR\\uninstall.exe"
+    if component_descriptions:
+        yield "\n!insertmacro MUI_FUNCTION_DESCRIPTION_BEGIN\n"
+        for section_id, description in component_descriptions:
+            yield f'    !insertmacro MUI_DESCRIPTION_TEXT ${{{section_id}}} "{description}"\n'
+        yield "!insertmacro MUI_FUNCTION_DESCRIPTION_END\n"
     
-    ; Remove all other files
-    RMDir /r "$INSTDIR"
-SectionEnd
-
+    yield from iter_uninstall_section(currentapp, registry_key, is_builder, files_list)
+    yield f"""
 Function .onInit
     StrCpy $StartMenuFolder "{registry_key}"
 FunctionEnd
 """
     
+
+def generate_nsi(dedup=True, frozen_exe=None, prune=False):
+    """Generate NSIS installer script - DYNAMIC VERSION"""
+    version = get_version()
+    year = datetime.now().year
+    
+    # Detect current app context
+    currentapp, is_builder = detect_current_app()
+    print(f"\nBuilding installer for: {currentapp}")
+    print(f"Context: {'Builder' if is_builder else 'Generated App'}")
+    if frozen_exe and is_builder:
+        print("Warning: The builder is installed from its sources; ignoring the frozen app")
+        frozen_exe = None
+    elif frozen_exe:
+        print(f"Frozen app: {frozen_exe}")
+    
+    # Get list of files to install
+    files_list = scan_project_files(frozen_exe)
+    
+    prune_options = get_prune_options(force=prune)
+    if prune_options and (is_builder or frozen_exe):
+        print("Warning: Pruning only applies to generated apps installed from source; shipping every file")
+    elif prune_options and files_list:
+        with _profiling.stage("prune_payload", category="gen_nsi") as pruning:
+            pruning.add_files(len(files_list))
+            files_list = prune_payload(files_list, prune_options)
+    
+    if not files_list:
+        print("ERROR: No files found to install! Check your project directory.")
+        return False
+    
+    # Optional components get their own sections; everything else is core
+    core_files, component_files = assign_components(files_list, get_components())
+    component_of = {file_path: component["name"] for component, files in component_files for file_path in files}
+    component_sizes = [payload_size(files) for _, files in component_files]
+    
+    # Identical payload files: {duplicate: first copy in the same component}
+    duplicates = find_duplicate_files(files_list, group_of=component_of.get) if dedup else {}
+    
+    # Check for required assets
+    icon_path = PROJECT_ROOT / "assets" / "brand" / "brand.ico"
+    header_path = PROJECT_ROOT / "assets" / "brand" / "brand_installer.bmp"
+    
+    if not icon_path.exists():
+        print(f"Warning: Icon not found at {icon_path}")
+        # Try alternative locations
+        alt_icon = PROJECT_ROOT / "assets" / "brand.ico"
+        if alt_icon.exists():
+            icon_path = alt_icon
+            print(f"  Using alternative: {icon_path}")
+    
+    if not header_path.exists():
+        print(f"Warning: Header image not found at {header_path}")
+        # Try alternative locations
+        alt_header = PROJECT_ROOT / "assets" / "brand_installer.bmp"
+        if alt_header.exists():
+            header_path = alt_header
+            print(f"  Using alternative: {header_path}")
+    
     try:
         # Create installer directory if it doesn't exist
         NSIS_OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(NSIS_OUTPUT_PATH, "w", encoding="utf-8") as f:
-            f.write(nsi_content)
+        # The script text is streamed to disk (the path list above stays in memory);
+        # a failed run leaves the previous one in place
+        partial_path = NSIS_OUTPUT_PATH.with_name(NSIS_OUTPUT_PATH.name + ".tmp")
+        with _profiling.stage("write_nsi", category="gen_nsi") as write:
+            with open(partial_path, "w", encoding="utf-8") as f:
+                f.writelines(iter_nsi_script(currentapp, is_builder, version, year, files_list, core_files,
+                                             component_files, component_sizes, duplicates, frozen_exe))
+            os.replace(partial_path, NSIS_OUTPUT_PATH)
+            write.add_files()
+            write.wrote(NSIS_OUTPUT_PATH)
+        
+        versioned_manifest = write_manifest(files_list, currentapp, version)
         
         print(f"\n[{year}] SUCCESS: NSIS installer script generated successfully!")
         print(f"   Application: {currentapp}")
         print(f"   Location: {NSIS_OUTPUT_PATH}")
+        print(f"   Manifest: {versioned_manifest}")
         print(f"   Version: {version}")
         print(f"   Files to install: {len(files_list)}")
+        if duplicates:
+            print(f"   Embedded files: {len(files_list) - len(duplicates)} ({len(duplicates)} copied at install time)")
+        if component_files:
+            print(f"\nOptional components:")
+            for (component, files), size in zip(component_files, component_sizes):
+                default = "selected" if component["selected"] else "not selected"
+                print(f"   - {component['name']}: {len(files)} files, "
+                      f"{size / (1024 * 1024):.2f} MB ({default} by default)")
         
         # Show first few files as example
         if files_list:
@@ -451,6 +1191,9 @@ FunctionEnd
         if is_builder:
             print(f"   1. winapp.bat - Main console launcher")
             print(f"   2. launch_gui.pyw - GUI launcher (.pyw = no console)")
+        elif frozen_exe:
+            print(f"   1. run.bat - Main console launcher (starts {frozen_exe})")
+            print(f"   2. (no launch.pyw - the GUI shortcut starts the frozen app directly)")
         else:
             print(f"   1. run.bat - Main console launcher")
             print(f"   2. launch.pyw - Python launcher (.pyw = no console)")
@@ -474,19 +1217,176 @@ FunctionEnd
         return False
 
 
+def get_patch_outfile_name(app_name, old_version, version):
+    """Generate output filename for a patch installer"""
+    setup_name = get_outfile_name(app_name, version)
+    return setup_name.replace("_Setup_", f"_Patch_v{old_version}_to_", 1)
 
-def compile_nsis():
-    """Compile the NSIS script"""
-    if not NSIS_OUTPUT_PATH.exists():
-        print("ERROR: NSIS script not found. Generate it first.")
+def iter_patch_file_commands(files):
+    """SetOutPath/File commands installing files (SetOutPath creates missing directories)"""
+    current_dir = None
+    for file_path in files:
+        win_path = file_path.replace('/', '\\')
+        dir_path = '\\'.join(win_path.split('\\')[:-1])
+        if dir_path != current_dir:
+            out_dir = f"$INSTDIR\\{dir_path}" if dir_path else "$INSTDIR"
+            yield f'    SetOutPath "{out_dir}"\n'
+            current_dir = dir_path
+        yield f'    File "..\\{win_path}"\n'
+
+def iter_patch_component(index, component, files, old_files, registry_key):
+    """Patch commands for an optional component's files, skipped if it is not installed
+    
+    Installers record their components in the registry; for installs made before that,
+    a file the component had in the old release stands in for the record.
+    """
+    install, skip = f"component{index}_install", f"component{index}_skip"
+    yield f"\n    ; {component['name']} - only where the component was installed\n"
+    yield f'    ReadRegDWORD $0 HKLM "Software\\{registry_key}\\{COMPONENTS_REG_SUBKEY}" "{component["name"]}"\n'
+    yield f'    StrCmp $0 "1" {install}\n'
+    probe = next((path for path in sorted(old_files) if component_matches(path, component["include"])), None)
+    if probe:
+        probe = probe.replace('/', '\\')
+        yield f'    IfFileExists "$INSTDIR\\{probe}" {install}\n'
+    yield f"    Goto {skip}\n"
+    yield f"    {install}:\n"
+    yield from iter_patch_file_commands(files)
+    yield f'    WriteRegDWORD HKLM "Software\\{registry_key}\\{COMPONENTS_REG_SUBKEY}" "{component["name"]}" 1\n'
+    yield f"    {skip}:\n"
+
+def generate_patch(old_manifest_path):
+    """Generate an NSIS patch installer from the previous release's manifest to the current one"""
+    old_manifest = load_manifest(old_manifest_path)
+    new_manifest = load_manifest(MANIFEST_PATH) if old_manifest else None
+    if not new_manifest:
         return False
     
+    year = datetime.now().year
+    currentapp = new_manifest["app"]
+    version = new_manifest["version"]
+    old_version = old_manifest.get("version", "0")
+    if old_manifest.get("app") != currentapp:
+        print(f"Warning: Old manifest is for '{old_manifest.get('app')}', not '{currentapp}'")
+    if old_version == version:
+        print(f"Warning: Old manifest has the same version ({version}); "
+              "installed copies will not be told apart")
+    
+    with _profiling.stage("diff_manifests", category="gen_nsi") as diff:
+        added, changed, removed = diff_manifests(old_manifest["files"], new_manifest["files"])
+        diff.add_files(len(added) + len(changed) + len(removed))
+    
+    print(f"\nPatch v{old_version} -> v{version}: {len(added)} added, {len(changed)} changed, "
+          f"{len(removed)} removed")
+    if not (added or changed or removed):
+        print("Nothing to patch: the payload is identical to the old release.")
+        return True
+    
+    registry_key = get_registry_key(currentapp)
+    uninstall_key = f"Software\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\{registry_key}"
+    outfile_name = get_patch_outfile_name(currentapp, old_version, version)
+    icon_relative = "..\\assets\\brand\\brand.ico"
+    
+    nsi_content = f"""; ============================================
+; {currentapp} Patch v{old_version} -> v{version} ({year})
+; Company: Amatak Holdings Pty Ltd
+; ============================================
+{compression_directives(get_installer_options())}
+!include "MUI2.nsh"
 
-    # Detect app context for filename
-    currentapp, is_builder = detect_current_app()
-    version = get_version()
-    outfile_name = get_outfile_name(currentapp, version)
-    # Try to find makensis.exe
+Name "{currentapp} Update v{version}"
+OutFile "{outfile_name}"
+InstallDirRegKey HKLM "Software\\{registry_key}" "Install_Dir"
+RequestExecutionLevel admin
+ShowInstDetails show
+BrandingText "Amatak Holdings Pty Ltd © {year}"
+
+!define MUI_ICON "{icon_relative}"
+!define MUI_UNICON "{icon_relative}"
+
+Var StartMenuFolder
+
+; --- PAGES ---
+!insertmacro MUI_PAGE_INSTFILES
+!insertmacro MUI_UNPAGE_CONFIRM
+!insertmacro MUI_UNPAGE_INSTFILES
+!insertmacro MUI_LANGUAGE "English"
+
+Function .onInit
+    ; Patches only apply on top of the release they were built from
+    ReadRegStr $INSTDIR HKLM "Software\\{registry_key}" "Install_Dir"
+    StrCmp $INSTDIR "" 0 installed
+        MessageBox MB_ICONSTOP "{currentapp} is not installed. Please run the full installer."
+        Abort
+    installed:
+    ReadRegStr $0 HKLM "Software\\{registry_key}" "Version"
+    StrCmp $0 "{old_version}" version_ok
+        MessageBox MB_ICONSTOP "This update requires {currentapp} v{old_version} (installed: v$0)."
+        Abort
+    version_ok:
+FunctionEnd
+
+; =========== PATCH SECTION ===========
+Section "Update" SEC01
+"""
+    
+    # Added and changed files; optional components only where they were installed
+    core_files, component_files = assign_components(sorted(added + changed), get_components())
+    nsi_content += "".join(iter_patch_file_commands(core_files))
+    for index, (component, files) in enumerate(component_files, 1):
+        nsi_content += "".join(iter_patch_component(index, component, files, old_manifest["files"],
+                                                    registry_key))
+    
+    # Removed files, then any of their folders left empty (deepest first; RMDir keeps non-empty ones)
+    if removed:
+        nsi_content += f"\n    ; Files removed since v{old_version}\n"
+        nsi_content += '    SetOutPath "$INSTDIR"\n'
+        removed_dirs = set()
+        for file_path in removed:
+            win_path = file_path.replace('/', '\\')
+            nsi_content += f'    Delete "$INSTDIR\\{win_path}"\n'
+            parts = win_path.split('\\')[:-1]
+            for depth in range(1, len(parts) + 1):
+                removed_dirs.add('\\'.join(parts[:depth]))
+        for dir_path in sorted(removed_dirs, key=lambda d: (-d.count('\\'), d)):
+            nsi_content += f'    RMDir "$INSTDIR\\{dir_path}"\n'
+    
+    # New or changed dependencies are installed the same way as by the full installer
+    if has_bundled_deps(added + changed):
+        nsi_content += "".join(iter_deps_install())
+    
+    nsi_content += f"""
+    ; Record the new version
+    WriteRegStr HKLM "Software\\{registry_key}" "Version" "{version}"
+    WriteRegStr HKLM "{uninstall_key}" "DisplayVersion" "{version}"
+    
+    ; The uninstaller must know about the files this patch added
+    WriteUninstaller "$INSTDIR\\uninstall.exe"
+SectionEnd
+"""
+    _, is_builder = detect_current_app()
+    nsi_content += "".join(iter_uninstall_section(currentapp, registry_key, is_builder,
+                                                  sorted(new_manifest["files"]), startmenu_page=False))
+    
+    try:
+        with _profiling.stage("write_patch_nsi", category="gen_nsi") as write:
+            PATCH_OUTPUT_PATH.write_text(nsi_content, encoding="utf-8")
+            write.add_files()
+            write.wrote(PATCH_OUTPUT_PATH)
+    except OSError as e:
+        print(f"ERROR: Error writing patch script: {e}")
+        return False
+    
+    patch_bytes = sum(new_manifest["files"][path]["size"] for path in added + changed)
+    full_bytes = sum(entry["size"] for entry in new_manifest["files"].values())
+    print(f"\n[{year}] SUCCESS: NSIS patch script generated!")
+    print(f"   Location: {PATCH_OUTPUT_PATH}")
+    print(f"   Output: {outfile_name}")
+    print(f"   Payload: {patch_bytes / (1024 * 1024):.2f} MB of {full_bytes / (1024 * 1024):.2f} MB")
+    return True
+
+
+def find_makensis():
+    """Return the path of makensis(.exe), or None if NSIS is not installed"""
     nsis_paths = [
         r"C:\Program Files (x86)\NSIS\makensis.exe",
         r"C:\Program Files\NSIS\makensis.exe",
@@ -494,17 +1394,173 @@ def compile_nsis():
         r"makensis.exe"  # If in PATH
     ]
     
-    makensis = None
     for path in nsis_paths:
         if Path(path).exists():
-            makensis = path
-            break
+            return path
+    
+    # Try to find in PATH
+    import shutil
+    return shutil.which("makensis")
+
+def apply_compression(nsi_content, options, outfile):
+    """Copy of an NSIS script using other compression settings and another OutFile"""
+    content = COMPRESSION_DIRECTIVE_RE.sub("", nsi_content)
+    content = OUTFILE_RE.sub(lambda match: f'OutFile "{outfile}"', content, count=1)
+    # Compression commands must come before anything else that adds data
+    return compression_directives(options) + content
+
+def read_payload_sample(nsi_content, limit=BENCH_SAMPLE_BYTES):
+    """(payload bytes, first `limit` bytes of payload) for the files in an NSIS script"""
+    installer_dir = NSIS_OUTPUT_PATH.parent
+    paths = sorted({os.path.normpath(installer_dir / path.replace("\\", "/"))
+                    for path in NSI_FILE_RE.findall(nsi_content)})
+    total = 0
+    sample = bytearray()
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+            if len(sample) < limit:
+                with open(path, "rb") as f:
+                    sample += f.read(limit - len(sample))
+        except OSError:
+            continue
+    return total, bytes(sample)
+
+def measure_decompress_rate(options, sample):
+    """Bytes/second Python's equivalent codec decompresses the sample at"""
+    import time
+    
+    compressor = options["compressor"]
+    if compressor == "lzma":
+        import lzma
+        filters = [{"id": lzma.FILTER_LZMA1, "dict_size": (options.get("dict_size") or 8) << 20}]
+        packed = lzma.compress(sample, format=lzma.FORMAT_ALONE, filters=filters)
+        unpack = lambda: lzma.decompress(packed, format=lzma.FORMAT_ALONE)
+    elif compressor == "bzip2":
+        import bz2
+        packed = bz2.compress(sample, 9)
+        unpack = lambda: bz2.decompress(packed)
+    else:
+        import zlib
+        packed = zlib.compress(sample, 9)
+        unpack = lambda: zlib.decompress(packed)
+    
+    start = time.perf_counter()
+    unpack()
+    return len(sample) / max(time.perf_counter() - start, 1e-9)
+
+def compile_bench_variant(makensis, nsi_content, name, options):
+    """Compile one candidate; returns its result dict"""
+    import subprocess
+    import time
+    
+    installer_dir = NSIS_OUTPUT_PATH.parent
+    outfile = f".bench-{name}.exe"
+    # Variant scripts live in installer/ so their ..\ File paths stay valid
+    variant_nsi = installer_dir / f".bench-{name}.nsi"
+    variant_nsi.write_text(apply_compression(nsi_content, options, outfile), encoding="utf-8")
+    
+    result = {"name": name, "options": dict(DEFAULT_INSTALLER_OPTIONS, **options),
+              "success": False, "compile_seconds": None, "installer_bytes": None, "error": None}
+    try:
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run([makensis, "/V1", str(variant_nsi)], capture_output=True, text=True,
+                                       encoding="utf-8", errors="replace", cwd=PROJECT_ROOT, timeout=COMPILE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            completed = None
+        result["compile_seconds"] = round(time.perf_counter() - start, 3)
+        
+        exe_path = next((path for path in (installer_dir / outfile, PROJECT_ROOT / outfile) if path.exists()), None)
+        if completed is None:
+            result["error"] = f"timed out after {COMPILE_TIMEOUT} seconds"
+        elif completed.returncode == 0 and exe_path:
+            result["success"] = True
+            result["installer_bytes"] = exe_path.stat().st_size
+        else:
+            output = (completed.stdout + completed.stderr).strip().splitlines()
+            result["error"] = output[-1] if output else "makensis failed"
+        if exe_path:
+            exe_path.unlink()
+    finally:
+        variant_nsi.unlink()
+    return result
+
+def compression_bench(jobs=None):
+    """Compile the installer with every candidate compression setting and compare them"""
+    from concurrent.futures import ThreadPoolExecutor
     
+    makensis = find_makensis()
     if not makensis:
-        # Try to find in PATH
-        import shutil
-        makensis = shutil.which("makensis")
+        print("ERROR: NSIS compiler (makensis) not found; the compression benchmark needs it.")
+        print("   Install NSIS from: https://nsis.sourceforge.io/Download")
+        return False
+    
+    if not generate_nsi():
+        return False
+    nsi_content = NSIS_OUTPUT_PATH.read_text(encoding="utf-8")
+    payload_bytes, sample = read_payload_sample(nsi_content)
+    
+    jobs = jobs or min(len(COMPRESSION_BENCH_VARIANTS), os.cpu_count() or 1)
+    print(f"\nCompiling {len(COMPRESSION_BENCH_VARIANTS)} compression variants with {jobs} parallel jobs...")
+    if jobs > 1:
+        print("   (variants share the CPU; use --jobs 1 for isolated compile times)")
+    
+    with _profiling.stage("compression_bench", category="makensis", variants=len(COMPRESSION_BENCH_VARIANTS)):
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(lambda variant: compile_bench_variant(makensis, nsi_content, *variant),
+                                    COMPRESSION_BENCH_VARIANTS))
+    
+    # Install time is dominated by decompression; estimate it from Python's codecs on a payload sample
+    rates = {}
+    for result in results:
+        options = result["options"]
+        key = (options["compressor"], options.get("dict_size"))
+        if sample and key not in rates:
+            rates[key] = measure_decompress_rate(options, sample)
+        result["estimated_install_seconds"] = (round(payload_bytes / rates[key], 3) if sample else None)
+    
+    print(f"\nPayload: {payload_bytes / (1024 * 1024):.2f} MB")
+    print(f"{'Variant':<18} {'Installer MB':>12} {'Ratio':>7} {'Compile s':>10} {'Est. install s':>15}")
+    print("-" * 66)
+    for result in results:
+        if not result["success"]:
+            print(f"{result['name']:<18} FAILED: {result['error']}")
+            continue
+        size_mb = result["installer_bytes"] / (1024 * 1024)
+        ratio = result["installer_bytes"] / payload_bytes if payload_bytes else 0
+        install = result["estimated_install_seconds"]
+        install_text = f"{install:.2f}" if install is not None else "-"
+        print(f"{result['name']:<18} {size_mb:>12.2f} {ratio:>7.3f} {result['compile_seconds']:>10.2f} "
+              f"{install_text:>15}")
+    
+    compiled = [result for result in results if result["success"]]
+    if compiled:
+        smallest = min(compiled, key=lambda result: result["installer_bytes"])
+        print(f"\nSmallest: {smallest['name']} -> config.json: "
+              f"\"installer\": {json.dumps({k: v for k, v in smallest['options'].items() if v is not None})}")
+    
+    BENCH_RESULTS_PATH.write_text(json.dumps({
+        "payload_bytes": payload_bytes,
+        "jobs": jobs,
+        "results": results,
+    }, indent=2), encoding="utf-8")
+    print(f"Results saved to: {BENCH_RESULTS_PATH}")
+    return bool(compiled)
+
+def compile_nsis():
+    """Compile the NSIS script"""
+    if not NSIS_OUTPUT_PATH.exists():
+        print("ERROR: NSIS script not found. Generate it first.")
+        return False
+    
+
+    # Detect app context for filename
+    currentapp, is_builder = detect_current_app()
+    version = get_version()
+    outfile_name = get_outfile_name(currentapp, version)
     
+    makensis = find_makensis()
     if not makensis:
         print("WARNING: NSIS compiler (makensis.exe) not found.")
         print("   Install NSIS from: https://nsis.sourceforge.io/Download")
@@ -567,7 +1623,7 @@ def compile_nsis():
                     text=True,
                     encoding='utf-8',
                     cwd=PROJECT_ROOT,
-                    timeout=30  # 30 second timeout
+                    timeout=COMPILE_TIMEOUT
                 )
                 
                 if result.returncode == 0:
@@ -615,7 +1671,7 @@ def compile_nsis():
                         print(f"\nERROR: Compilation failed (exit code: {result.returncode}) but no error details.")
                         
             except subprocess.TimeoutExpired:
-                print(f"\nERROR: NSIS compilation timed out after 30 seconds")
+                print(f"\nERROR: NSIS compilation timed out after {COMPILE_TIMEOUT} seconds")
                 last_error = "Compilation timed out"
                 break
             except Exception as e:
@@ -647,6 +1703,83 @@ def compile_nsis():
         traceback.print_exc()
         return False
 
+def compile_patch():
+    """Compile the NSIS patch script"""
+    import subprocess
+    
+    if not PATCH_OUTPUT_PATH.exists():
+        # generate_patch found nothing to patch
+        return True
+    
+    makensis = find_makensis()
+    if not makensis:
+        print("WARNING: NSIS compiler (makensis.exe) not found; patch script not compiled.")
+        print(f'   Compile it later with: makensis "{PATCH_OUTPUT_PATH}"')
+        return True
+    
+    print(f"\nCompiling patch installer with {makensis}...")
+    try:
+        result = subprocess.run([makensis, "/V2", str(PATCH_OUTPUT_PATH)], capture_output=True, text=True,
+                                encoding="utf-8", errors="replace", cwd=PROJECT_ROOT, timeout=COMPILE_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        print(f"ERROR: NSIS compilation timed out after {COMPILE_TIMEOUT} seconds")
+        return False
+    
+    if result.returncode != 0:
+        print("ERROR: Patch compilation failed:")
+        for line in (result.stdout + result.stderr).strip().splitlines()[-10:]:
+            print(f"   {line}")
+        return False
+    
+    outfile = OUTFILE_RE.search(PATCH_OUTPUT_PATH.read_text(encoding="utf-8"))
+    exe_name = outfile.group(1) if outfile else ""
+    exe_path = next((path for path in (PATCH_OUTPUT_PATH.parent / exe_name, PROJECT_ROOT / exe_name)
+                     if exe_name and path.exists()), None)
+    if exe_path:
+        print(f"SUCCESS: Patch installer created: {exe_path} ({exe_path.stat().st_size / (1024 * 1024):.2f} MB)")
+    else:
+        print("SUCCESS: Patch installer compiled")
+    return True
+
+def list_files(page=None, page_size=FILES_PAGE_SIZE, rescan=False, frozen_exe=None):
+    """Print the payload, from the last build's manifest.bin when there is one"""
+    start, stop = 0, None
+    if page is not None:
+        page_size = max(1, page_size)
+        start = (max(1, page) - 1) * page_size
+        stop = start + page_size
+    
+    manifest = None
+    if not rescan and BINARY_MANIFEST_PATH.exists():
+        try:
+            manifest = _binary_manifest.BinaryManifest(BINARY_MANIFEST_PATH)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring {BINARY_MANIFEST_PATH.name}: {e}")
+    
+    if manifest is None:
+        # Printed as the scan finds them, so huge projects list without holding every path
+        print(f"\nFiles to be installed:")
+        count = 0
+        for count, file in enumerate(iter_project_files(frozen_exe), 1):
+            if stop is not None and count > stop:
+                break
+            if count > start:
+                print(f"  {count:3}. {file}")
+        print(f"\n{count} files" if page is None else f"\nPage {max(1, page)} ({page_size} files per page)")
+        return
+    
+    # Only the requested page is decoded; paths are rebuilt from the folder table on demand
+    total = len(manifest)
+    print(f"\nFiles to be installed (from {BINARY_MANIFEST_PATH.name}, version {manifest.meta.get('version')}, "
+          f"generated {manifest.meta.get('generated_at')}; --rescan to list the project as it is now):")
+    for index, (file, size, _, _) in enumerate(manifest.entries(start, stop), start + 1):
+        print(f"  {index:3}. {file} ({size:,} bytes)")
+    if page is not None:
+        pages = max(1, -(-total // page_size))
+        print(f"\nPage {max(1, page)} of {pages} ({total} files)")
+    else:
+        print(f"\n{total} files")
+
 def main():
     """Main function"""
     import argparse
@@ -655,7 +1788,21 @@ def main():
     parser.add_argument('--compile', '-c', action='store_true', help='Compile after generation')
     parser.add_argument('--version', '-v', action='store_true', help='Show version only')
     parser.add_argument('--files', '-f', action='store_true', help='List files to be installed')
+    parser.add_argument('--page', type=int, default=None, help='With --files: show only this page (from 1)')
+    parser.add_argument('--page-size', type=int, default=FILES_PAGE_SIZE, help='With --files: files per page')
+    parser.add_argument('--rescan', action='store_true',
+                        help='With --files: scan the project instead of reading installer/manifest.bin')
     parser.add_argument('--test', '-t', action='store_true', help='Test NSIS syntax only')
+    parser.add_argument('--no-dedup', action='store_true', help='Embed duplicate files separately')
+    parser.add_argument('--compression-bench', action='store_true',
+                        help='Compile every candidate compression setting and compare size and speed')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Parallel makensis runs for --compression-bench')
+    parser.add_argument('--prune', action='store_true',
+                        help='Ship only the modules main.py imports (and their data); report what was dropped')
+    parser.add_argument('--frozen', action='store_true',
+                        help='Install the app frozen by `winapp freeze` instead of its Python sources')
+    parser.add_argument('--patch-from', metavar='MANIFEST',
+                        help='Also build a patch installer from the manifest of a previous release')
     
     args = parser.parse_args()
     
@@ -668,20 +1815,38 @@ def main():
     print("=" * 60)
     print(f"Project directory: {PROJECT_ROOT}")
     
+    if args.compression_bench:
+        sys.exit(0 if compression_bench(args.jobs) else 1)
+    
+    frozen_exe = None
+    if args.frozen:
+        frozen_exe = read_frozen_app()
+        if frozen_exe is None:
+            sys.exit(1)
+    
     if args.files:
-        files = scan_project_files()
-        print(f"\nFiles to be installed ({len(files)}):")
-        for i, file in enumerate(files, 1):
-            print(f"  {i:3}. {file}")
+        list_files(args.page, args.page_size, args.rescan, frozen_exe)
         return
     
-    success = generate_nsi()
+    with _profiling.stage("generate_nsi", category="gen_nsi"):
+        success = generate_nsi(dedup=not args.no_dedup, frozen_exe=frozen_exe, prune=args.prune)
+    
+    if success and args.patch_from:
+        # A stale patch script from an earlier run must not be compiled by mistake
+        if PATCH_OUTPUT_PATH.exists():
+            PATCH_OUTPUT_PATH.unlink()
+        with _profiling.stage("generate_patch", category="gen_nsi"):
+            success = generate_patch(args.patch_from)
+        if success:
+            with _profiling.stage("compile_patch", category="makensis"):
+                success = compile_patch()
     
     if success and (args.compile or args.test):
         print("\n" + "=" * 60)
         print("Compiling NSIS Installer")
         print("=" * 60)
-        success = compile_nsis()
+        with _profiling.stage("compile_nsis", category="makensis"):
+            success = compile_nsis()
     
     if success:
         print("\n" + "=" * 60)
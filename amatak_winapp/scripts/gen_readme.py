@@ -1,6 +1,11 @@
 import os
 from datetime import datetime
 
+try:
+    from . import _profiling
+except ImportError:
+    import _profiling
+
 # Configuration
 TREE_FILE = "tree.txt"
 README_FILE = "README.md"
@@ -59,4 +64,7 @@ def generate_readme():
     print(f"[{CURRENT_YEAR}] README.md successfully updated from {TREE_FILE}.")
 
 if __name__ == "__main__":
-    generate_readme()
\ No newline at end of file
+    with _profiling.stage("generate_readme", category="gen_readme") as readme:
+        generate_readme()
+        readme.add_files()
+        readme.wrote(README_FILE)
\ No newline at end of file
@@ -0,0 +1,318 @@
+# gen_size.py - Show where the installer's bytes come from
+"""
+Breaks the payload gen_nsi.py would install (the same scan, --frozen and
+--prune included) down by directory, by extension and by largest files,
+with an estimate of what each group adds to the compressed installer -
+without running makensis.
+
+The estimate compresses a sample of each group with the installer's
+compressor (config.json "installer"): every group's largest files, plus
+files spread over the rest of its size range, are sampled (up to
+SAMPLE_BYTES from the start and the middle of each); the files left out
+are assumed to compress like the spread sample.
+
+    installer/size-report.json    the breakdown, compared on the next run
+
+Each run is compared with the previous report (or --compare FILE, e.g. a
+release's saved report), so a payload that suddenly doubles shows which
+folder or file type grew.
+"""
+import os
+import sys
+import bz2
+import json
+import lzma
+import zlib
+import posixpath
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from . import _profiling, gen_nsi
+except ImportError:
+    import _profiling
+    import gen_nsi
+
+PROJECT_ROOT = Path.cwd()
+
+# Configuration
+REPORT_PATH = PROJECT_ROOT / "installer" / "size-report.json"
+REPORT_VERSION = 1
+SAMPLE_FILES_PER_GROUP = 16  # Compressed per group: half its largest files, half spread over the rest
+SAMPLE_BYTES = 256 * 1024  # Read from each sampled file (half at the start, half in the middle)
+SAMPLE_JOBS = min(16, (os.cpu_count() or 1) + 4)  # zlib, bz2 and lzma release the GIL
+TOP_ROWS = 15
+DIRECTORY_DEPTH = 1
+ROOT_GROUP = "./"
+NO_EXTENSION = "(none)"
+CURRENT_YEAR = datetime.now().year
+
+def get_compress(options):
+    """Compress function matching the installer's compressor"""
+    if options["compressor"] == "lzma":
+        return lambda data: lzma.compress(data, format=lzma.FORMAT_ALONE)
+    if options["compressor"] == "bzip2":
+        return lambda data: bz2.compress(data, 9)
+    return lambda data: zlib.compress(data, 9)
+
+def directory_of(rel_path, depth):
+    """Group name of a file's folder, cut to `depth` levels ("./" for top-level files)"""
+    folder = posixpath.dirname(rel_path)
+    if not folder:
+        return ROOT_GROUP
+    return "/".join(folder.split("/")[:depth]) + "/"
+
+def extension_of(rel_path):
+    """Lower-case extension of a file ("(none)" without one)"""
+    return posixpath.splitext(posixpath.basename(rel_path))[1].lower() or NO_EXTENSION
+
+def read_sample(path, size):
+    """Up to SAMPLE_BYTES of a file: its start, plus its middle when it is larger"""
+    with open(path, "rb") as f:
+        if size <= SAMPLE_BYTES:
+            return f.read()
+        half = SAMPLE_BYTES // 2
+        head = f.read(half)
+        f.seek(size // 2)
+        return head + f.read(half)
+
+def sample_ratios(paths, sizes, compress):
+    """{path: compressed / sampled} for the given files, compressed in parallel"""
+    def ratio(rel_path):
+        try:
+            data = read_sample(PROJECT_ROOT / rel_path, sizes[rel_path])
+        except OSError:
+            return rel_path, 1.0
+        if not data:
+            return rel_path, 1.0
+        return rel_path, len(compress(data)) / len(data)
+
+    with ThreadPoolExecutor(max_workers=SAMPLE_JOBS) as pool:
+        return dict(pool.map(ratio, paths))
+
+def pick_samples(members, sizes):
+    """(largest files, files spread over the rest by size) of a group to compress"""
+    by_size = sorted(members, key=lambda path: (-sizes[path], path))
+    largest = by_size[:SAMPLE_FILES_PER_GROUP // 2]
+    rest = by_size[len(largest):]
+    count = min(len(rest), SAMPLE_FILES_PER_GROUP - len(largest))
+    spread = [rest[i * len(rest) // count] for i in range(count)] if count else []
+    return largest, spread
+
+def weighted_ratio(paths, sizes, ratios):
+    """Compressed / original over files with a sampled ratio (None if they hold no bytes)"""
+    original = sum(sizes[path] for path in paths)
+    if not original:
+        return None
+    return sum(sizes[path] * ratios[path] for path in paths) / original
+
+def summarize(groups, sizes, ratios):
+    """Rows of {name, files, bytes, estimated} for each group, largest first"""
+    rows = []
+    for name, members in groups.items():
+        total = sum(sizes[path] for path in members)
+        sampled = [path for path in members if path in ratios]
+        sampled_bytes = sum(sizes[path] for path in sampled)
+        sampled_estimate = sum(sizes[path] * ratios[path] for path in sampled)
+        # Files left out compress like the spread sample (the largest files are not typical of them)
+        _, spread = pick_samples(members, sizes)
+        group_ratio = weighted_ratio(spread, sizes, ratios) or weighted_ratio(sampled, sizes, ratios) or 1.0
+        rows.append({
+            "name": name,
+            "files": len(members),
+            "bytes": total,
+            "estimated": round(sampled_estimate + (total - sampled_bytes) * group_ratio),
+        })
+    rows.sort(key=lambda row: (-row["bytes"], row["name"]))
+    return rows
+
+def analyze(files_list, options, depth=DIRECTORY_DEPTH, top=TOP_ROWS):
+    """Size report of a payload"""
+    paths = [file_path.replace('\\', '/') for file_path in files_list]
+    sizes = {}
+    with _profiling.stage("stat_payload", category="gen_size") as stat:
+        for path in paths:
+            try:
+                sizes[path] = (PROJECT_ROOT / path).stat().st_size
+            except OSError:
+                sizes[path] = 0
+        stat.add_files(len(paths))
+        stat.add_bytes(sum(sizes.values()))
+
+    directories, extensions = {}, {}
+    for path in paths:
+        directories.setdefault(directory_of(path, depth), []).append(path)
+        extensions.setdefault(extension_of(path), []).append(path)
+    largest = sorted(paths, key=lambda path: (-sizes[path], path))[:top]
+
+    to_sample = set(largest)
+    for groups in (directories, extensions):
+        for members in groups.values():
+            for picked in pick_samples(members, sizes):
+                to_sample.update(picked)
+
+    with _profiling.stage("sample_compress", category="gen_size") as sample:
+        ratios = sample_ratios(sorted(to_sample), sizes, get_compress(options))
+        sample.add_files(len(ratios))
+        sample.add_bytes(sum(min(sizes[path], SAMPLE_BYTES) for path in ratios))
+
+    extension_rows = summarize(extensions, sizes, ratios)
+    return {
+        "version": REPORT_VERSION,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "compressor": options["compressor"],
+        "files": len(paths),
+        "bytes": sum(sizes.values()),
+        # Files of one type compress alike, so the total adds up the per-extension estimates
+        "estimated": sum(row["estimated"] for row in extension_rows),
+        "depth": depth,
+        "directories": summarize(directories, sizes, ratios),
+        "extensions": extension_rows,
+        "largest": [{"name": path, "files": 1, "bytes": sizes[path], "estimated": round(sizes[path] * ratios[path])}
+                    for path in largest],
+    }
+
+def load_report(path):
+    """A saved size report, or None"""
+    try:
+        report = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(report, dict) or report.get("version") != REPORT_VERSION:
+        print(f"Warning: {path} is not a size report from this version; not comparing")
+        return None
+    return report
+
+def compare(report, previous):
+    """Add bytes/estimated deltas against a previous report (in place)"""
+    report["compared_with"] = previous.get("generated_at")
+    report["delta"] = {key: report[key] - previous.get(key, 0) for key in ("files", "bytes", "estimated")}
+    tables = ["extensions", "largest"]
+    if previous.get("depth") == report["depth"]:
+        tables.append("directories")  # Folders grouped at another depth do not line up
+    for table in tables:
+        before = {row["name"]: row for row in previous.get(table, [])}
+        for row in report[table]:
+            old = before.pop(row["name"], None)
+            if old:
+                row["delta"] = row["bytes"] - old["bytes"]
+            elif table != "largest":
+                row["delta"] = None  # Not in the previous payload
+        if table != "largest":
+            report[f"removed_{table}"] = sorted(before.values(), key=lambda row: -row["bytes"])
+
+def format_size(size):
+    """Human-readable byte count"""
+    sign = "-" if size < 0 else ""
+    size = abs(size)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == "B" else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.2f} GB"
+
+def format_delta(row):
+    """Change column of a row ("" when nothing was compared)"""
+    if "delta" not in row:
+        return ""
+    if row["delta"] is None:
+        return "new"
+    if row["delta"] == 0:
+        return "="
+    return f"+{format_size(row['delta'])}" if row["delta"] > 0 else format_size(row["delta"])
+
+def print_table(title, rows, total, top):
+    """One breakdown as a text table (the first `top` rows)"""
+    name_width = min(60, max([len(title)] + [len(row["name"]) for row in rows[:top]]))
+    print(f"\n{title:<{name_width}}  {'Files':>7}  {'Size':>10}  {'Compressed':>10}  {'Share':>6}  {'Change':>10}")
+    print("-" * (name_width + 55))
+    for row in rows[:top]:
+        name = row["name"] if len(row["name"]) <= name_width else "..." + row["name"][-(name_width - 3):]
+        share = row["bytes"] / total * 100 if total else 0
+        print(f"{name:<{name_width}}  {row['files']:>7}  {format_size(row['bytes']):>10}  "
+              f"{'~' + format_size(row['estimated']):>10}  {share:>5.1f}%  {format_delta(row):>10}")
+    if len(rows) > top:
+        rest = rows[top:]
+        print(f"{f'({len(rest)} more)':<{name_width}}  {sum(row['files'] for row in rest):>7}  "
+              f"{format_size(sum(row['bytes'] for row in rest)):>10}")
+
+def print_report(report, top):
+    """Terminal view of a size report"""
+    print_table(f"Directory (depth {report['depth']})", report["directories"], report["bytes"], top)
+    print_table("Extension", report["extensions"], report["bytes"], top)
+    print_table("Largest files", report["largest"], report["bytes"], top)
+
+    for table in ("directories", "extensions"):
+        removed = report.get(f"removed_{table}")
+        if removed:
+            names = ", ".join(row["name"] for row in removed[:5])
+            print(f"\nNo longer in the payload ({table}): {names}"
+                  f"{f' and {len(removed) - 5} more' if len(removed) > 5 else ''}")
+
+    print(f"\n[{CURRENT_YEAR}] Payload: {report['files']} files, {format_size(report['bytes'])} "
+          f"(~{format_size(report['estimated'])} compressed with {report['compressor']})")
+    if "delta" in report:
+        delta = report["delta"]
+        print(f"   Since {report['compared_with']}: {delta['files']:+} files, "
+              f"{format_delta({'delta': delta['bytes']})} ({format_delta({'delta': delta['estimated']})} compressed)")
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Break down the installer payload by directory, extension and file')
+    parser.add_argument('--compare', help='Size report to compare with (default: the previous run)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON instead of tables')
+    parser.add_argument('--top', type=int, default=TOP_ROWS, help='Rows per table (default: %(default)s)')
+    parser.add_argument('--depth', type=int, default=DIRECTORY_DEPTH,
+                        help='Folder levels to group by (default: %(default)s)')
+    parser.add_argument('--frozen', action='store_true', help="Size the app frozen by 'winapp freeze'")
+    parser.add_argument('--prune', action='store_true', help='Size the payload pruned to what main.py imports')
+
+    args = parser.parse_args()
+    if args.top < 1 or args.depth < 1:
+        print("ERROR: --top and --depth must be at least 1")
+        return 1
+
+    # With --json, stdout carries only the report; progress goes to stderr
+    progress = contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext()
+    with progress, _profiling.stage("size", category="gen_size"):
+        frozen_exe = None
+        if args.frozen:
+            frozen_exe = gen_nsi.read_frozen_app()
+            if not frozen_exe:
+                return 1
+
+        files_list = gen_nsi.scan_project_files(frozen_exe)
+        prune_options = gen_nsi.get_prune_options(force=args.prune)
+        if prune_options and not frozen_exe and not gen_nsi.detect_current_app()[1]:
+            files_list = gen_nsi.prune_payload(files_list, prune_options)
+        if not files_list:
+            print("ERROR: No files found to install! Check your project directory.")
+            return 1
+
+        report = analyze(files_list, gen_nsi.get_installer_options(), args.depth, args.top)
+        if args.compare:
+            previous = load_report(args.compare)
+            if previous is None:
+                print(f"ERROR: Could not read size report {args.compare}")
+                return 1
+        else:
+            previous = load_report(REPORT_PATH) if REPORT_PATH.exists() else None
+        if previous:
+            compare(report, previous)
+
+        REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.top)
+        print(f"   Report: {REPORT_PATH}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
 import os
 import time
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+
+try:
+    from . import _profiling
+except ImportError:
+    import _profiling
 
 # Configuration
 MONITOR_PATH = os.getcwd()
@@ -33,25 +36,30 @@ def write_tree():
     root_name = os.path.basename(MONITOR_PATH) or "Project_Root"
     
     # Building the content with backticks at top and bottom
-    tree_content = generate_visual_tree(MONITOR_PATH)
-    full_output = f"```\n{root_name}/\n{tree_content}```"
-    
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        f.write(full_output)
-    print(f"[{time.strftime('%H:%M:%S')}] tree.txt updated with code block formatting.")
-
-class UpdateTreeHandler(FileSystemEventHandler):
-    def on_any_event(self, event):
-        # Ignore changes to the output file or excluded folders to prevent loops
-        path_parts = event.src_path.split(os.sep)
-        if any(ex in path_parts for ex in EXCLUDE_DIRS) or event.src_path.endswith(OUTPUT_FILE):
-            return
+    with _profiling.stage("generate_visual_tree", category="gen_tree") as tree:
+        tree_content = generate_visual_tree(MONITOR_PATH)
+        full_output = f"```\n{root_name}/\n{tree_content}```"
         
-        if not event.is_directory:
-            write_tree()
+        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+            f.write(full_output)
+        tree.add_files(tree_content.count("\n"))
+        tree.wrote(OUTPUT_FILE)
+    print(f"[{time.strftime('%H:%M:%S')}] tree.txt updated with code block formatting.")
 
-if __name__ == "__main__":
-    write_tree()
+def watch_tree():
+    """Keep tree.txt up to date while files change (needs watchdog)"""
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    
+    class UpdateTreeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            # Ignore changes to the output file or excluded folders to prevent loops
+            path_parts = event.src_path.split(os.sep)
+            if any(ex in path_parts for ex in EXCLUDE_DIRS) or event.src_path.endswith(OUTPUT_FILE):
+                return
+            
+            if not event.is_directory:
+                write_tree()
     
     event_handler = UpdateTreeHandler()
     observer = Observer()
@@ -64,4 +72,8 @@ if __name__ == "__main__":
             time.sleep(1)
     except KeyboardInterrupt:
         observer.stop()
-    observer.join()
\ No newline at end of file
+    observer.join()
+
+if __name__ == "__main__":
+    write_tree()
+    watch_tree()
\ No newline at end of file
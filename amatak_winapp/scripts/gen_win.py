@@ -1,8 +1,12 @@
 import os
 import subprocess
-import winreg
 import sys
 
+try:
+    from . import _profiling
+except ImportError:
+    import _profiling
+
 # Configuration
 NSI_SCRIPT = r"installer\win_installer.nsi"
 
@@ -16,6 +20,12 @@ def find_makensis():
         pass
 
     # 2. Check standard Registry locations
+    try:
+        import winreg
+    except ImportError:
+        # Not on Windows
+        return None
+    
     reg_paths = [
         (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\NSIS"),
         (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Wow6432Node\NSIS")
@@ -51,7 +61,8 @@ def compile_installer():
     
     # Run the compilation command
     # /V4 sets verbosity to all (useful for debugging)
-    result = subprocess.run([makensis_path, "/V4", NSI_SCRIPT])
+    with _profiling.stage("makensis", category="makensis", script=NSI_SCRIPT):
+        result = subprocess.run([makensis_path, "/V4", NSI_SCRIPT])
     
     if result.returncode == 0:
         print("\n" + "="*30)
@@ -2,20 +2,24 @@
 """
 Amatak WinApp - Main CLI
 Windows Application Generator and Installer Creator
+
+Only os, sys and pathlib are imported at module level so that
+`winapp --version` and `winapp help` start instantly; each command
+imports what it needs (subprocess, shutil, json, ...) when it runs.
 """
 import os
 import sys
-import json
-import shutil
 from pathlib import Path
-import subprocess
-import datetime
-import importlib.util
 
 # Get package directory
 PACKAGE_DIR = Path(__file__).parent
 PROJECT_ROOT = PACKAGE_DIR
 
+# Stage event log used by --profile and build reports (see scripts/_profiling.py)
+TRACE_ENV = "WINAPP_TRACE_FILE"
+# Set for the generator scripts of profiled commands only (never inherited from the caller)
+PROFILE_ENV_VARS = (TRACE_ENV, "WINAPP_CPROFILE_DIR", "WINAPP_TRACEMALLOC_DIR", "PYTHONTRACEMALLOC")
+
 # Import version from package
 try:
     from amatak_winapp import __version__ as PACKAGE_VERSION
@@ -44,7 +48,46 @@ Commands:
   create <name> [location]  Create new Windows application project
   init [path]              Initialize project (branding, docs, etc.)
   nsi [path]               Generate NSIS installer script
+  nsi --files [--page N] [--page-size M] [--rescan]
+                           List the payload from the last build's
+                           installer/manifest.bin, one page at a time
+                           (--rescan scans the project instead)
+  nsi --frozen             Install the app frozen by 'winapp freeze'
+  nsi --prune              Install only the modules main.py imports (and their
+                           package data); installer/prune-report.json lists
+                           what was dropped and why ("prune" in config.json
+                           "installer" sets entry, keep_modules and keep globs)
   build [path]             Build project installer (runs nsi + win)
+                           (writes installer/build-report.json for CI)
+  build --compression-bench [--jobs N]
+                           Compile every compressor/solid/dictionary variant in
+                           parallel and compare size, compile and install time
+  build --freeze           Freeze the app with PyInstaller first and install the
+                           frozen executable instead of the Python sources
+  build --deps             Bundle requirements.txt as wheels first; the installer
+                           pip-installs them offline into the app folder
+  build --prune            Leave out tests, notebooks and modules main.py never imports
+  build --patch-from <manifest>
+                           Also build a patch installer with only the files
+                           added/changed/removed since that release's manifest
+                           (each build saves installer/manifest-v<version>.json
+                           and a compact manifest-v<version>.bin; either works)
+  freeze [path] [--clean]  Freeze the app with PyInstaller into dist/<name>/
+                           (skipped when sources and requirements are unchanged;
+                           the spec and analysis cache live in installer/.cache)
+  deps [path] [--offline] [--force]
+                           Resolve requirements.txt into wheels/ through a wheel
+                           cache shared by all projects (WINAPP_WHEEL_CACHE);
+                           --find-links DIR --no-index uses a local folder
+  size [path] [--compare <report>] [--json] [--top N] [--depth N]
+                           Break the payload down by folder, extension and
+                           largest files with estimated compressed sizes, and
+                           show what changed since the last run (or <report>);
+                           --frozen/--prune size those payloads instead
+  brand [path]             Generate branding assets (png, ico, bmp)
+  brand --all <root>       Generate branding for every project (folder with a
+                           main.py) under <root>, nested projects included
+                           (unchanged assets are skipped; add --force to re-render)
   gui                      Launch graphical interface
   version, -v, --version   Show version information
   help, -h, --help         Show this help message
@@ -52,12 +95,26 @@ Commands:
 Options:
   -v, --version            Show version and exit
   -h, --help               Show help and exit
+  --profile                Time every stage of init/nsi/build/freeze/deps/size/brand,
+                           print a summary and write
+                           installer/.profile/<command>-trace.json
+  --cprofile [out.prof]    Profile the command body with cProfile (all processes
+                           merged into installer/.profile/<out.prof>)
+  --tracemalloc            Record top allocation sites per process in
+                           installer/.profile/<command>-tracemalloc.txt
 
 Examples:
   winapp create MyApp
   winapp init
   winapp nsi               # Generate NSIS script only
   winapp build             # Generate NSIS and build installer
+  winapp build --profile   # ...and show where the build time goes
+  winapp build --patch-from old/manifest-v1.0.0.json
+  winapp build --freeze    # Installer for the frozen app (no Python needed)
+  winapp build --deps      # Installer that sets up its dependencies offline
+  winapp nsi --prune       # See what an import-graph pruned payload would drop
+  winapp size              # Find out why the installer grew, before makensis runs
+  winapp brand --all .     # Re-brand every app in a monorepo
   winapp gui
   winapp --version
 
@@ -67,12 +124,57 @@ For more information: https://github.com/amatak-org/amatak_winapp
 """
     print(help_text)
 
+def pop_profile_options(argv):
+    """Remove --profile, --cprofile [file] and --tracemalloc from argv; returns their values"""
+    profile = "--profile" in argv
+    if profile:
+        argv.remove("--profile")
+    
+    tracemalloc = "--tracemalloc" in argv
+    if tracemalloc:
+        argv.remove("--tracemalloc")
+    
+    cprofile = None
+    if "--cprofile" in argv:
+        index = argv.index("--cprofile")
+        argv.pop(index)
+        # Optional output file; anything else means the default <command>.prof
+        if index < len(argv) and argv[index].endswith(".prof"):
+            cprofile = argv.pop(index)
+        else:
+            cprofile = True
+    
+    return profile, cprofile, tracemalloc
+
+def extract_warnings(output):
+    """Warning/error lines from a script's console output"""
+    return [line.strip() for line in output.splitlines()
+            if line.strip().lower().startswith(("warning", "error"))]
+
+def load_helper(name):
+    """Import a helper module shared with the generator scripts (scripts/_*.py)"""
+    import importlib
+    try:
+        return importlib.import_module(f"amatak_winapp.scripts.{name}")
+    except ImportError:
+        scripts_dir = str(PACKAGE_DIR / "scripts")
+        if scripts_dir not in sys.path:
+            sys.path.insert(0, scripts_dir)
+        return importlib.import_module(name)
+
 class ProjectGenerator:
     """Main project generator for pip package"""
     
-    def __init__(self, project_root=None):
+    def __init__(self, project_root=None, profile=False, cprofile=None, tracemalloc=False):
         self.package_root = PROJECT_ROOT
         self.project_root = project_root or Path.cwd()
+        self.profile = profile
+        self.cprofile = cprofile
+        self.tracemalloc = tracemalloc
+        self.warnings = []
+        # Environment added for this generator's scripts (event log, profiler settings); kept off
+        # os.environ so GUI jobs for other projects running at the same time do not pick it up
+        self.child_env = {}
         self.setup_paths()
     
     def setup_paths(self):
@@ -84,7 +186,40 @@ class ProjectGenerator:
         # Ensure scripts directory exists
         self.scripts_dir.mkdir(parents=True, exist_ok=True)
     
-    def run_script(self, script_name, cwd=None):
+    def profile_stage(self, name, category="stage", **args):
+        """Time a block when stages are being recorded, otherwise do nothing"""
+        trace_file = self.child_env.get(TRACE_ENV)
+        if not trace_file:
+            from contextlib import nullcontext
+            return nullcontext()
+        return load_helper("_profiling").stage(name, category, trace_file=trace_file, **args)
+    
+    def run_profiled(self, command, project_path, func, *args):
+        """Run a command under the profilers requested with --profile/--cprofile/--tracemalloc"""
+        if not (self.profile or self.cprofile or self.tracemalloc):
+            return func(*args)
+        
+        project_path = Path(project_path) if project_path else Path.cwd()
+        return load_helper("_profiling").profile_command(project_path, command, func, *args,
+                                                trace=self.profile,
+                                                cprofile=self.cprofile,
+                                                tracemalloc=self.tracemalloc,
+                                                child_env=self.child_env)
+    
+    def record_build(self, project_path, func, *args):
+        """Run a build, then write installer/build-report.json for it"""
+        build_report = load_helper("_build_report")
+        self.warnings = []
+        recorder = build_report.BuildRecorder(project_path, self.child_env)
+        success = False
+        try:
+            success = func(*args)
+            return success
+        finally:
+            report_path = recorder.finish(success, self.warnings, PACKAGE_VERSION)
+            print(f"Build report: {report_path}")
+    
+    def run_script(self, script_name, cwd=None, args=None):
         """Run a Python script"""
         if cwd is None:
             cwd = self.project_root
@@ -97,6 +232,7 @@ class ProjectGenerator:
             script_path = Path(cwd) / script_name
         
         if script_path.exists():
+            import subprocess
             try:
                 print(f"Running {script_name}...")
                 print(f"   Path: {script_path}")
@@ -106,20 +242,27 @@ class ProjectGenerator:
                 python_path = env.get('PYTHONPATH', '')
                 if str(self.package_root) not in python_path:
                     env['PYTHONPATH'] = f"{self.package_root}{os.pathsep}{python_path}"
+                # Profiling state belongs to this command only
+                for name in PROFILE_ENV_VARS:
+                    env.pop(name, None)
+                env.update(self.child_env)
                 
-                result = subprocess.run(
-                    [sys.executable, str(script_path)],
-                    cwd=str(cwd),
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8'
-                )
+                with self.profile_stage(f"run {script_name}", category="script"):
+                    result = subprocess.run(
+                        [sys.executable, str(script_path)] + list(args or []),
+                        cwd=str(cwd),
+                        env=env,
+                        capture_output=True,
+                        text=True,
+                        encoding='utf-8'
+                    )
                 
                 if result.stdout:
                     print(result.stdout)
+                    self.warnings += [f"{script_name}: {line}" for line in extract_warnings(result.stdout)]
                 if result.stderr:
                     print(f"Warning: {result.stderr}")
+                    self.warnings.append(f"{script_name}: {result.stderr.strip()}")
                 
                 return result.returncode == 0
                 
@@ -155,7 +298,8 @@ class ProjectGenerator:
                 }
                 
                 # Execute the script
-                exec(script_code, namespace)
+                with self.profile_stage("winapp_init", category="script"):
+                    exec(script_code, namespace)
                 
                 # Check if main was called or needs to be called
                 if 'main' in namespace and callable(namespace['main']):
@@ -210,6 +354,8 @@ class ProjectGenerator:
     
     def copy_template(self, src, dst, category_data):
         """Copy template structure"""
+        import shutil
+        
         if src.exists():
             for item in src.iterdir():
                 dest_item = dst / item.name
@@ -681,6 +827,9 @@ class ProjectGenerator:
     
     def generate_initial_files(self, project_path):
         """Generate initial required files"""
+        import json
+        import datetime
+        
         # Create requirements.txt if it doesn't exist
         req_file = Path(project_path) / "requirements.txt"
         if not req_file.exists():
@@ -730,7 +879,37 @@ class ProjectGenerator:
             print("\nProject initialization failed!")
             return False
     
-    def build_project(self, project_path=None):
+    def freeze_project(self, project_path=None, clean=False):
+        """Freeze the project with PyInstaller (skipped when sources are unchanged)"""
+        if project_path is None:
+            project_path = Path.cwd()
+        else:
+            project_path = Path(project_path)
+        
+        print(f"\nFreezing project at: {project_path}")
+        return self.run_script("gen_freeze.py", project_path, ["--clean"] if clean else None)
+    
+    def bundle_deps(self, project_path=None, args=None):
+        """Resolve requirements.txt into the project's offline wheelhouse (wheels/)"""
+        if project_path is None:
+            project_path = Path.cwd()
+        else:
+            project_path = Path(project_path)
+        
+        print(f"\nBundling dependencies at: {project_path}")
+        return self.run_script("gen_deps.py", project_path, args)
+    
+    def analyze_size(self, project_path=None, args=None):
+        """Break the installer payload down by size (writes installer/size-report.json)"""
+        if project_path is None:
+            project_path = Path.cwd()
+        else:
+            project_path = Path(project_path)
+        
+        print(f"\nAnalyzing payload size at: {project_path}")
+        return self.run_script("gen_size.py", project_path, args)
+    
+    def build_project(self, project_path=None, patch_from=None, freeze=False, deps=False, prune=False):
         """Build project - works from anywhere"""
         if project_path is None:
             project_path = Path.cwd()
@@ -739,18 +918,16 @@ class ProjectGenerator:
         
         print(f"\nBuilding project at: {project_path}")
         
-        # Validate structure first
-        if not self.validate_structure(project_path):
-            print("Build failed: Invalid project structure")
-            return False
+        nsi_args = []
+        if patch_from:
+            # gen_nsi runs inside the project, so pass the manifest as an absolute path
+            nsi_args += ["--patch-from", str(Path(patch_from).resolve())]
+        if freeze:
+            nsi_args.append("--frozen")
+        if prune:
+            nsi_args.append("--prune")
         
-        # Run build scripts
-        scripts = ["gen_nsi.py", "gen_win.py"]
-        success = True
-        
-        for script in scripts:
-            if not self.run_script(script, project_path):
-                success = False
+        success = self.record_build(project_path, self._run_build, project_path, nsi_args, freeze, deps)
         
         if success:
             print("\nBuild successful!")
@@ -760,6 +937,46 @@ class ProjectGenerator:
             print("\nBuild failed!")
             return False
     
+    def _run_build(self, project_path, nsi_args=None, freeze=False, deps=False):
+        """Validate the project and run the build scripts"""
+        # Validate structure first
+        with self.profile_stage("validate_structure"):
+            valid = self.validate_structure(project_path)
+        if not valid:
+            print("Build failed: Invalid project structure")
+            return False
+        
+        # The installer is generated from the frozen app, so a failed freeze stops the build
+        if freeze and not self.run_script("gen_freeze.py", project_path):
+            print("Build failed: Could not freeze the app")
+            return False
+        if deps and not self.run_script("gen_deps.py", project_path):
+            print("Build failed: Could not bundle the dependencies")
+            return False
+        
+        # Run build scripts
+        scripts = [("gen_nsi.py", nsi_args), ("gen_win.py", None)]
+        success = True
+        
+        for script, args in scripts:
+            if not self.run_script(script, project_path, args):
+                success = False
+        return success
+    
+    def compression_bench(self, project_path=None, jobs=None):
+        """Compile the installer with each candidate compression setting and compare them"""
+        if project_path is None:
+            project_path = Path.cwd()
+        else:
+            project_path = Path(project_path)
+        
+        print(f"\n📦 Benchmarking installer compression at: {project_path}")
+        
+        args = ["--compression-bench"]
+        if jobs:
+            args += ["--jobs", str(jobs)]
+        return self.run_script("gen_nsi.py", project_path, args)
+    
     def validate_structure(self, project_path):
         """Validate project structure"""
         required = [
@@ -795,6 +1012,7 @@ class ProjectGenerator:
                 missing_recommended.append(item)
         
         if missing_recommended:
+            self.warnings.append(f"Missing recommended items: {', '.join(missing_recommended)}")
             print("Missing recommended items:")
             for item in missing_recommended:
                 print(f"  - {item}")
@@ -805,8 +1023,8 @@ class ProjectGenerator:
 
     # In the ProjectGenerator class, add this method:
 
-    def generate_nsi(self, project_path=None):
-        """Generate NSIS installer script"""
+    def generate_nsi(self, project_path=None, args=None):
+        """Generate NSIS installer script (args are passed on to gen_nsi.py)"""
         if project_path is None:
             project_path = Path.cwd()
         else:
@@ -822,7 +1040,7 @@ class ProjectGenerator:
             script_path = project_path / "gen_nsi.py"
         
         if script_path.exists():
-            return self.run_script("gen_nsi.py", project_path)
+            return self.run_script("gen_nsi.py", project_path, args)
         else:
             print(f"❌ gen_nsi.py not found")
             print(f"   Searched in: {self.scripts_dir} and {project_path}")
@@ -831,7 +1049,7 @@ class ProjectGenerator:
 
       
     # Add this method to ProjectGenerator class:
-    def generate_brand(self, project_path=None):
+    def generate_brand(self, project_path=None, force=False):
         """Generate branding assets"""
         if project_path is None:
             project_path = Path.cwd()
@@ -848,12 +1066,25 @@ class ProjectGenerator:
             script_path = project_path / "gen_brand.py"
         
         if script_path.exists():
-            return self.run_script("gen_brand.py", project_path)
+            return self.run_script("gen_brand.py", project_path, ["--force"] if force else None)
         else:
             print(f"❌ gen_brand.py not found")
             print(f"   Searched in: {self.scripts_dir} and {project_path}")
             return False
 
+    def generate_brand_all(self, root, workers=None, force=False):
+        """Generate branding assets for every project below root in one process"""
+        root = Path(root).resolve()
+        
+        print(f"\n🎨 Generating branding assets for all projects under: {root}")
+        
+        args = ["--all", str(root)]
+        if workers:
+            args += ["--workers", str(workers)]
+        if force:
+            args.append("--force")
+        return self.run_script("gen_brand.py", root, args)
+
 def launch_gui():
     """Launch the GUI interface"""
     try:
@@ -892,6 +1123,12 @@ def main():
         print_help()
         return 0
     
+    # Profiling options apply to any command; strip them so positional arguments line up
+    profile, cprofile, tracemalloc = pop_profile_options(sys.argv)
+    if len(sys.argv) < 2:
+        print_help()
+        return 0
+    
     command = sys.argv[1].lower()
     
     # Handle version commands first
@@ -904,7 +1141,7 @@ def main():
         print_help()
         return 0
     
-    generator = ProjectGenerator()
+    generator = ProjectGenerator(profile=profile, cprofile=cprofile, tracemalloc=tracemalloc)
     
     if command == "create":
         if len(sys.argv) < 3:
@@ -948,18 +1185,84 @@ def main():
     
     elif command == "init":
         project_path = sys.argv[2] if len(sys.argv) > 2 else None
-        success = generator.init_project(project_path)
+        success = generator.run_profiled("init", project_path, generator.init_project, project_path)
         return 0 if success else 1
     
     elif command == "build":
         
-        project_path = sys.argv[2] if len(sys.argv) > 2 else None
-        success = generator.build_project(project_path)
+        project_path = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else None
+        if "--compression-bench" in sys.argv:
+            jobs = None
+            if "--jobs" in sys.argv:
+                index = sys.argv.index("--jobs")
+                if len(sys.argv) <= index + 1 or not sys.argv[index + 1].isdigit() or int(sys.argv[index + 1]) < 1:
+                    print("ERROR: --jobs needs a number of parallel compiles (1 or more)")
+                    return 1
+                jobs = int(sys.argv[index + 1])
+            success = generator.run_profiled("build", project_path, generator.compression_bench, project_path, jobs)
+        else:
+            patch_from = None
+            if "--patch-from" in sys.argv:
+                index = sys.argv.index("--patch-from")
+                if len(sys.argv) <= index + 1:
+                    print("ERROR: --patch-from needs the manifest of the previous release")
+                    return 1
+                patch_from = sys.argv[index + 1]
+            freeze = "--freeze" in sys.argv
+            deps = "--deps" in sys.argv
+            prune = "--prune" in sys.argv
+            success = generator.run_profiled("build", project_path, generator.build_project, project_path,
+                                             patch_from, freeze, deps, prune)
+        return 0 if success else 1
+    
+    elif command == "deps":
+        project_path = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else None
+        deps_args = [flag for flag in ("--force", "--offline", "--no-index") if flag in sys.argv]
+        for index, arg in enumerate(sys.argv):
+            if arg in ("--find-links", "--index-url"):
+                if len(sys.argv) <= index + 1:
+                    print(f"ERROR: {arg} needs a value")
+                    return 1
+                value = sys.argv[index + 1]
+                # gen_deps runs inside the project, so local folders are passed as absolute paths
+                if arg == "--find-links" and "://" not in value:
+                    value = str(Path(value).resolve())
+                deps_args += [arg, value]
+        success = generator.run_profiled("deps", project_path, generator.bundle_deps, project_path, deps_args)
+        return 0 if success else 1
+    
+    elif command == "size":
+        project_path = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else None
+        size_args = [flag for flag in ("--json", "--frozen", "--prune") if flag in sys.argv]
+        for option in ("--compare", "--top", "--depth"):
+            if option in sys.argv:
+                index = sys.argv.index(option)
+                if len(sys.argv) <= index + 1:
+                    print(f"ERROR: {option} needs a value")
+                    return 1
+                value = sys.argv[index + 1]
+                # gen_size runs inside the project, so the report to compare with is passed as an absolute path
+                size_args += [option, str(Path(value).resolve()) if option == "--compare" else value]
+        success = generator.run_profiled("size", project_path, generator.analyze_size, project_path, size_args)
+        return 0 if success else 1
+    
+    elif command == "freeze":
+        project_path = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else None
+        success = generator.run_profiled("freeze", project_path, generator.freeze_project, project_path,
+                                         "--clean" in sys.argv)
         return 0 if success else 1
     
     elif command == "nsi": 
-        project_path = sys.argv[2] if len(sys.argv) > 2 else None
-        success = generator.generate_nsi(project_path)
+        project_path = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else None
+        nsi_args = [flag for flag in ("--files", "--rescan", "--frozen", "--prune") if flag in sys.argv]
+        for option in ("--page", "--page-size"):
+            if option in sys.argv:
+                index = sys.argv.index(option)
+                if len(sys.argv) <= index + 1:
+                    print(f"ERROR: {option} needs a number")
+                    return 1
+                nsi_args += [option, sys.argv[index + 1]]
+        success = generator.run_profiled("nsi", project_path, generator.generate_nsi, project_path, nsi_args)
         return 0 if success else 1
     
     elif command == "gui":
@@ -968,8 +1271,21 @@ def main():
 
       # In the main() function, add:
     elif command == "brand":
-        project_path = sys.argv[2] if len(sys.argv) > 2 else None
-        success = generator.generate_brand(project_path)
+        force = "--force" in sys.argv
+        if "--all" in sys.argv:
+            index = sys.argv.index("--all")
+            root = sys.argv[index + 1] if len(sys.argv) > index + 1 and not sys.argv[index + 1].startswith("-") else "."
+            workers = None
+            if "--workers" in sys.argv:
+                index = sys.argv.index("--workers")
+                if len(sys.argv) <= index + 1 or not sys.argv[index + 1].isdigit() or int(sys.argv[index + 1]) < 1:
+                    print("ERROR: --workers needs a number of worker processes (1 or more)")
+                    return 1
+                workers = int(sys.argv[index + 1])
+            success = generator.run_profiled("brand", root, generator.generate_brand_all, root, workers, force)
+        else:
+            project_path = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else None
+            success = generator.run_profiled("brand", project_path, generator.generate_brand, project_path, force)
         return 0 if success else 1
 
     
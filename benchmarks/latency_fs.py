@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Artificial-latency filesystem shim for the Amatak WinApp benchmarks.
+
+OneDrive folders and SMB shares pay a network round trip for every
+directory listing. install() makes the generator scripts' directory
+walker (amatak_winapp/scripts/_walker.py) sleep before each listing, so
+the effect of concurrent walking can be measured on a local disk.
+
+Usage:
+  python benchmarks/latency_fs.py <project> --latency-ms 5
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts"
+
+
+def install(latency_ms):
+    """Delay every directory listing made through _walker by latency_ms"""
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    import _walker
+
+    real_scandir = getattr(_walker.scandir, "__wrapped__", _walker.scandir)
+
+    def slow_scandir(path):
+        time.sleep(latency_ms / 1000)
+        return real_scandir(path)
+
+    slow_scandir.__wrapped__ = real_scandir
+    _walker.scandir = slow_scandir
+    return _walker
+
+
+def main():
+    """Compare a serial and a concurrent walk of a project under artificial latency"""
+    parser = argparse.ArgumentParser(description='Walk a project with artificial per-listing latency')
+    parser.add_argument('project', help='Folder to walk')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='Delay added to every directory listing')
+    parser.add_argument('--jobs', '-j', type=int, nargs='+', default=[1, 4, 16], help='Walker pool sizes to time')
+
+    args = parser.parse_args()
+    walker = install(args.latency_ms)
+
+    baseline = None
+    for jobs in args.jobs:
+        start = time.perf_counter()
+        entries = [(root, files) for root, dirs, files in walker.walk(args.project, jobs=jobs)]
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline = (entries, elapsed)
+        elif entries != baseline[0]:
+            print(f"ERROR: walk with {jobs} jobs returned a different result")
+            return 1
+        files = sum(len(names) for _, names in entries)
+        print(f"jobs={jobs:<3} {len(entries):>6} dirs {files:>8} files {elapsed:8.2f} s "
+              f"({baseline[1] / elapsed:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
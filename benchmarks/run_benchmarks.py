@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Amatak WinApp benchmark suite.
+
+Times the generator stages against synthetic projects of configurable
+shape and saves the results as JSON so runs can be compared between
+commits. Every (project, stage) pair runs in its own Python process so
+that peak RSS and module caches are not shared between measurements.
+
+Usage:
+  python benchmarks/run_benchmarks.py                          # 1k balanced/small project
+  python benchmarks/run_benchmarks.py --files 1000 10000 100000 --shape deep wide
+  python benchmarks/run_benchmarks.py --stages scan_project_files generate_nsi
+  python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+  python benchmarks/run_benchmarks.py --stages scan_project_files --fs-latency-ms 5   # slow share
+"""
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+SCRIPTS_DIR = REPO_ROOT / "amatak_winapp" / "scripts"
+PROJECTS_DIR = BENCH_DIR / ".projects"
+RESULTS_DIR = BENCH_DIR / "results"
+RESULTS_SCHEMA = 1
+
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(SCRIPTS_DIR))
+from synth_project import generate_project, shape_key, SHAPES, SIZE_PROFILES  # noqa: E402
+import _cli_imports  # noqa: E402
+
+STAGES = [
+    "scan_project_files",
+    "generate_nsi",
+    "generate_visual_tree",
+    "generate_inits",
+    "generate_styled_assets",
+]
+
+# CLI start-up budget: import time (-X importtime, microseconds). Modules that
+# light subcommands must never load are in amatak_winapp/scripts/_cli_imports.py.
+CLI_IMPORT_BUDGET_US = {"--version": 30000, "help": 30000, "nsi": 60000}
+REGRESSION_THRESHOLD = 0.10  # 10% slower than the baseline is reported as a regression
+
+
+def load_script(name):
+    """Import a generator script fresh (scripts read Path.cwd() at import time)"""
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def stage_callable(stage, project):
+    """Return a zero-argument function running one stage against project (cwd is already project)"""
+    if stage == "scan_project_files":
+        gen_nsi = load_script("gen_nsi")
+        return gen_nsi.scan_project_files
+    if stage == "generate_nsi":
+        gen_nsi = load_script("gen_nsi")
+        return gen_nsi.generate_nsi
+    if stage == "generate_visual_tree":
+        gen_tree = load_script("gen_tree")
+        return lambda: gen_tree.generate_visual_tree(str(project))
+    if stage == "generate_inits":
+        scanner = load_script("_init_scanner")
+        return scanner.generate_inits
+    if stage == "generate_styled_assets":
+        gen_brand = load_script("gen_brand")
+        target = str(project / "assets" / "brand")
+        return lambda: gen_brand.generate_styled_assets("BM", target, force=True)
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def run_stage(stage, project, warmup, repeat, fs_latency_ms=0):
+    """Child process entry point: time one stage and return a result dict"""
+    project = Path(project).resolve()
+    os.chdir(project)
+    if fs_latency_ms:
+        import latency_fs
+        latency_fs.install(fs_latency_ms)
+    try:
+        func = stage_callable(stage, project)
+    except ImportError as e:
+        return {"stage": stage, "skipped": f"missing dependency: {e}"}
+
+    timings = []
+    for i in range(warmup + repeat):
+        # Generators print progress; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        if i >= warmup:
+            timings.append(elapsed)
+
+    return {
+        "stage": stage,
+        "timings": {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "runs": timings,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def measure_cli_imports():
+    """Check import time and loaded modules of light CLI subcommands against the budget"""
+    results = []
+    empty_project = PROJECTS_DIR / "cli-empty"
+    generate_project(empty_project, files=10, shape="wide", sizes="small")
+
+    for command in CLI_IMPORT_BUDGET_US:
+        returncode, loaded_roots, import_us = _cli_imports.probe(command, empty_project)
+        forbidden = sorted(_cli_imports.FORBIDDEN_MODULES[command] & loaded_roots)
+        budget = CLI_IMPORT_BUDGET_US[command]
+        results.append({
+            "stage": f"cli_import[{command}]",
+            "import_us": import_us,
+            "budget_us": budget,
+            "forbidden_modules": forbidden,
+            "ok": returncode == 0 and import_us <= budget and not forbidden,
+        })
+    return results
+
+
+def git_commit():
+    """Current commit hash (or None outside a git checkout)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=str(REPO_ROOT)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_results(results):
+    """Print a summary table"""
+    print(f"\n{'Project':<28} {'Stage':<26} {'Median':>10} {'Min':>10} {'Files/s':>12} {'Peak RSS':>10}")
+    print("-" * 100)
+    for result in results:
+        if "import_us" in result:
+            status = "OK" if result["ok"] else "OVER BUDGET"
+            extra = f" forbidden={result['forbidden_modules']}" if result["forbidden_modules"] else ""
+            print(f"{'-':<28} {result['stage']:<26} {result['import_us'] / 1000:>8.1f}ms "
+                  f"{'budget':>10} {result['budget_us'] / 1000:>10.1f}ms {status}{extra}")
+            continue
+        project = result.get("project_key", "-")
+        if "skipped" in result:
+            print(f"{project:<28} {result['stage']:<26} skipped ({result['skipped']})")
+            continue
+        timings = result["timings"]
+        rss = f"{result['peak_rss_mb']:.1f}MB" if result.get("peak_rss_mb") is not None else "n/a"
+        print(f"{project:<28} {result['stage']:<26} {timings['median'] * 1000:>8.1f}ms "
+              f"{timings['min'] * 1000:>8.1f}ms {result['files_per_sec']:>12.0f} {rss:>10}")
+
+
+def compare_results(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """Print per-stage deltas against a saved results file; returns number of regressions"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    previous = {(r.get("project_key"), r["stage"]): r for r in baseline.get("results", [])}
+
+    print(f"\nComparison with {baseline_path} (commit {baseline.get('git_commit')}):")
+    regressions = 0
+    for result in results:
+        old = previous.get((result.get("project_key"), result["stage"]))
+        if not old or "timings" not in result or "timings" not in old:
+            continue
+        before = old["timings"]["median"]
+        after = result["timings"]["median"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  <-- REGRESSION"
+            regressions += 1
+        print(f"  {result.get('project_key', '-'):<28} {result['stage']:<26} "
+              f"{before * 1000:>8.1f}ms -> {after * 1000:>8.1f}ms ({change:+.1%}){flag}")
+    return regressions
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark Amatak WinApp generator stages')
+    parser.add_argument('--files', '-n', type=int, nargs='+', default=[1000], help='Project sizes (file counts)')
+    parser.add_argument('--shape', nargs='+', choices=SHAPES, default=['balanced'], help='Folder layouts')
+    parser.add_argument('--sizes', nargs='+', choices=sorted(SIZE_PROFILES), default=['small'],
+                        help='File size profiles')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES, help='Stages to time')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed warmup runs per stage')
+    parser.add_argument('--repeat', '-r', type=int, default=5, help='Timed runs per stage')
+    parser.add_argument('--no-cli', action='store_true', help='Skip the CLI import budget check')
+    parser.add_argument('--output', '-o', help='Results file (default: benchmarks/results/<time>_<commit>.json)')
+    parser.add_argument('--compare', '-c', help='Compare against a previous results file')
+    parser.add_argument('--fs-latency-ms', type=float, default=0,
+                        help='Delay every directory listing to mimic OneDrive/SMB mounts')
+    parser.add_argument('--_stage', help=argparse.SUPPRESS)
+    parser.add_argument('--_project', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    # Child mode: time a single stage and report JSON on stdout
+    if args._stage:
+        result = run_stage(args._stage, args._project, args.warmup, args.repeat, args.fs_latency_ms)
+        sys.stdout.write("RESULT " + json.dumps(result) + "\n")
+        return 0
+
+    results = []
+    for files in args.files:
+        for shape in args.shape:
+            for sizes in args.sizes:
+                key = shape_key(files, shape, sizes)
+                project = PROJECTS_DIR / key
+                print(f"Preparing synthetic project {key}...")
+                generate_project(project, files, shape, sizes)
+
+                for stage in args.stages:
+                    print(f"  Timing {stage}...")
+                    proc = subprocess.run(
+                        [sys.executable, str(Path(__file__).resolve()), "--_stage", stage,
+                         "--_project", str(project), "--warmup", str(args.warmup), "--repeat", str(args.repeat),
+                         "--fs-latency-ms", str(args.fs_latency_ms)],
+                        capture_output=True, text=True)
+                    lines = [line for line in proc.stdout.splitlines() if line.startswith("RESULT ")]
+                    if proc.returncode != 0 or not lines:
+                        print(f"  ERROR: {stage} failed:\n{proc.stderr[-2000:]}")
+                        result = {"stage": stage, "skipped": "stage failed"}
+                    else:
+                        result = json.loads(lines[-1][len("RESULT "):])
+                    result["project_key"] = key
+                    result["project"] = {"files": files, "shape": shape, "sizes": sizes}
+                    if "timings" in result:
+                        result["files_per_sec"] = files / result["timings"]["median"] if result["timings"]["median"] else 0.0
+                    results.append(result)
+
+    if not args.no_cli:
+        results.extend(measure_cli_imports())
+
+    print_results(results)
+
+    report = {
+        "schema": RESULTS_SCHEMA,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "warmup": args.warmup,
+        "repeat": args.repeat,
+        "fs_latency_ms": args.fs_latency_ms,
+        "results": results,
+    }
+    if args.output:
+        output = Path(args.output)
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{stamp}_{report['git_commit'] or 'nogit'}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults saved to {output}")
+
+    failed = [r for r in results if "import_us" in r and not r["ok"]]
+    regressions = compare_results(results, args.compare) if args.compare else 0
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
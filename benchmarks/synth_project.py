@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Synthetic project generator for the Amatak WinApp benchmarks.
+
+Creates a WinApp-style project (main.py, requirements.txt, VERSION.txt,
+config.json, assets/brand) filled with a configurable number of files
+in a deep, wide or balanced folder layout. Output is deterministic for
+a given shape, so results are comparable between commits.
+
+Usage:
+  python benchmarks/synth_project.py <target> --files 10000 --shape deep --sizes small
+"""
+import os
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+
+SHAPES = ("balanced", "deep", "wide")
+SIZE_PROFILES = {
+    # name: (min_bytes, max_bytes)
+    "small": (64, 4 * 1024),
+    "large": (256 * 1024, 2 * 1024 * 1024),
+    "mixed": (64, 512 * 1024),
+}
+EXTENSIONS = [".py", ".py", ".py", ".txt", ".json", ".md", ".png", ".dat"]
+DUPLICATE_RATIO = 0.1  # Share of files that repeat an earlier file's content (same extension)
+
+MARKER_FILE = ".synth_project.json"
+
+
+def shape_key(files, shape, sizes, seed=1):
+    """Folder name used for a cached synthetic project"""
+    return f"{shape}-{sizes}-{files}-s{seed}"
+
+
+def plan_directories(files, shape):
+    """Return the list of relative folders files are spread over"""
+    if shape == "deep":
+        # Chains of nested folders, ~10 files per folder
+        chains = max(1, files // 200)
+        depth = 20
+        return [os.path.join(*[f"c{c}"] + [f"d{d}" for d in range(1, level + 1)])
+                for c in range(chains) for level in range(depth)]
+    if shape == "wide":
+        # One level, many sibling folders
+        return [f"w{i:05d}" for i in range(max(1, files // 10))]
+    # Balanced: fan-out 8, three levels
+    folders = []
+    for a in range(8):
+        for b in range(8):
+            for c in range(max(1, files // 640)):
+                folders.append(os.path.join(f"pkg{a}", f"mod{b}", f"part{c}"))
+    return folders
+
+
+def payload(rng, size, ext):
+    """Deterministic file content of roughly `size` bytes"""
+    if ext == ".py":
+        # Whole lines only, so the file stays valid Python (compileall runs over the tree)
+        line = f"value_{rng.randrange(1 << 30)} = {rng.random()!r}\n"
+        return (line * max(1, size // len(line))).encode("utf-8")
+    return rng.randbytes(size) if hasattr(rng, "randbytes") else os.urandom(size)
+
+
+def generate_project(target, files=1000, shape="balanced", sizes="small", seed=1):
+    """Create (or reuse) a synthetic project; returns its description dict"""
+    target = Path(target)
+    description = {"files": files, "shape": shape, "sizes": sizes, "seed": seed}
+
+    marker = target / MARKER_FILE
+    if marker.exists():
+        try:
+            if json.loads(marker.read_text(encoding="utf-8")) == description:
+                return description
+        except ValueError:
+            pass
+
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}' (expected one of {', '.join(SHAPES)})")
+    if sizes not in SIZE_PROFILES:
+        raise ValueError(f"Unknown size profile '{sizes}' (expected one of {', '.join(SIZE_PROFILES)})")
+
+    rng = random.Random(seed)
+    min_size, max_size = SIZE_PROFILES[sizes]
+    target.mkdir(parents=True, exist_ok=True)
+
+    # Standard WinApp project files
+    (target / "main.py").write_text("def main():\n    return 0\n", encoding="utf-8")
+    (target / "requirements.txt").write_text("# Project dependencies\n", encoding="utf-8")
+    (target / "VERSION.txt").write_text("1.0.0", encoding="utf-8")
+    (target / "config.json").write_text(json.dumps({"project_name": target.name, "version": "1.0.0"}, indent=2),
+                                        encoding="utf-8")
+    (target / "assets" / "brand").mkdir(parents=True, exist_ok=True)
+
+    folders = plan_directories(files, shape)
+    written = {}
+    for index in range(files):
+        folder = target / folders[index % len(folders)]
+        folder.mkdir(parents=True, exist_ok=True)
+        ext = EXTENSIONS[index % len(EXTENSIONS)]
+        path = folder / f"file_{index:07d}{ext}"
+
+        samples = written.setdefault(ext, [])
+        if samples and rng.random() < DUPLICATE_RATIO:
+            content = rng.choice(samples).read_bytes()
+        else:
+            content = payload(rng, rng.randint(min_size, max_size), ext)
+        path.write_bytes(content)
+
+        # Remember a bounded sample of files (per extension) to duplicate from
+        if len(samples) < 256:
+            samples.append(path)
+
+    marker.write_text(json.dumps(description), encoding="utf-8")
+    return description
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Generate a synthetic Amatak WinApp project for benchmarking')
+    parser.add_argument('target', help='Folder to create the project in')
+    parser.add_argument('--files', '-n', type=int, default=1000, help='Number of payload files')
+    parser.add_argument('--shape', choices=SHAPES, default='balanced', help='Folder layout')
+    parser.add_argument('--sizes', choices=sorted(SIZE_PROFILES), default='small', help='File size profile')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+
+    args = parser.parse_args()
+    description = generate_project(args.target, args.files, args.shape, args.sizes, args.seed)
+    print(f"Synthetic project ready at {args.target}: {description}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Compact binary installer manifest (_binary_manifest)"""
+
+import hashlib
+import json
+import struct
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import _binary_manifest  # noqa: E402
+
+META = {"manifest_version": 1, "app": "App", "version": "1.2.3", "generated_at": "2026-01-01T00:00:00"}
+ENTRIES = [
+    ("main.py", 12, 1_700_000_000_000_000_000, hashlib.sha256(b"main").hexdigest()),
+    ("pkg/__init__.py", 0, -5, hashlib.sha256(b"").hexdigest()),
+    ("pkg/sub/données.txt", 2 ** 40, 42, hashlib.sha256(b"data").hexdigest()),
+    ("pkg/z.py", 7, 0, hashlib.sha256(b"z").hexdigest()),
+    ("other/deep/er/f", 1, 1, hashlib.sha256(b"f").hexdigest()),
+]
+
+
+def write_manifest(path, entries=ENTRIES):
+    writer = _binary_manifest.ManifestWriter()
+    for entry in entries:
+        writer.add(*entry)
+    writer.write(path, META)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "manifest.bin"
+    write_manifest(path)
+
+    manifest = _binary_manifest.BinaryManifest(path)
+
+    assert manifest.meta == META
+    assert len(manifest) == len(ENTRIES)
+    assert list(manifest.entries()) == ENTRIES
+    assert list(manifest.entries(1, 3)) == ENTRIES[1:3]
+    assert manifest.path(2) == "pkg/sub/données.txt"
+
+
+def test_to_json_manifest(tmp_path):
+    path = tmp_path / "manifest.bin"
+    write_manifest(path)
+
+    manifest = _binary_manifest.BinaryManifest(path).to_json_manifest()
+
+    assert manifest == dict(META, files={rel: {"size": size, "sha256": digest}
+                                         for rel, size, _, digest in ENTRIES})
+
+
+def test_empty_manifest(tmp_path):
+    path = tmp_path / "manifest.bin"
+    write_manifest(path, [])
+
+    assert _binary_manifest.BinaryManifest(path).to_json_manifest() == dict(META, files={})
+
+
+@pytest.mark.parametrize("damage", ["magic", "version", "truncated"])
+def test_unreadable_files_are_rejected(tmp_path, damage):
+    path = tmp_path / "manifest.bin"
+    write_manifest(path)
+    data = bytearray(path.read_bytes())
+    if damage == "magic":
+        data[:4] = b"NOPE"
+    elif damage == "version":
+        struct.pack_into("<H", data, 4, _binary_manifest.FORMAT_VERSION + 1)
+    else:
+        del data[-10:]
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError):
+        _binary_manifest.BinaryManifest(path)
+
+
+def test_matches_the_json_manifest_of_a_build(tmp_path):
+    (tmp_path / "main.py").write_text("print('hello')\n", encoding="utf-8")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("X = 1\n", encoding="utf-8")
+    result = subprocess.run([sys.executable, str(SCRIPTS_DIR / "gen_nsi.py")], cwd=str(tmp_path),
+                            capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    installer = tmp_path / "installer"
+    from_json = json.loads((installer / "manifest.json").read_text(encoding="utf-8"))
+    from_bin = _binary_manifest.BinaryManifest(installer / "manifest.bin").to_json_manifest()
+    assert from_bin == from_json
+    assert "pkg/mod.py" in from_bin["files"]
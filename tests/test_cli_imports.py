@@ -0,0 +1,22 @@
+"""Light CLI subcommands must not load heavy modules (see amatak_winapp/scripts/_cli_imports.py)"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts"))
+
+from _cli_imports import FORBIDDEN_MODULES, probe  # noqa: E402
+
+
+@pytest.mark.parametrize("command", sorted(FORBIDDEN_MODULES))
+def test_cli_skips_forbidden_modules(command, tmp_path):
+    (tmp_path / "main.py").write_text("print('hello')\n", encoding="utf-8")
+    (tmp_path / "requirements.txt").write_text("", encoding="utf-8")
+
+    returncode, loaded_roots, _ = probe(command, tmp_path)
+
+    assert returncode == 0
+    assert "amatak_winapp" in loaded_roots
+    assert FORBIDDEN_MODULES[command] & loaded_roots == set()
@@ -0,0 +1,92 @@
+"""gen_deps resolves requirements from a local folder of wheels (--find-links/--no-index)"""
+
+import json
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+GEN_DEPS = Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts" / "gen_deps.py"
+
+
+def make_wheel(folder, name, version, requires=()):
+    """Write a minimal pure-Python wheel into folder"""
+    dist_info = f"{name}-{version}.dist-info"
+    files = {
+        f"{name}/__init__.py": f'__version__ = "{version}"\n',
+        f"{dist_info}/METADATA": "Metadata-Version: 2.1\n"
+                                 f"Name: {name}\nVersion: {version}\n"
+                                 + "".join(f"Requires-Dist: {requirement}\n" for requirement in requires),
+        f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    files[f"{dist_info}/RECORD"] = "".join(f"{path},,\n" for path in files) + f"{dist_info}/RECORD,,\n"
+    with zipfile.ZipFile(folder / f"{name}-{version}-py3-none-any.whl", "w") as wheel:
+        for path, text in files.items():
+            wheel.writestr(path, text)
+
+
+def run_gen_deps(project, cache, *args):
+    env = os.environ.copy()
+    env["WINAPP_WHEEL_CACHE"] = str(cache)
+    return subprocess.run([sys.executable, str(GEN_DEPS), *args], cwd=str(project), env=env,
+                          capture_output=True, text=True, timeout=300)
+
+
+def test_local_index(tmp_path):
+    index = tmp_path / "index"
+    index.mkdir()
+    make_wheel(index, "tinylib", "0.2.0", requires=["otherlib>=0.1"])
+    make_wheel(index, "otherlib", "0.2.0")
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "requirements.txt").write_text("tinylib\n", encoding="utf-8")
+    cache = tmp_path / "cache"
+    source = ["--find-links", str(index), "--no-index"]
+
+    first = run_gen_deps(project, cache, *source)
+    assert first.returncode == 0, first.stdout + first.stderr
+    wheelhouse = project / "wheels"
+    assert sorted(path.name for path in wheelhouse.glob("*.whl")) == [
+        "otherlib-0.2.0-py3-none-any.whl", "tinylib-0.2.0-py3-none-any.whl"]
+    pinned = (wheelhouse / "requirements.txt").read_text(encoding="utf-8").splitlines()
+    assert pinned[1:] == ["otherlib==0.2.0", "tinylib==0.2.0"]
+    assert sorted(json.loads((wheelhouse / "deps.json").read_text(encoding="utf-8"))["wheels"]) == [
+        "otherlib-0.2.0-py3-none-any.whl", "tinylib-0.2.0-py3-none-any.whl"]
+
+    again = run_gen_deps(project, cache, *source)
+    assert again.returncode == 0
+    assert "Wheelhouse is up to date" in again.stdout
+
+    # A new project resolves from the shared cache alone
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "requirements.txt").write_text("tinylib\n", encoding="utf-8")
+    offline = run_gen_deps(other, cache, "--offline")
+    assert offline.returncode == 0, offline.stdout + offline.stderr
+    assert len(list((other / "wheels").glob("*.whl"))) == 2
+
+
+def test_nested_requirement_edit_resolves_again(tmp_path):
+    index = tmp_path / "index"
+    index.mkdir()
+    make_wheel(index, "tinylib", "0.1.0")
+    make_wheel(index, "tinylib", "0.2.0")
+    project = tmp_path / "project"
+    (project / "requirements").mkdir(parents=True)
+    (project / "requirements.txt").write_text("-r requirements/base.txt\n", encoding="utf-8")
+    (project / "requirements" / "base.txt").write_text("-c pins.txt\ntinylib\n", encoding="utf-8")
+    (project / "requirements" / "pins.txt").write_text("tinylib==0.1.0\n", encoding="utf-8")
+    cache = tmp_path / "cache"
+    source = ["--find-links", str(index), "--no-index"]
+
+    first = run_gen_deps(project, cache, *source)
+    assert first.returncode == 0, first.stdout + first.stderr
+    assert [path.name for path in (project / "wheels").glob("*.whl")] == ["tinylib-0.1.0-py3-none-any.whl"]
+
+    # Only the constraint two files deep changes
+    (project / "requirements" / "pins.txt").write_text("tinylib==0.2.0\n", encoding="utf-8")
+    second = run_gen_deps(project, cache, *source)
+    assert second.returncode == 0, second.stdout + second.stderr
+    assert "up to date" not in second.stdout
+    assert [path.name for path in (project / "wheels").glob("*.whl")] == ["tinylib-0.2.0-py3-none-any.whl"]
@@ -0,0 +1,341 @@
+"""Installer scripts written by gen_nsi"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts"
+GEN_NSI = SCRIPTS_DIR / "gen_nsi.py"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import gen_nsi  # noqa: E402
+
+
+def write_files(project, files):
+    for path, content in files.items():
+        target = project / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            target.write_bytes(content)
+        else:
+            target.write_text(content, encoding="utf-8")
+
+
+def run_gen_nsi(project, *args):
+    """Run gen_nsi.py in project; returns the generated installer script"""
+    result = subprocess.run([sys.executable, str(GEN_NSI), *args], cwd=str(project),
+                            capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return (project / "installer" / "win_installer.nsi").read_text(encoding="utf-8")
+
+
+def split_sections(script):
+    """(install part, uninstall section) of an installer script"""
+    install, rest = script.split('Section "Uninstall"')
+    return install, rest.split("SectionEnd")[0]
+
+
+def installed_paths(install):
+    """$INSTDIR-relative paths the install sections write (embedded files and generated launchers)"""
+    paths = set()
+    out_path = ""
+    for line in install.splitlines():
+        line = line.strip()
+        match = re.match(r'SetOutPath "\$INSTDIR\\?(.*)"', line)
+        if match:
+            out_path = match.group(1)
+        match = re.match(r'File "\.\.\\(.*)"', line)
+        if match:
+            paths.add(f"{out_path}\\{match.group(1).split(chr(92))[-1]}".lstrip("\\"))
+        match = re.match(r'FileOpen \$0 "\$INSTDIR\\(.*)" w', line)
+        if match:
+            paths.add(match.group(1))
+    return paths
+
+
+def deleted_paths(uninstall):
+    return set(re.findall(r'Delete "\$INSTDIR\\([^"*]*)"', uninstall))
+
+
+def test_frozen_uninstall_removes_every_installed_file(tmp_path):
+    write_files(tmp_path, {
+        "main.py": "print('hello')\n",
+        "VERSION.txt": "1.2.3\n",
+        "dist/app/app.exe": b"MZ",
+        "dist/app/_internal/lib.dll": b"lib",
+        "assets/icon.ico": b"ico",
+        "installer/.cache/pyinstaller/freeze.json": json.dumps({"exe": "dist/app/app.exe"}),
+    })
+
+    install, uninstall = split_sections(run_gen_nsi(tmp_path, "--frozen"))
+
+    assert 'File "..\\VERSION.txt"' in install
+    assert "main.py" not in install
+    assert installed_paths(install) - deleted_paths(uninstall) == set()
+    assert uninstall.rstrip().endswith('RMDir "$INSTDIR"')
+
+
+def test_brand_fingerprint_is_not_shipped(tmp_path):
+    write_files(tmp_path, {
+        "main.py": "print('hello')\n",
+        "assets/brand/brand.png": b"png",
+        "assets/brand/.brand_fingerprint": "{}",
+    })
+
+    install, _ = split_sections(run_gen_nsi(tmp_path))
+
+    assert 'File "..\\assets\\brand\\brand.png"' in install
+    assert ".brand_fingerprint" not in install
+
+
+def test_dict_size_rejects_booleans(tmp_path):
+    write_files(tmp_path, {
+        "main.py": "print('hello')\n",
+        "config.json": json.dumps({"installer": {"compressor": "lzma", "dict_size": True}}),
+    })
+
+    script = run_gen_nsi(tmp_path)
+
+    assert "SetCompressor lzma" in script
+    assert "SetCompressorDictSize" not in script
+
+
+def test_identical_files_are_embedded_once(tmp_path):
+    payload = bytes(range(256)) * 32  # 8 KB, above DEDUP_MIN_SIZE
+    write_files(tmp_path, {
+        "main.py": "print('hello')\n",
+        "data/a.bin": payload,
+        "data/copy/b.bin": payload,
+        "data/small1.txt": "same\n",
+        "data/small2.txt": "same\n",
+    })
+
+    install, uninstall = split_sections(run_gen_nsi(tmp_path))
+
+    assert 'File "..\\data\\a.bin"' in install
+    assert 'File "..\\data\\copy\\b.bin"' not in install
+    copy = 'CopyFiles /SILENT "$INSTDIR\\data\\a.bin" "$INSTDIR\\data\\copy\\b.bin"'
+    assert copy in install
+    assert install.index('File "..\\data\\a.bin"') < install.index(copy)
+    # Small duplicates are cheaper to embed than to copy
+    assert 'File "..\\data\\small1.txt"' in install and 'File "..\\data\\small2.txt"' in install
+    assert 'Delete "$INSTDIR\\data\\copy\\b.bin"' in uninstall
+
+
+def test_no_dedup_embeds_every_file(tmp_path):
+    payload = bytes(range(256)) * 32
+    write_files(tmp_path, {"main.py": "", "a.bin": payload, "b.bin": payload})
+
+    install, _ = split_sections(run_gen_nsi(tmp_path, "--no-dedup"))
+
+    assert 'File "..\\a.bin"' in install and 'File "..\\b.bin"' in install
+    assert "CopyFiles" not in install
+
+
+def patch_section(script):
+    """The patch script's update section"""
+    return script.split('Section "Update"')[1].split("SectionEnd")[0]
+
+
+def test_patch_installs_only_the_difference(tmp_path):
+    write_files(tmp_path, {
+        "VERSION.txt": "1.0.0\n",
+        "main.py": "print('v1')\n",
+        "util.py": "X = 1\n",
+        "old.py": "gone = True\n",
+        "legacy/mod.py": "",
+        "docs/guide.md": "v1\n",
+    })
+    run_gen_nsi(tmp_path)
+    old_manifest = tmp_path / "installer" / "manifest-v1.0.0.json"
+    assert old_manifest.exists()
+
+    (tmp_path / "old.py").unlink()
+    (tmp_path / "legacy" / "mod.py").unlink()
+    (tmp_path / "legacy").rmdir()
+    write_files(tmp_path, {
+        "VERSION.txt": "1.1.0\n",
+        "main.py": "print('v2')\n",
+        "new.py": "",
+        "docs/guide.md": "v2\n",
+    })
+    run_gen_nsi(tmp_path, "--patch-from", str(old_manifest))
+
+    script = (tmp_path / "installer" / "win_patch.nsi").read_text(encoding="utf-8")
+    update = patch_section(script)
+    assert 'StrCmp $0 "1.0.0" version_ok' in script
+    assert 'File "..\\main.py"' in update and 'File "..\\new.py"' in update
+    assert "util.py" not in update
+    assert 'Delete "$INSTDIR\\old.py"' in update
+    assert update.index('Delete "$INSTDIR\\legacy\\mod.py"') < update.index('RMDir "$INSTDIR\\legacy"')
+    assert 'WriteRegStr HKLM "Software\\' in update and '"Version" "1.1.0"' in update
+
+    # The changed doc is only patched where the Documentation component was installed
+    component = update.split("; Documentation")[1]
+    assert 'ReadRegDWORD $0 HKLM' in component and '"Documentation"' in component
+    assert 'IfFileExists "$INSTDIR\\docs\\guide.md" component1_install' in component
+    assert (component.index("component1_install:") < component.index('File "..\\docs\\guide.md"')
+            < component.index("component1_skip:"))
+
+    # The uninstaller written by the patch knows the new file set
+    _, uninstall = split_sections(script)
+    assert 'Delete "$INSTDIR\\new.py"' in uninstall
+    assert "old.py" not in uninstall
+
+
+def test_patch_without_changes_writes_nothing(tmp_path):
+    write_files(tmp_path, {"VERSION.txt": "1.0.0\n", "main.py": ""})
+    run_gen_nsi(tmp_path)
+
+    run_gen_nsi(tmp_path, "--patch-from", str(tmp_path / "installer" / "manifest-v1.0.0.json"))
+
+    assert not (tmp_path / "installer" / "win_patch.nsi").exists()
+
+
+def section(script, title):
+    """Body of the section whose header line contains title"""
+    header = next(line for line in script.splitlines() if line.startswith("Section ") and title in line)
+    return header, script.split(header)[1].split("SectionEnd")[0]
+
+
+def test_optional_folders_get_their_own_sections(tmp_path):
+    payload = bytes(range(256)) * 32
+    write_files(tmp_path, {
+        "main.py": "",
+        "shared.bin": payload,
+        "docs/guide.md": "guide\n",
+        "docs/shared.bin": payload,
+        "tests/test_app.py": "",
+    })
+
+    script = run_gen_nsi(tmp_path)
+
+    assert "!insertmacro MUI_PAGE_COMPONENTS" in script
+    core_header, core = section(script, '"Core Files"')
+    assert "SectionIn RO" in core and 'File "..\\main.py"' in core
+    assert "docs" not in core and "tests" not in core
+
+    docs_header, docs = section(script, '"Documentation"')
+    assert not docs_header.startswith("Section /o")
+    assert 'File "..\\docs\\guide.md"' in docs
+    assert 'WriteRegDWORD HKLM "Software\\' in docs and '"Documentation" 1' in docs
+    # A deselectable section never copies from another section
+    assert 'File "..\\docs\\shared.bin"' in docs and "CopyFiles" not in docs
+
+    tests_header, tests = section(script, '"Tests"')
+    assert tests_header.startswith("Section /o")
+    assert 'File "..\\tests\\test_app.py"' in tests
+
+
+def test_configured_components(tmp_path):
+    write_files(tmp_path, {
+        "main.py": "",
+        "plugins/extra.py": "",
+        "plugins/readme.txt": "",
+        "docs/guide.md": "",
+        "config.json": json.dumps({"installer": {"components": [
+            {"name": "Plugins", "include": "plugins/*.py", "selected": False}]}}),
+    })
+
+    script = run_gen_nsi(tmp_path)
+
+    header, plugins = section(script, '"Plugins"')
+    assert header.startswith("Section /o")
+    assert 'File "..\\plugins\\extra.py"' in plugins and "readme.txt" not in plugins
+    _, core = section(script, '"Core Files"')
+    assert 'File "..\\plugins\\readme.txt"' in core and 'File "..\\docs\\guide.md"' in core
+
+
+def test_components_can_be_disabled(tmp_path):
+    write_files(tmp_path, {
+        "main.py": "",
+        "docs/guide.md": "",
+        "config.json": json.dumps({"installer": {"components": False}}),
+    })
+
+    script = run_gen_nsi(tmp_path)
+
+    assert "MUI_PAGE_COMPONENTS" not in script
+    _, main = section(script, '"MainSection"')
+    assert 'File "..\\docs\\guide.md"' in main
+
+
+def test_uninstall_removes_files_then_folders_deepest_first():
+    files = ["main.py", "pkg/__init__.py", "pkg/sub/data.txt", "pkg/sub/mod.py", "pkg/z.py", "res/icon.ico"]
+
+    lines = [line.strip() for line in gen_nsi.iter_uninstall_commands(files)]
+
+    assert lines == [
+        'Delete "$INSTDIR\\main.py"',
+        'Delete "$INSTDIR\\pkg\\__init__.py"',
+        'Delete "$INSTDIR\\pkg\\sub\\data.txt"',
+        'Delete "$INSTDIR\\pkg\\sub\\mod.py"',
+        'Delete "$INSTDIR\\pkg\\sub\\__pycache__\\*.pyc"',
+        'RMDir "$INSTDIR\\pkg\\sub\\__pycache__"',
+        'RMDir "$INSTDIR\\pkg\\sub"',
+        'Delete "$INSTDIR\\pkg\\z.py"',
+        'Delete "$INSTDIR\\pkg\\__pycache__\\*.pyc"',
+        'RMDir "$INSTDIR\\pkg\\__pycache__"',
+        'RMDir "$INSTDIR\\pkg"',
+        'Delete "$INSTDIR\\res\\icon.ico"',
+        'RMDir "$INSTDIR\\res"',
+        'Delete "$INSTDIR\\__pycache__\\*.pyc"',
+        'RMDir "$INSTDIR\\__pycache__"',
+    ]
+
+
+@pytest.mark.parametrize("order", [list, sorted])
+def test_uninstall_never_removes_folders_recursively(order):
+    files = order(["b/x.txt", "a/deep/er/y.txt", "a/z.txt", "wheels/requirements.txt", "wheels/pkg.whl"])
+
+    section = "".join(gen_nsi.iter_uninstall_section("App", "App", False, files))
+
+    assert [line.strip() for line in section.splitlines() if "/r" in line] == [
+        'RMDir /r "$INSTDIR\\site-packages"']
+    removed = [line.strip() for line in section.splitlines() if line.strip().startswith("RMDir")]
+    for folder in ("a\\deep\\er", "a\\deep", "a", "b", "wheels"):
+        assert removed.count(f'RMDir "$INSTDIR\\{folder}"') == 1
+    assert removed.index('RMDir "$INSTDIR\\a\\deep\\er"') < removed.index('RMDir "$INSTDIR\\a\\deep"')
+    assert removed[-1] == 'RMDir "$INSTDIR"'
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """gen_nsi pointed at an empty project, with fresh per-run hash state"""
+    monkeypatch.setattr(gen_nsi, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(gen_nsi, "_file_hashes", {})
+    monkeypatch.setattr(gen_nsi, "_hash_store", None)
+    yield tmp_path
+    if gen_nsi._hash_store is not None:
+        gen_nsi._hash_store.close()
+
+
+@pytest.mark.parametrize("mmap_min_size", [gen_nsi.MMAP_MIN_SIZE, 1])
+def test_hash_file_matches_hashlib(project, monkeypatch, mmap_min_size):
+    monkeypatch.setattr(gen_nsi, "MMAP_MIN_SIZE", mmap_min_size)
+    contents = {"empty": b"", "small": b"abc", "chunks": os.urandom(gen_nsi.HASH_CHUNK_SIZE * 2 + 123)}
+    for name, data in contents.items():
+        (project / name).write_bytes(data)
+        assert gen_nsi.hash_file(project / name) == hashlib.sha256(data).hexdigest()
+
+
+def test_parallel_hashing_matches_serial(project, monkeypatch):
+    # Small batches so both single-file and batched work units are used
+    monkeypatch.setattr(gen_nsi, "HASH_BATCH_BYTES", 64 * 1024)
+    expected = {}
+    for index in range(40):
+        data = os.urandom(1000 * index + (200 * 1024 if index % 10 == 0 else 0))
+        (project / f"f{index}.bin").write_bytes(data)
+        expected[f"f{index}.bin"] = hashlib.sha256(data).hexdigest()
+
+    gen_nsi.hash_files(list(expected) + ["missing.bin"], jobs=4)
+
+    assert gen_nsi._file_hashes == expected
+    assert all(gen_nsi.get_file_hash(name) == digest for name, digest in expected.items())
@@ -0,0 +1,107 @@
+"""Payload size report written by gen_size"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import gen_size  # noqa: E402
+
+
+def run_gen_size(project, *args):
+    """Run gen_size.py --json in project; returns the report"""
+    result = subprocess.run([sys.executable, str(SCRIPTS_DIR / "gen_size.py"), "--json", *args],
+                            cwd=str(project), capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return json.loads(result.stdout)
+
+
+def rows(report, table):
+    return {row["name"]: row for row in report[table]}
+
+
+def make_project(project):
+    (project / "data").mkdir()
+    (project / "docs").mkdir()
+    (project / "main.py").write_text("print('hello')\n" * 10, encoding="utf-8")
+    (project / "data" / "random.bin").write_bytes(os.urandom(100_000))
+    (project / "data" / "zeros.dat").write_bytes(bytes(100_000))
+    (project / "docs" / "readme.txt").write_text("read me\n" * 100, encoding="utf-8")
+
+
+def test_breakdown(tmp_path):
+    make_project(tmp_path)
+
+    report = run_gen_size(tmp_path)
+
+    assert report["files"] == 4
+    assert report["bytes"] == sum(path.stat().st_size for path in tmp_path.rglob("*")
+                                  if path.is_file() and "installer" not in path.parts)
+    directories = rows(report, "directories")
+    assert set(directories) == {"./", "data/", "docs/"}
+    assert directories["data/"]["files"] == 2 and directories["data/"]["bytes"] == 200_000
+    extensions = rows(report, "extensions")
+    assert set(extensions) == {".py", ".bin", ".dat", ".txt"}
+    # Random bytes do not compress, zeros nearly vanish
+    assert extensions[".bin"]["estimated"] > 90_000
+    assert extensions[".dat"]["estimated"] < 5_000
+    assert report["largest"][0]["bytes"] == 100_000
+    assert "delta" not in report
+    assert json.loads((tmp_path / "installer" / "size-report.json").read_text(encoding="utf-8")) == report
+
+
+def test_compares_with_the_previous_run(tmp_path):
+    make_project(tmp_path)
+    run_gen_size(tmp_path)
+
+    (tmp_path / "data" / "random.bin").write_bytes(os.urandom(150_000))
+    (tmp_path / "docs" / "readme.txt").unlink()
+    (tmp_path / "docs" / "guide.md").write_text("guide\n", encoding="utf-8")
+    report = run_gen_size(tmp_path)
+
+    assert report["delta"]["files"] == 0
+    assert report["delta"]["bytes"] == 50_000 - 800 + 6
+    assert rows(report, "directories")["data/"]["delta"] == 50_000
+    assert rows(report, "extensions")[".md"]["delta"] is None
+    assert [row["name"] for row in report["removed_extensions"]] == [".txt"]
+
+
+def test_compare_with_a_saved_report(tmp_path):
+    make_project(tmp_path)
+    saved = tmp_path / "release.json"
+    saved.write_text(json.dumps(run_gen_size(tmp_path)), encoding="utf-8")
+    (tmp_path / "main.py").write_text("", encoding="utf-8")
+    run_gen_size(tmp_path)
+
+    report = run_gen_size(tmp_path, "--compare", str(saved))
+
+    assert rows(report, "extensions")[".py"]["delta"] == -150
+
+
+def test_unreadable_compare_report_fails(tmp_path):
+    make_project(tmp_path)
+    (tmp_path / "bad.json").write_text("{}", encoding="utf-8")
+
+    result = subprocess.run([sys.executable, str(SCRIPTS_DIR / "gen_size.py"), "--compare", "bad.json"],
+                            cwd=str(tmp_path), capture_output=True, text=True, timeout=300)
+
+    assert result.returncode == 1
+    assert "Could not read size report" in result.stdout
+
+
+def test_directories_at_another_depth_are_not_compared():
+    row = {"name": "a/", "files": 1, "bytes": 10, "estimated": 5}
+    report = {"files": 1, "bytes": 10, "estimated": 5, "depth": 2,
+              "directories": [dict(row)], "extensions": [], "largest": []}
+    previous = {"generated_at": "then", "files": 1, "bytes": 4, "estimated": 2, "depth": 1,
+                "directories": [dict(row, bytes=4)], "extensions": [], "largest": []}
+
+    gen_size.compare(report, previous)
+
+    assert report["delta"] == {"files": 0, "bytes": 6, "estimated": 3}
+    assert "delta" not in report["directories"][0]
+    assert "removed_directories" not in report
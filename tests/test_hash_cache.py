@@ -0,0 +1,90 @@
+"""Persistent content-hash cache (_hash_cache)"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts"))
+
+import _hash_cache  # noqa: E402
+
+DIGEST = "ab" * 32
+
+
+def settled_file(folder, name="data.txt", content="data\n"):
+    """A file last modified well outside the racy window"""
+    path = folder / name
+    path.write_text(content, encoding="utf-8")
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    return path
+
+
+def test_digest_survives_reopen(tmp_path):
+    path = settled_file(tmp_path)
+    cache = _hash_cache.HashCache(tmp_path)
+    assert cache.get("data.txt", path.stat()) is None
+    cache.put("data.txt", path.stat(), DIGEST)
+    cache.close()
+
+    cache = _hash_cache.HashCache(tmp_path)
+    assert cache.get("data.txt", path.stat()) == DIGEST
+    assert (cache.hits, cache.misses) == (1, 0)
+    cache.close()
+
+
+def test_changed_stat_misses(tmp_path):
+    path = settled_file(tmp_path)
+    cache = _hash_cache.HashCache(tmp_path)
+    cache.put("data.txt", path.stat(), DIGEST)
+    cache.close()
+
+    settled_file(tmp_path, content="changed, and longer\n")
+    cache = _hash_cache.HashCache(tmp_path)
+    assert cache.get("data.txt", path.stat()) is None
+    cache.close()
+
+
+def test_recently_modified_files_are_not_cached(tmp_path):
+    path = tmp_path / "fresh.txt"
+    path.write_text("written just now\n", encoding="utf-8")
+
+    cache = _hash_cache.HashCache(tmp_path)
+    cache.put("fresh.txt", path.stat(), DIGEST)
+    cache.close()
+
+    cache = _hash_cache.HashCache(tmp_path)
+    assert cache.get("fresh.txt", path.stat()) is None
+    cache.close()
+
+
+def test_corrupt_database_is_recreated(tmp_path):
+    db_path = tmp_path / _hash_cache.CACHE_DIR / _hash_cache.CACHE_FILE
+    db_path.parent.mkdir(parents=True)
+    db_path.write_bytes(b"this is not an sqlite database" * 100)
+    path = settled_file(tmp_path)
+
+    cache = _hash_cache.HashCache(tmp_path)
+    assert cache.db is not None
+    cache.put("data.txt", path.stat(), DIGEST)
+    cache.close()
+
+    cache = _hash_cache.HashCache(tmp_path)
+    assert cache.get("data.txt", path.stat()) == DIGEST
+    cache.close()
+
+
+def test_prune_drops_files_no_longer_in_the_project(tmp_path):
+    kept = settled_file(tmp_path, "kept.txt")
+    gone = settled_file(tmp_path, "gone.txt")
+    cache = _hash_cache.HashCache(tmp_path)
+    cache.put("kept.txt", kept.stat(), DIGEST)
+    cache.put("gone.txt", gone.stat(), DIGEST)
+    cache.flush()
+    cache.prune({"kept.txt"})
+    cache.close()
+
+    cache = _hash_cache.HashCache(tmp_path)
+    assert set(cache.entries) == {"kept.txt"}
+    cache.close()
@@ -0,0 +1,39 @@
+"""__init__.py files written by _init_scanner"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+INIT_SCANNER = Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts" / "_init_scanner.py"
+
+
+def run_scanner(project):
+    result = subprocess.run([sys.executable, str(INIT_SCANNER)], cwd=str(project),
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_user_scripts_folder_exports_private_modules(tmp_path):
+    (tmp_path / "main.py").write_text("", encoding="utf-8")
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "_util.py").write_text("", encoding="utf-8")
+    (tmp_path / "scripts" / "tool.py").write_text("", encoding="utf-8")
+
+    run_scanner(tmp_path)
+
+    init = (tmp_path / "scripts" / "__init__.py").read_text(encoding="utf-8")
+    assert "from . import _util\n" in init
+    assert "from . import tool\n" in init
+
+
+def test_package_scripts_skip_helpers(tmp_path):
+    scripts = tmp_path / "amatak_winapp" / "scripts"
+    scripts.mkdir(parents=True)
+    (scripts / "_walker.py").write_text("", encoding="utf-8")
+    (scripts / "gen_nsi.py").write_text("", encoding="utf-8")
+
+    run_scanner(tmp_path)
+
+    init = (scripts / "__init__.py").read_text(encoding="utf-8")
+    assert "_walker" not in init
+    assert "from . import gen_nsi\n" in init
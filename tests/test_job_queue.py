@@ -0,0 +1,70 @@
+"""Scheduling rules of the GUI JobQueue"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# The gui package imports tkinter; the scheduler itself does not need it
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "amatak_winapp" / "gui"))
+
+from job_queue import DONE, JobQueue  # noqa: E402
+
+
+def wait_all(jobs, timeout=10):
+    deadline = time.time() + timeout
+    while any(job.state != DONE for job in jobs):
+        assert time.time() < deadline, [job.snapshot() for job in jobs]
+        time.sleep(0.01)
+
+
+def test_exclusive_job_runs_alone(tmp_path):
+    queue = JobQueue(max_workers=4)
+    lock = threading.Lock()
+    running = set()
+    overlaps = []
+
+    def work(name):
+        with lock:
+            running.add(name)
+            overlaps.append(set(running))
+        time.sleep(0.05)
+        with lock:
+            running.discard(name)
+
+    try:
+        jobs = [queue.submit("work", tmp_path / "a", work, "a"),
+                queue.submit("work", tmp_path / "b", work, "b"),
+                queue.submit("profile", tmp_path / "c", work, "exclusive", exclusive=True),
+                queue.submit("work", tmp_path / "d", work, "d")]
+        wait_all(jobs)
+    finally:
+        queue.shutdown(wait=True)
+
+    assert {"exclusive"} in overlaps
+    assert all(seen == {"exclusive"} for seen in overlaps if "exclusive" in seen)
+    # Queued behind the exclusive job, so it started after it
+    assert jobs[3].started_at >= jobs[2].finished_at
+
+
+def test_same_project_jobs_do_not_overlap(tmp_path):
+    queue = JobQueue(max_workers=4)
+    lock = threading.Lock()
+    running = []
+    most = []
+
+    def work():
+        with lock:
+            running.append(1)
+            most.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+
+    try:
+        jobs = [queue.submit(f"job {index}", tmp_path, work) for index in range(4)]
+        wait_all(jobs)
+    finally:
+        queue.shutdown(wait=True)
+
+    assert max(most) == 1
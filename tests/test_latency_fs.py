@@ -0,0 +1,61 @@
+"""The artificial-latency shim of benchmarks/latency_fs.py slows every listing, once"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import latency_fs  # noqa: E402
+
+sys.path.insert(0, str(latency_fs.SCRIPTS_DIR))
+
+import _walker  # noqa: E402
+
+LATENCY_MS = 20
+
+
+@pytest.fixture
+def walker(monkeypatch):
+    """_walker with the shim installed; the real scandir is restored afterwards"""
+    monkeypatch.setattr(_walker, "scandir", _walker.scandir)
+    return latency_fs.install(LATENCY_MS)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for index in range(8):
+        folder = tmp_path / f"pkg{index}" / "sub"
+        folder.mkdir(parents=True)
+        (folder / "module.py").write_text("", encoding="utf-8")
+    return tmp_path
+
+
+def timed_walk(walker, top, jobs):
+    start = time.perf_counter()
+    entries = [(root, sorted(files)) for root, dirs, files in walker.walk(str(top), jobs=jobs)]
+    return entries, time.perf_counter() - start
+
+
+def test_every_listing_is_delayed(walker, tree):
+    start = time.perf_counter()
+    walker.list_dir(str(tree))
+    assert time.perf_counter() - start >= LATENCY_MS / 1000
+
+
+def test_install_again_does_not_stack(walker):
+    real_scandir = walker.scandir.__wrapped__
+    latency_fs.install(LATENCY_MS)
+    assert walker.scandir.__wrapped__ is real_scandir
+
+
+def test_concurrent_walk_matches_serial(walker, tree):
+    serial, serial_time = timed_walk(walker, tree, jobs=1)
+    concurrent, concurrent_time = timed_walk(walker, tree, jobs=8)
+
+    assert len(serial) == 17
+    assert serial_time >= len(serial) * LATENCY_MS / 1000
+    assert concurrent == serial
+    assert concurrent_time < serial_time
@@ -0,0 +1,42 @@
+"""Shared config.json section validation (_project_metadata.section_options)"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "amatak_winapp" / "scripts"))
+
+import _project_metadata  # noqa: E402
+
+DEFAULTS = {"onefile": False, "include": ["a"], "entry": "main.py", "icon": None}
+
+
+def test_valid_values_override_defaults():
+    config = {"freeze": {"onefile": 1, "include": "b", "entry": "app.py", "icon": None, "other": 5}}
+
+    options = _project_metadata.section_options(config, "freeze", DEFAULTS)
+
+    assert options == {"onefile": True, "include": ["b"], "entry": "app.py", "icon": None}
+    assert DEFAULTS["include"] == ["a"]
+
+
+def test_invalid_values_are_reported_and_ignored(capsys):
+    config = {"deps": {"include": ["b", 2], "entry": 3}}
+
+    options = _project_metadata.section_options(config, "deps", DEFAULTS)
+
+    assert options == DEFAULTS
+    out = capsys.readouterr().out
+    assert '"include" in config.json "deps" must be a list of strings' in out
+    assert '"entry" in config.json "deps" must be a string' in out
+
+
+def test_extend_adds_to_default_lists():
+    options = _project_metadata.section_options({"prune": {"include": ["b"]}}, "prune", DEFAULTS,
+                                                extend=("include",))
+
+    assert options["include"] == ["a", "b"]
+
+
+def test_section_must_be_an_object(capsys):
+    assert _project_metadata.section_options({"freeze": []}, "freeze", DEFAULTS) == DEFAULTS
+    assert '"freeze" in config.json must be an object' in capsys.readouterr().out